@@ -1,100 +1,46 @@
 import tkinter as tk
-import random
 import tkinter.font as tkFont
 from tkinter import ttk
 
+import numpy as np
 
-class Organism:
-    """
-    Represents an organism with a DNA sequence and lifespan.
-    """
-    def __init__(self, dna_sequence: list, lifespan: int = 100) -> None:
-        """
-        Initializes an Organism instance.
-
-        Args:
-            dna_sequence (list): The DNA sequence of the organism.
-            lifespan (int, optional): The lifespan of the organism. Defaults to 100.
-        """
-        self.dna = dna_sequence.copy()
-        self.fitness = 0
-        self.lifespan = lifespan
-
-    def calculate_fitness(self, environment):
-        """
-        Calculates the fitness of the organism based on its DNA sequence and the environment.
-
-        Args:
-            environment: The environment object.
-        """
-        self.fitness = sum(self.dna)
-        if environment.temperature > 30:
-            self.fitness += 1
-
-    def mutate(self):
-        """
-        Mutates the DNA sequence of the organism by performing a random mutation.
-        """
-        mutation_type = random.choice(['point', 'duplication', 'deletion'])
-        if mutation_type == 'point':
-            index = random.randint(0, len(self.dna) - 1)
-            self.dna = self.dna[:index] + (not self.dna[index],) + self.dna[index+1:]
-        elif mutation_type == 'duplication' and len(self.dna) < 20:
-            index = random.randint(0, len(self.dna) - 1)
-            self.dna = self.dna[:index] + (self.dna[index], self.dna[index]) + self.dna[index+1:]
-        elif mutation_type == 'deletion' and len(self.dna) > 1:
-            index = random.randint(0, len(self.dna) - 1)
-            self.dna = self.dna[:index] + self.dna[index+1:]
-
-    def age(self):
-        """
-        Decreases the lifespan of the organism by 1.
-        """
-        self.lifespan -= 1
-
-
-class Environment:
-    """
-    Represents the environment with resources and predators.
-    """
-    def __init__(self, resources, predators):
-        """
-        Initializes an Environment instance.
-
-        Args:
-            resources (dict): The resources in the environment.
-            predators (dict): The predators in the environment.
-        """
-        self.resources = resources
-        self.predators = predators
-        self.temperature = 25
-
-    def cycle_day(self):
-        """
-        Cycles the day in the environment by updating the temperature and resources/predators.
-        """
-        self.temperature += random.choice([-1, 1])
-        self.resources['food'] = max(0, self.resources['food'] + random.choice([-10, 10]))
-        self.predators['number'] = max(0, self.predators['number'] + random.choice([-1, 1]))
-
-
-def create_population(size, dna_length):
+import evolite
+
+GENERATIONS_PER_POLL = 10
+POLL_INTERVAL_MS = 1
+
+
+def clone_fittest(population_size):
     """
-    Creates a population of Organism instances with random DNA sequences.
+    Builds the selection stage of this script's rules: each of ``population_size`` slots is filled with a
+    copy of the fittest organism with probability fitness / 10, so a weak generation shrinks.
 
     Args:
-        size (int): The size of the population.
-        dna_length (int): The length of the DNA sequence.
+        population_size (int): The number of slots drawn every generation.
 
     Returns:
-        list: The population of Organism instances.
+        function: The stage, usable in place of the pipeline's 'select' stage.
     """
-    return [Organism([random.randint(0, 1) for _ in range(dna_length)]) for _ in range(size)]
+    def select(state):
+        parents, rng = state.parents, state.simulation.rng
+        if not len(parents):
+            return
+        fittest = int(np.argmax(parents.fitness))
+        count = int((rng.random(population_size) < parents.fitness[fittest] / 10).sum())
+        # A child of two copies of the same parent is a copy of it before mutation
+        state.mothers = state.fathers = np.full(count, fittest)
+
+    return select
 
 
 def run_simulation(generations, population_size, dna_length, output_text):
     """
-    Runs a simulation for a given number of generations.
+    Runs a simulation for a given number of generations without blocking the UI.
+
+    The headless evolite core produces one summary per generation; the text widget polls it
+    with ``after()`` so the Tk main loop keeps handling events between batches. Its pipeline keeps
+    this script's rules: the day is cycled first, organisms whose lifespan ran out are dropped, and
+    only the fittest reproduces, by cloning, until the population dies out.
 
     Args:
         generations (int): The number of generations to run the simulation for.
@@ -102,28 +48,19 @@ def run_simulation(generations, population_size, dna_length, output_text):
         dna_length (int): The length of the DNA sequence.
         output_text (tk.Text): The text widget to display the simulation output.
     """
-    environment = Environment({'food': 100}, {'number': 5})
-    population = create_population(population_size, dna_length)
-    previous_generation = []
-    for generation in range(generations):
-        environment.cycle_day()
-        for organism in population:
-            organism.calculate_fitness(environment)
-            organism.age()
-        population = [org for org in population if org.lifespan > 0]
-        if population:
-            fittest = max(population, key=lambda o: o.fitness)
-        else:
-            break
-        new_generation = []
-        for _ in range(population_size):
-            if random.random() < (fittest.fitness / 10):
-                offspring = Organism(fittest.dna)
-                offspring.mutate()
-                new_generation.append(offspring)
-        previous_generation.append(population)
-        population = new_generation
-        output_text.insert(tk.END, f"Generation {generation+1}:\nFittest Organism: {fittest.fitness}\n\n")
+    pipeline = evolite.Pipeline(['cycle_day', 'evaluate', 'age', 'filter', ('select', clone_fittest(population_size)),
+                                 'reproduce', 'mutate', 'replace'])
+    summaries = evolite.Simulation(population_size, dna_length, pipeline=pipeline).run(generations)
+
+    def poll():
+        for _ in range(GENERATIONS_PER_POLL):
+            summary = next(summaries, None)
+            if summary is None or not summary.population_size:
+                return
+            output_text.insert(tk.END, f"Generation {summary.generation}:\nFittest Organism: {summary.best_fitness:g}\n\n")
+        output_text.after(POLL_INTERVAL_MS, poll)
+
+    poll()
 
 
 def start_simulation(output_text, generations_slider, population_size_slider, dna_length_slider):
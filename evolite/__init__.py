@@ -0,0 +1,21 @@
+from .convergence import ConvergenceMonitor
+from .core import GenerationSummary, Simulation, run, simulate
+from .ensemble import Ensemble
+from .environment import Environment
+from .fitness import FitnessEvaluator, register_fitness
+from .genome import Genome
+from .lineage import LineageTracker
+from .mutation import MutationEngine
+from .organism import Organism
+from .pipeline import Pipeline
+from .population import PopulationArray
+from .rng import RandomStreams
+from .schedule import EnvironmentSchedule
+from .spatial import SpatialEnvironment
+from .speciation import Speciation
+from .survival import Survival
+
+__all__ = ['ConvergenceMonitor', 'Ensemble', 'Environment', 'EnvironmentSchedule', 'FitnessEvaluator',
+           'GenerationSummary', 'Genome', 'LineageTracker', 'MutationEngine', 'Organism', 'Pipeline', 'PopulationArray',
+           'RandomStreams', 'Simulation', 'SpatialEnvironment', 'Speciation', 'Survival', 'register_fitness', 'run',
+           'simulate']
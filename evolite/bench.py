@@ -0,0 +1,331 @@
+import json
+import platform
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .core import Simulation, default_environment
+from .genome import Genome
+from .organism import Organism
+from .population import PopulationArray
+
+# A benchmark is set up for a population size and DNA length and returns the callable to time
+Benchmark = Callable[[int, int, int], Callable[[], object]]
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000, 1000000)
+DEFAULT_LENGTHS = (10, 100, 1000, 10000)
+
+# The object API is timed only up to this size, past which a single call takes minutes
+OBJECT_LIMIT = 10000
+
+# Benchmarks that ignore the population, timed at the first size and length only
+UNSIZED = ('cycle_day',)
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Records the timing of one benchmark at one population size and DNA length.
+    """
+
+    name: str
+    population_size: int
+    dna_length: int
+    seconds: float
+    median: float
+    number: int
+    repeats: int
+
+    @property
+    def key(self) -> str:
+        """
+        Returns the identifier under which the result is compared with a baseline.
+        """
+        return f"{self.name}[{self.population_size}x{self.dna_length}]"
+
+    @property
+    def organisms_per_second(self) -> float:
+        """
+        Returns the organisms processed per second in the fastest repeat.
+        """
+        return self.population_size / self.seconds if self.seconds else float('inf')
+
+
+class Regression(NamedTuple):
+    """
+    Records a benchmark that got slower than its baseline by more than the tolerance.
+    """
+
+    key: str
+    baseline: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """
+        Returns how many times slower the benchmark became.
+        """
+        return self.seconds / self.baseline
+
+
+def _objects(population_size: int, dna_length: int, seed: int) -> List[Organism]:
+    generator = random.Random(seed)
+    return [Organism(Genome(generator.getrandbits(dna_length), dna_length)) for _ in range(population_size)]
+
+
+def _population(population_size: int, dna_length: int, seed: int) -> PopulationArray:
+    return PopulationArray.random(population_size, dna_length, np.random.default_rng(seed), max_length=dna_length)
+
+
+def organism_mutate(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``Organism.mutate`` over a list of organisms.
+    """
+    organisms, generator = _objects(population_size, dna_length, seed), random.Random(seed)
+    return lambda: [organism.mutate(generator) for organism in organisms]
+
+
+def organism_reproduce(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``Organism.reproduce`` with a random partner for every organism.
+    """
+    organisms, generator = _objects(population_size, dna_length, seed), random.Random(seed)
+    return lambda: [organism.reproduce(generator.choice(organisms), generator) for organism in organisms]
+
+
+def organism_fitness(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``Organism.calculate_fitness`` over a list of organisms.
+    """
+    organisms, environment = _objects(population_size, dna_length, seed), default_environment()
+    return lambda: [organism.calculate_fitness(environment) for organism in organisms]
+
+
+def organism_traits(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``Organism.calculate_traits`` over a list of organisms.
+    """
+    organisms = _objects(population_size, dna_length, seed)
+    return lambda: [organism.calculate_traits() for organism in organisms]
+
+
+def organism_population(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times creating a list of random organisms.
+    """
+    return lambda: _objects(population_size, dna_length, seed)
+
+
+def mutate(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.mutate``.
+    """
+    population, rng = _population(population_size, dna_length, seed), np.random.default_rng(seed)
+    return lambda: population.mutate(rng)
+
+
+def reproduce(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.reproduce`` with random parents.
+    """
+    population, rng = _population(population_size, dna_length, seed), np.random.default_rng(seed)
+    mothers = rng.integers(0, population_size, size=population_size)
+    fathers = rng.integers(0, population_size, size=population_size)
+    return lambda: population.reproduce(mothers, fathers, rng)
+
+
+def calculate_fitness(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.calculate_fitness``.
+    """
+    population, environment = _population(population_size, dna_length, seed), default_environment()
+    return lambda: population.calculate_fitness(environment)
+
+
+def calculate_traits(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.calculate_traits``.
+    """
+    population = _population(population_size, dna_length, seed)
+    return population.calculate_traits
+
+
+def random_population(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.random``.
+    """
+    return lambda: _population(population_size, dna_length, seed)
+
+
+def next_generation(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``PopulationArray.next_generation`` with tournament selection.
+    """
+    population, rng = _population(population_size, dna_length, seed), np.random.default_rng(seed)
+    population.calculate_fitness(None)
+    return lambda: population.next_generation(rng, 'tournament')
+
+
+def cycle_day(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times ``Environment.cycle_day``; it does not depend on the population.
+    """
+    environment, rng = default_environment(), np.random.default_rng(seed)
+    return lambda: environment.cycle_day(rng)
+
+
+def generation(population_size: int, dna_length: int, seed: int) -> Callable[[], object]:
+    """
+    Times one full ``Simulation.step``, so its inverse is generations per second.
+    """
+    population = _population(population_size, dna_length, seed)
+    simulation = Simulation(population_size, dna_length, seed, population=population, mothers='tournament')
+    return simulation.step
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'organism_mutate': organism_mutate,
+    'organism_reproduce': organism_reproduce,
+    'organism_fitness': organism_fitness,
+    'organism_traits': organism_traits,
+    'organism_population': organism_population,
+    'mutate': mutate,
+    'reproduce': reproduce,
+    'calculate_fitness': calculate_fitness,
+    'calculate_traits': calculate_traits,
+    'random_population': random_population,
+    'next_generation': next_generation,
+    'cycle_day': cycle_day,
+    'generation': generation,
+}
+
+
+def time_callable(function: Callable[[], object], repeats: int = 5,
+                  min_time: float = 0.05) -> Tuple[List[float], int]:
+    """
+    Times a callable in the style of ``timeit``: the number of calls per repeat grows until a repeat takes
+    at least ``min_time``, then every repeat is timed.
+
+    Args:
+        function (Callable[[], object]): The callable to time.
+        repeats (int, optional): The number of timed repeats. Defaults to 5.
+        min_time (float, optional): The shortest duration of one repeat, in seconds. Defaults to 0.05.
+
+    Returns:
+        Tuple[List[float], int]: The seconds per call of every repeat, and the number of calls per repeat.
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - started) / number)
+    return times, number
+
+
+def run_benchmarks(names: Optional[Sequence[str]] = None, sizes: Sequence[int] = DEFAULT_SIZES,
+                   lengths: Sequence[int] = DEFAULT_LENGTHS, repeats: int = 5, min_time: float = 0.05,
+                   seed: int = 0, max_bytes: int = 1 << 28,
+                   progress: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """
+    Runs every benchmark at every population size and DNA length.
+
+    Cases whose packed population would exceed ``max_bytes``, object API cases above ``OBJECT_LIMIT``
+    organisms and repeats of the ``UNSIZED`` benchmarks are skipped.
+
+    Args:
+        names (Sequence[str], optional): The benchmarks to run, from ``BENCHMARKS``. Defaults to all of them.
+        sizes (Sequence[int], optional): The population sizes. Defaults to 10^2 to 10^6.
+        lengths (Sequence[int], optional): The DNA lengths. Defaults to 10 to 10^4.
+        repeats (int, optional): The number of timed repeats per case. Defaults to 5.
+        min_time (float, optional): The shortest duration of one repeat, in seconds. Defaults to 0.05.
+        seed (int, optional): The seed of every population and random generator. Defaults to 0.
+        max_bytes (int, optional): The largest packed population to benchmark. Defaults to 256 MiB.
+        progress (Callable[[BenchmarkResult], None], optional): Called with every result as it is measured.
+
+    Returns:
+        List[BenchmarkResult]: The results, in the order they were run.
+    """
+    results = []
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark {name!r}, expected one of {sorted(BENCHMARKS)}")
+        for dna_length in lengths:
+            for population_size in sizes:
+                if population_size * ((dna_length + 63) // 64 * 8) > max_bytes:
+                    continue
+                if name.startswith('organism_') and population_size > OBJECT_LIMIT:
+                    continue
+                if name in UNSIZED and (population_size, dna_length) != (sizes[0], lengths[0]):
+                    continue
+                times, number = time_callable(BENCHMARKS[name](population_size, dna_length, seed), repeats, min_time)
+                result = BenchmarkResult(name, population_size, dna_length, min(times), float(np.median(times)),
+                                         number, repeats)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def save_results(results: Sequence[BenchmarkResult], path: str) -> None:
+    """
+    Writes benchmark results to a JSON file along with the machine they were measured on.
+
+    Args:
+        results (Sequence[BenchmarkResult]): The results to save.
+        path (str): The output file.
+    """
+    document = {
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+                    'processor': platform.processor()},
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': [result._asdict() for result in results],
+    }
+    with open(path, 'w') as output:
+        json.dump(document, output, indent=1)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """
+    Reads benchmark results written by ``save_results``.
+
+    Args:
+        path (str): The results file.
+
+    Returns:
+        List[BenchmarkResult]: The results.
+    """
+    with open(path) as results:
+        return [BenchmarkResult(**result) for result in json.load(results)['results']]
+
+
+def compare(results: Sequence[BenchmarkResult], baseline: Sequence[BenchmarkResult],
+            tolerance: float = 0.2) -> List[Regression]:
+    """
+    Finds the benchmarks that got slower than their baseline by more than the tolerance.
+
+    The fastest repeat is compared, as it is the least disturbed by other load on the machine. Cases
+    missing from the baseline are ignored.
+
+    Args:
+        results (Sequence[BenchmarkResult]): The new results.
+        baseline (Sequence[BenchmarkResult]): The results to compare against.
+        tolerance (float, optional): The allowed relative slowdown. Defaults to 0.2.
+
+    Returns:
+        List[Regression]: The regressions, slowest first.
+    """
+    reference = {result.key: result.seconds for result in baseline}
+    regressions = [Regression(result.key, reference[result.key], result.seconds) for result in results
+                   if result.key in reference and result.seconds > reference[result.key] * (1 + tolerance)]
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
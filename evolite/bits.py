@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+import numpy as np
+
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def packed_width(max_length: int) -> int:
+    """
+    Returns the number of bytes needed to hold a genome of the given maximum length.
+
+    Rows are padded to whole 64-bit words so they can be viewed as ``uint64`` for bit operations.
+
+    Args:
+        max_length (int): The maximum number of genes per genome.
+
+    Returns:
+        int: The packed row width in bytes.
+    """
+    return (max_length + 63) // 64 * 8
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Packs a 2-D 0/1 gene matrix into bytes, gene ``i`` stored in bit ``i % 8`` of byte ``i // 8``.
+
+    Args:
+        bits (np.ndarray): The (population, genes) matrix of 0/1 values.
+
+    Returns:
+        np.ndarray: The (population, bytes) packed ``uint8`` matrix, padded to whole words.
+    """
+    packed = np.packbits(bits.astype(np.uint8, copy=False), axis=1, bitorder='little')
+    padding = packed_width(bits.shape[1]) - packed.shape[1]
+    if padding:
+        packed = np.pad(packed, ((0, 0), (0, padding)))
+    return packed
+
+
+def unpack_bits(genomes: np.ndarray, max_length: int) -> np.ndarray:
+    """
+    Unpacks a packed genome matrix back into a (population, max_length) ``uint8`` gene matrix.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix.
+        max_length (int): The number of genes to unpack per row.
+
+    Returns:
+        np.ndarray: The unpacked 0/1 gene matrix.
+    """
+    return np.unpackbits(genomes, axis=1, count=max_length, bitorder='little')
+
+
+def as_words(genomes: np.ndarray) -> np.ndarray:
+    """
+    Views a packed genome matrix as little-endian 64-bit words without copying.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix.
+
+    Returns:
+        np.ndarray: The (population, words) ``uint64`` view.
+    """
+    return np.ascontiguousarray(genomes).view('<u8')
+
+
+def popcount(genomes: np.ndarray) -> np.ndarray:
+    """
+    Counts the set genes of every packed genome.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix.
+
+    Returns:
+        np.ndarray: The number of ones in each row.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(as_words(genomes)).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT[genomes].sum(axis=1, dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def low_masks(max_length: int) -> np.ndarray:
+    """
+    Builds the read-only table of word masks whose row ``k`` has the lowest ``k`` bits set.
+
+    Args:
+        max_length (int): The maximum number of genes per genome.
+
+    Returns:
+        np.ndarray: The (bits + 1, words) ``uint64`` mask table.
+    """
+    bits = packed_width(max_length) * 8
+    table = np.arange(bits) < np.arange(bits + 1)[:, None]
+    masks = as_words(pack_bits(table))
+    masks.flags.writeable = False
+    return masks
+
+
+def shift_up(words: np.ndarray) -> np.ndarray:
+    """
+    Shifts every multi-word row one bit towards the higher gene positions.
+    """
+    carry = np.zeros_like(words)
+    carry[:, 1:] = words[:, :-1] >> np.uint64(63)
+    return (words << np.uint64(1)) | carry
+
+
+def shift_down(words: np.ndarray) -> np.ndarray:
+    """
+    Shifts every multi-word row one bit towards the lower gene positions.
+    """
+    carry = np.zeros_like(words)
+    carry[:, :-1] = words[:, 1:] << np.uint64(63)
+    return (words >> np.uint64(1)) | carry
+
+
+def shift_left(words: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    """
+    Shifts every multi-word row towards the higher gene positions by its own number of bits.
+
+    Args:
+        words (np.ndarray): The (population, words) ``uint64`` matrix.
+        amounts (np.ndarray): The non-negative shift of each row.
+
+    Returns:
+        np.ndarray: The shifted rows; bits moved past the last word are dropped.
+    """
+    columns = np.arange(words.shape[1])
+    source = columns - (amounts[:, None] >> 6)
+    bits = (amounts & 63).astype(np.uint64)[:, None]
+    upper = _gather(words, source) << bits
+    # A shift by 64 is undefined for uint64, so rows moving whole words get no carry
+    carry = np.where(bits > 0, _gather(words, source - 1) >> (np.uint64(64) - bits), np.uint64(0))
+    return upper | carry
+
+
+def shift_right(words: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    """
+    Shifts every multi-word row towards the lower gene positions by its own number of bits.
+
+    Args:
+        words (np.ndarray): The (population, words) ``uint64`` matrix.
+        amounts (np.ndarray): The non-negative shift of each row.
+
+    Returns:
+        np.ndarray: The shifted rows; bits moved below gene 0 are dropped.
+    """
+    columns = np.arange(words.shape[1])
+    source = columns + (amounts[:, None] >> 6)
+    bits = (amounts & 63).astype(np.uint64)[:, None]
+    lower = _gather(words, source) >> bits
+    carry = np.where(bits > 0, _gather(words, source + 1) << (np.uint64(64) - bits), np.uint64(0))
+    return lower | carry
+
+
+def _gather(words: np.ndarray, source: np.ndarray) -> np.ndarray:
+    """
+    Reads ``words[row, source[row, column]]``, giving zero where the source column is out of range.
+    """
+    inside = (source >= 0) & (source < words.shape[1])
+    gathered = np.take_along_axis(words, np.clip(source, 0, words.shape[1] - 1), axis=1)
+    return np.where(inside, gathered, np.uint64(0))
+
+
+def row_keys(genomes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Packs every genome row and its length into one opaque, hashable and sortable value.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix.
+        lengths (np.ndarray): The number of genes in each genome.
+
+    Returns:
+        np.ndarray: A 1-D ``void`` array with one key per genome; equal keys mean identical genomes.
+    """
+    rows = np.concatenate([genomes, np.asarray(lengths, dtype='<u8').view(np.uint8).reshape(-1, 8)], axis=1)
+    return np.ascontiguousarray(rows).view(np.dtype((np.void, rows.shape[1]))).ravel()
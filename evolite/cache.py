@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+from .bits import row_keys
+from .environment import Environment
+from .fitness import FitnessFunction
+from .population import PopulationArray
+
+EnvironmentKey = Callable[[Environment], Hashable]
+
+
+def quantized_environment(temperature_step: int = 1, predator_step: int = 1) -> EnvironmentKey:
+    """
+    Returns an environment key made of the temperature and predator count rounded down to the given steps.
+
+    Args:
+        temperature_step (int, optional): The width of a temperature bucket. Defaults to 1.
+        predator_step (int, optional): The width of a predator-count bucket. Defaults to 1.
+
+    Returns:
+        EnvironmentKey: The key function.
+    """
+    def key(environment: Environment) -> Hashable:
+        if environment is None:
+            return None
+        return environment.temperature // temperature_step, environment.predators['number'] // predator_step
+    return key
+
+
+class FitnessCache:
+    """
+    Memoizes a fitness function on the packed genome and the quantized environment inputs.
+
+    Every call evaluates each distinct genome of the population at most once, and only if it is not
+    already cached for the current environment key. The cache assumes the wrapped function depends on
+    the environment only through that key.
+    """
+
+    def __init__(self, fitness: FitnessFunction, max_size: int = 1 << 20,
+                 environment_key: Optional[EnvironmentKey] = None) -> None:
+        """
+        Initializes an empty cache around a fitness function.
+
+        Args:
+            fitness (FitnessFunction): The function to memoize; it receives a population of distinct genomes.
+            max_size (int, optional): The number of entries kept before the least recently used are
+                evicted. Defaults to 2**20.
+            environment_key (EnvironmentKey, optional): Maps the environment to the hashable part of the key.
+                Defaults to the exact temperature and predator count.
+        """
+        self.fitness = fitness
+        self.max_size = max_size
+        self.environment_key = environment_key or quantized_environment()
+        self.entries: 'OrderedDict[Hashable, float]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the share of distinct-genome lookups answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """
+        Returns the hit, miss and deduplication counters with the current size and hit rate.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'duplicates': self.duplicates,
+                'size': len(self.entries), 'hit_rate': self.hit_rate}
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its counters.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.duplicates = 0
+
+    def __call__(self, population: PopulationArray, environment: Environment) -> np.ndarray:
+        """
+        Returns the fitness of every organism, evaluating only the distinct genomes not yet cached.
+
+        Args:
+            population (PopulationArray): The population to evaluate.
+            environment (Environment): The environment the organisms live in.
+
+        Returns:
+            np.ndarray: The fitness vector.
+        """
+        keys = row_keys(population.genomes, population.lengths)
+        distinct, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        self.duplicates += len(keys) - len(distinct)
+
+        context = self.environment_key(environment)
+        values = np.empty(len(distinct))
+        missing = []
+        for position, key in enumerate(distinct.tolist()):
+            entry = (key, context)
+            value = self.entries.get(entry)
+            if value is None:
+                missing.append(position)
+            else:
+                self.entries.move_to_end(entry)
+                values[position] = value
+        self.hits += len(distinct) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing = np.asarray(missing)
+            computed = np.asarray(self.fitness(population.take(first[missing]), environment), dtype=np.float64)
+            values[missing] = computed
+            for position, value in zip(missing.tolist(), computed.tolist()):
+                self.entries[(distinct[position].tobytes(), context)] = value
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        population.fitness = values[inverse.ravel()]
+        return population.fitness
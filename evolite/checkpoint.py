@@ -0,0 +1,327 @@
+import json
+import os
+import struct
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .core import Simulation
+from .environment import Environment
+from .population import PopulationArray
+from .rng import RandomStreams
+from .schedule import EnvironmentSchedule
+from .spatial import SpatialEnvironment
+
+MAGIC = b'EVOLITE\x00'
+VERSION = 1
+ALIGNMENT = 64
+
+_ARRAYS = ('genomes', 'lengths', 'lifespans', 'fitness')
+# Population columns saved only when the run has them
+_OPTIONAL_ARRAYS = ('positions', 'rates', 'ids', 'species')
+# The dynamics of a spatial environment, saved with its fields
+_SPATIAL_PARAMETERS = ('diffusion', 'predator_diffusion', 'heat_diffusion', 'regrowth', 'capacity', 'consumption',
+                       'predator_birth', 'predator_death', 'predator_capacity', 'dispersal', 'radius')
+_SPATIAL_FIELDS = ('temperature_field', 'food_field', 'predator_field', 'density')
+# The species index of a speciation, saved with a 'species_' prefix
+_SPECIATION_ARRAYS = ('ids', 'genomes', 'lengths', 'keys', 'sizes', 'samples')
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def snapshot(simulation: Simulation) -> Tuple[Dict[str, object], Dict[str, np.ndarray]]:
+    """
+    Copies the full state of a simulation so it can be written while the run continues.
+
+    Args:
+        simulation (Simulation): The simulation to capture.
+
+    Returns:
+        Tuple[Dict[str, object], Dict[str, np.ndarray]]: The JSON header fields and the population arrays.
+    """
+    population = simulation.population
+    environment = simulation.environment
+    header = {
+        'version': VERSION,
+        'generation': simulation.generation,
+        'max_length': population.max_length,
+        'environment': {
+            'temperature': environment.temperature,
+            'resources': dict(environment.resources),
+            'predators': dict(environment.predators),
+        },
+        'seed': {'entropy': simulation.streams.root.entropy, 'spawn_key': list(simulation.streams.root.spawn_key)},
+        'rng': {
+            'population': simulation.rng.bit_generator.state,
+            'environment': simulation.environment_rng.bit_generator.state,
+        },
+        # Callables cannot be stored; a run using them must pass them again on load
+        'operators': {name: getattr(simulation, name) for name in ('mothers', 'fathers', 'crossover')
+                      if isinstance(getattr(simulation, name), str)},
+        'elites': simulation.elites,
+    }
+    arrays = {name: np.array(getattr(population, name)) for name in _ARRAYS}
+    arrays.update({name: np.array(getattr(population, name)) for name in _OPTIONAL_ARRAYS
+                   if getattr(population, name) is not None})
+    if simulation.mutation is not None:
+        header['mutation'], engine_arrays = simulation.mutation.state()
+        arrays.update(engine_arrays)
+    if isinstance(environment, SpatialEnvironment):
+        header['environment']['spatial'] = {name: getattr(environment, name) for name in _SPATIAL_PARAMETERS}
+        arrays.update({name: np.array(getattr(environment, name)) for name in _SPATIAL_FIELDS})
+    if isinstance(environment, EnvironmentSchedule):
+        header['environment']['day'] = environment.day
+        arrays.update({'schedule_' + name: np.array(table) for name, table in environment.tables().items()})
+    if simulation.monitor is not None:
+        header['monitor'] = simulation.monitor.state()
+    if simulation.lineage is not None:
+        header['lineage'], lineage_arrays = simulation.lineage.state()
+        arrays.update({'lineage_' + name: array for name, array in lineage_arrays.items()})
+    if simulation.speciation is not None:
+        speciation = simulation.speciation
+        header['speciation'] = {'next_species': speciation.next_species}
+        arrays.update({'species_' + name: np.array(getattr(speciation, name)) for name in _SPECIATION_ARRAYS
+                       if getattr(speciation, name) is not None})
+    return header, arrays
+
+
+def write_snapshot(path: str, header: Dict[str, object], arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Writes a captured state to ``path`` atomically.
+
+    The file is the magic bytes, the header length, a JSON header and then every array as raw
+    little-endian bytes at a 64-byte aligned offset, so it can be memory-mapped on load.
+
+    Args:
+        path (str): The checkpoint file.
+        header (Dict[str, object]): The header fields from ``snapshot``.
+        arrays (Dict[str, np.ndarray]): The population arrays from ``snapshot``.
+    """
+    arrays = {name: np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+              for name, array in arrays.items()}
+    # The header records the array offsets, so grow the reserved space until the header fits in front
+    start = _align(len(MAGIC) + 8 + len(json.dumps(header)))
+    while True:
+        layout, offset = {}, start
+        for name, array in arrays.items():
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset = _align(offset + array.nbytes)
+        encoded = json.dumps(dict(header, arrays=layout)).encode('utf-8')
+        if len(MAGIC) + 8 + len(encoded) <= start:
+            break
+        start = _align(len(MAGIC) + 8 + len(encoded))
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as checkpoint:
+        checkpoint.write(MAGIC)
+        checkpoint.write(struct.pack('<Q', len(encoded)))
+        checkpoint.write(encoded)
+        for name, array in arrays.items():
+            checkpoint.seek(layout[name]['offset'])
+            checkpoint.write(array.tobytes())
+        checkpoint.truncate(offset)
+    os.replace(temporary, path)
+
+
+def save_checkpoint(simulation: Simulation, path: str) -> None:
+    """
+    Saves the population, environment, generation counter and random state of a simulation.
+
+    Args:
+        simulation (Simulation): The simulation to save.
+        path (str): The checkpoint file, replaced atomically.
+    """
+    write_snapshot(path, *snapshot(simulation))
+
+
+def read_header(path: str) -> Dict[str, object]:
+    """
+    Reads the JSON header of a checkpoint without touching the population arrays.
+
+    Args:
+        path (str): The checkpoint file.
+
+    Returns:
+        Dict[str, object]: The header fields, including the array layout.
+    """
+    with open(path, 'rb') as checkpoint:
+        if checkpoint.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an Evolite checkpoint")
+        (length,) = struct.unpack('<Q', checkpoint.read(8))
+        header = json.loads(checkpoint.read(length).decode('utf-8'))
+    if header['version'] != VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header['version']}")
+    return header
+
+
+def load_checkpoint(path: str, mmap: bool = True, **operators) -> Simulation:
+    """
+    Restores a simulation saved with ``save_checkpoint`` so it continues exactly where it stopped.
+
+    Args:
+        path (str): The checkpoint file.
+        mmap (bool, optional): Map the population arrays copy-on-write instead of reading them.
+            Defaults to True.
+        **operators: Selection or crossover operators overriding the saved ones, required for
+            runs that used callables, and the components the run was built with, such as its
+            ``mutation`` engine, ``monitor``, ``lineage`` or ``speciation``, whose saved state is restored
+            onto them.
+
+    Returns:
+        Simulation: The restored simulation.
+
+    Raises:
+        ValueError: If the checkpoint holds the state of a component that was not passed again.
+    """
+    header = read_header(path)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if mmap and np.prod(shape):
+            arrays[name] = np.memmap(path, dtype=spec['dtype'], mode='c', offset=spec['offset'], shape=shape)
+        else:
+            count = int(np.prod(shape))
+            with open(path, 'rb') as checkpoint:
+                checkpoint.seek(spec['offset'])
+                arrays[name] = np.fromfile(checkpoint, dtype=spec['dtype'], count=count).reshape(shape)
+
+    columns = {name: arrays[name] for name in _OPTIONAL_ARRAYS if name in arrays}
+    population = PopulationArray(arrays['genomes'], arrays['lengths'], arrays['lifespans'], header['max_length'],
+                                 arrays['fitness'], **columns)
+    state = header['environment']
+    if 'schedule_temperature' in arrays:
+        environment = EnvironmentSchedule(np.array(arrays['schedule_temperature']), np.array(arrays['schedule_food']),
+                                          np.array(arrays['schedule_predators']), state['day'])
+    elif 'spatial' in state:
+        environment = SpatialEnvironment(arrays['temperature_field'], arrays['food_field'], arrays['predator_field'],
+                                         **state['spatial'])
+    else:
+        environment = Environment(state['resources'], state['predators'], state['temperature'])
+    seed = np.random.SeedSequence(header['seed']['entropy'], spawn_key=tuple(header['seed']['spawn_key']))
+    settings = dict(header['operators'], elites=header['elites'])
+    settings.update(operators)
+    simulation = Simulation(len(population), 0, RandomStreams(seed), environment, population=population, **settings)
+    if 'spatial' in state:
+        # Creating the simulation settled the organisms again; put them back where they were saved
+        population.positions = columns['positions']
+        environment.density = np.array(arrays['density'])
+    simulation.rng.bit_generator.state = header['rng']['population']
+    simulation.environment_rng.bit_generator.state = header['rng']['environment']
+    simulation.generation = header['generation']
+    if 'mutation' in header:
+        engine = simulation.mutation
+        if engine is None:
+            raise ValueError(f"{path} was saved with a mutation engine; pass one to resume it")
+        engine.restore(header['mutation'], arrays)
+    # Stopping rules and ancestry do not change how the run evolves, so a run may go on without them
+    if 'monitor' in header and simulation.monitor is not None:
+        simulation.monitor.restore(header['monitor'])
+    if 'lineage' in header and simulation.lineage is not None:
+        saved = {name[len('lineage_'):]: array for name, array in arrays.items() if name.startswith('lineage_')}
+        simulation.lineage.restore(header['lineage'], saved)
+    if 'speciation' in header:
+        speciation = simulation.speciation
+        if speciation is None:
+            raise ValueError(f"{path} was saved with a speciation; pass one to resume it")
+        speciation.next_species = header['speciation']['next_species']
+        for name in _SPECIATION_ARRAYS:
+            if 'species_' + name in arrays:
+                setattr(speciation, name, np.array(arrays['species_' + name]))
+    return simulation
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints on a background thread so the generation loop only pays for a memory copy.
+
+    If a write is still running when the next checkpoint is submitted, the pending one is replaced
+    by the newer state rather than queued behind it.
+    """
+
+    def __init__(self, path: str, every: int = 1) -> None:
+        """
+        Initializes the writer and starts its thread.
+
+        Args:
+            path (str): The checkpoint file, replaced atomically on every write.
+            every (int, optional): Only generations divisible by this are saved by ``maybe_submit``. Defaults to 1.
+        """
+        self.path = path
+        self.every = every
+        self.error: Optional[BaseException] = None
+        self.generation: Optional[int] = None
+        self._pending: Optional[Tuple[Dict[str, object], Dict[str, np.ndarray]]] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._work, name="evolite-checkpoint", daemon=True)
+        self._thread.start()
+
+    def submit(self, simulation: Simulation) -> None:
+        """
+        Captures the simulation state now and schedules it to be written.
+
+        Args:
+            simulation (Simulation): The simulation to save.
+        """
+        if self.error is not None:
+            raise self.error
+        captured = snapshot(simulation)
+        self.generation = simulation.generation
+        with self._condition:
+            self._pending = captured
+            self._condition.notify()
+
+    def maybe_submit(self, simulation: Simulation) -> None:
+        """
+        Submits the simulation if its generation counter is a multiple of ``every``.
+
+        Args:
+            simulation (Simulation): The simulation to save.
+        """
+        if simulation.generation % self.every == 0:
+            self.submit(simulation)
+
+    def flush(self, simulation: Simulation) -> None:
+        """
+        Submits the simulation unless its generation is the one submitted last, so a run's final state is
+        saved even when it does not end on a multiple of ``every``.
+
+        Args:
+            simulation (Simulation): The simulation to save.
+        """
+        if simulation.generation != self.generation:
+            self.submit(simulation)
+
+    def close(self) -> None:
+        """
+        Writes any pending checkpoint and stops the thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> 'CheckpointWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                captured, self._pending = self._pending, None
+                if captured is None:
+                    return
+            try:
+                write_snapshot(self.path, *captured)
+            except BaseException as error:
+                self.error = error
+                return
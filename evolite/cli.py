@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from .bench import BENCHMARKS, DEFAULT_LENGTHS, DEFAULT_SIZES, compare, load_results, run_benchmarks, save_results
+from .cache import FitnessCache
+from .checkpoint import CheckpointWriter, load_checkpoint, read_header
+from .convergence import ConvergenceMonitor
+from .core import Simulation
+from .crossover import CROSSOVERS
+from .ensemble import Ensemble
+from .fitness import BACKENDS, FITNESS_FUNCTIONS, FitnessEvaluator
+from .history import HistoryStore, SUMMARY_DTYPES
+from .islands import TOPOLOGIES, run_islands
+from .lineage import LineageTracker
+from .mutation import ADAPTATIONS, MutationEngine
+from .pipeline import STAGES, Pipeline
+from .population import PopulationArray
+from .schedule import EnvironmentSchedule, load_schedule
+from .selection import SELECTIONS
+from .server import serve
+from .speciation import Speciation
+from .spatial import SpatialEnvironment
+from .survival import Survival
+from .sweep import grid, run_sweep, sample
+
+# Run options a checkpoint already holds, so they cannot be given with --resume
+RESUMED_OPTIONS = ('seed', 'mothers', 'fathers', 'crossover', 'elites', 'grid')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command line parser for headless Evolite runs.
+    """
+    parser = argparse.ArgumentParser(prog="evolite", description="Headless Evolite simulations.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run one simulation and print per-generation summaries.")
+    run_parser.add_argument("--generations", type=int, default=100, help="Number of generations to run.")
+    run_parser.add_argument("--population-size", type=int, default=50, help="Size of the population.")
+    run_parser.add_argument("--dna-length", type=int, default=10, help="Length of the DNA sequence.")
+    run_parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    # Left as None when not given, so a resumed run can tell them apart from the checkpoint's own
+    run_parser.add_argument("--mothers", choices=sorted(SELECTIONS), default=None,
+                            help="Selection operator for the first parent; defaults to fittest.")
+    run_parser.add_argument("--fathers", choices=sorted(SELECTIONS), default=None,
+                            help="Selection operator for the second parent; defaults to uniform.")
+    run_parser.add_argument("--crossover", choices=sorted(CROSSOVERS), default=None,
+                            help="Crossover operator; defaults to uniform.")
+    run_parser.add_argument("--elites", type=int, default=None,
+                            help="Fittest organisms carried over unchanged; defaults to 0.")
+    run_parser.add_argument("--mutation-rate", type=float, default=None,
+                            help="Per-gene flip rate; enables the batched mutation engine.")
+    run_parser.add_argument("--duplication-rate", type=float, default=0.0, help="Per-gene duplication rate.")
+    run_parser.add_argument("--deletion-rate", type=float, default=0.0, help="Per-gene deletion rate.")
+    run_parser.add_argument("--adaptation", choices=[name for name in ADAPTATIONS if name], default=None,
+                            help="Adapt the flip rate by the 1/5th rule or per organism.")
+    run_parser.add_argument("--max-length", type=int, default=None, help="Genome length cap of the engine.")
+    run_parser.add_argument("--fitness", choices=sorted(FITNESS_FUNCTIONS), default="count_ones",
+                            help="Registered fitness function.")
+    run_parser.add_argument("--fitness-backend", choices=BACKENDS, default="vectorized",
+                            help="How fitness evaluation is dispatched.")
+    run_parser.add_argument("--workers", type=int, default=None,
+                            help="Fitness worker processes; defaults to all cores.")
+    run_parser.add_argument("--cache", action="store_true", help="Memoize fitness by genome and environment.")
+    run_parser.add_argument("--survival", action="store_true",
+                            help="Cull each generation by starvation and predation so its size varies.")
+    run_parser.add_argument("--fecundity", type=float, default=2.0, help="Offspring per survivor with --survival.")
+    run_parser.add_argument("--max-population", type=int, default=None, help="Population cap with --survival.")
+    run_parser.add_argument("--speciation", action="store_true",
+                            help="Share fitness and mate within species found by genome hashing.")
+    run_parser.add_argument("--species-threshold", type=float, default=0.2,
+                            help="Largest distance per gene from a species' representative.")
+    run_parser.add_argument("--species-bands", type=int, default=4, help="Hash bands of the species index.")
+    run_parser.add_argument("--species-bits", type=int, default=8, help="Sampled genes per hash band.")
+    run_parser.add_argument("--interspecies", type=float, default=0.0,
+                            help="Probability that a father comes from outside the mother's species.")
+    run_parser.add_argument("--grid", type=grid_shape, default=None,
+                            help="HEIGHTxWIDTH of a spatial environment; use with --fitness spatial.")
+    run_parser.add_argument("--schedule", default=None,
+                            help="Environment schedule to replay; with --resume, from the checkpoint's generation.")
+    run_parser.add_argument("--checkpoint", default=None, help="File to save checkpoints to in the background.")
+    run_parser.add_argument("--checkpoint-every", type=int, default=10, help="Generations between checkpoints.")
+    run_parser.add_argument("--resume", default=None, help="Checkpoint to continue from; --generations counts on.")
+    run_parser.add_argument("--history", default=None,
+                            help="Directory to stream per-generation history to; an existing one is only appended to.")
+    run_parser.add_argument("--lineage", action="store_true",
+                            help="Track maternal ancestry and report the most recent common ancestor.")
+    run_parser.add_argument("--disable-stage", action="append", choices=list(STAGES), default=[],
+                            help="Skip a pipeline stage; may be repeated.")
+    run_parser.add_argument("--timings", default=None,
+                            help="JSON lines file to write per-stage timings to; totals go to standard error.")
+    run_parser.add_argument("--trace-allocations", action="store_true", help="Also record per-stage allocations.")
+    run_parser.add_argument("--folded", default=None, help="File to write per-stage times to as folded stacks.")
+    run_parser.add_argument("--profile", default=None, help="File to write cProfile statistics to.")
+    add_stopping_arguments(run_parser)
+    run_parser.add_argument("--every", type=int, default=1, help="Print every Nth generation only.")
+    run_parser.add_argument("--format", choices=["text", "jsonl"], default="text", help="Output format.")
+    run_parser.set_defaults(handler=run_command)
+
+    sweep_parser = commands.add_parser("sweep", help="Run a parameter grid across every core.")
+    sweep_parser.add_argument("output", help="JSON lines results file; an existing file is resumed.")
+    sweep_parser.add_argument("--generations", type=int_list, default=[100], help="Comma-separated generations.")
+    sweep_parser.add_argument("--population-size", type=int_list, default=[50], help="Comma-separated sizes.")
+    sweep_parser.add_argument("--dna-length", type=int_list, default=[10], help="Comma-separated DNA lengths.")
+    sweep_parser.add_argument("--seeds", type=int_list, default=[0], help="Comma-separated seeds.")
+    sweep_parser.add_argument("--temperature", type=int_list, default=[25], help="Comma-separated temperatures.")
+    sweep_parser.add_argument("--food", type=int_list, default=[100], help="Comma-separated food amounts.")
+    sweep_parser.add_argument("--predators", type=int_list, default=[5], help="Comma-separated predator counts.")
+    sweep_parser.add_argument("--samples", type=int, default=None, help="Run a random sample of the grid.")
+    sweep_parser.add_argument("--sample-seed", type=int, default=None, help="Seed of the grid sample.")
+    sweep_parser.add_argument("--workers", type=int, default=None, help="Worker processes; defaults to all cores.")
+    add_stopping_arguments(sweep_parser)
+    sweep_parser.set_defaults(handler=sweep_command)
+
+    islands_parser = commands.add_parser("islands", help="Run one simulation split across island processes.")
+    islands_parser.add_argument("--generations", type=int, default=100, help="Number of generations to run.")
+    islands_parser.add_argument("--population-size", type=int, default=1000, help="Total size of the population.")
+    islands_parser.add_argument("--dna-length", type=int, default=10, help="Length of the DNA sequence.")
+    islands_parser.add_argument("--islands", type=int, default=None, help="Number of islands; defaults to all cores.")
+    islands_parser.add_argument("--migrants", type=int, default=2, help="Organisms sent per migration.")
+    islands_parser.add_argument("--interval", type=int, default=10, help="Generations between migrations.")
+    islands_parser.add_argument("--topology", choices=sorted(TOPOLOGIES), default="ring", help="Migration topology.")
+    islands_parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    islands_parser.set_defaults(handler=islands_command)
+
+    schedule_parser = commands.add_parser("schedule", help="Generate an environment schedule to replay.")
+    schedule_parser.add_argument("output", help="NPZ file to save the schedule to.")
+    schedule_parser.add_argument("--days", type=int, default=100, help="Days after the starting one.")
+    schedule_parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    schedule_parser.add_argument("--min-temperature", type=int, default=None, help="Lowest temperature of the walk.")
+    schedule_parser.add_argument("--max-temperature", type=int, default=None, help="Highest temperature of the walk.")
+    schedule_parser.add_argument("--season-amplitude", type=float, default=0.0, help="Degrees of the seasonal cycle.")
+    schedule_parser.add_argument("--season-period", type=float, default=365.0, help="Days of one seasonal cycle.")
+    schedule_parser.add_argument("--shock-rate", type=float, default=0.0, help="Daily probability of a shock.")
+    schedule_parser.add_argument("--shock-size", type=float, default=5.0, help="Standard deviation of a shock.")
+    schedule_parser.add_argument("--shock-length", type=int, default=5, help="Days every shock lasts.")
+    schedule_parser.set_defaults(handler=schedule_command)
+
+    ensemble_parser = commands.add_parser("ensemble", help="Run many replicates at once and average their curves.")
+    ensemble_parser.add_argument("--replicates", type=int, default=100, help="Number of replicates.")
+    ensemble_parser.add_argument("--generations", type=int, default=100, help="Number of generations to run.")
+    ensemble_parser.add_argument("--population-size", type=int, default=50, help="Size of every population.")
+    ensemble_parser.add_argument("--dna-length", type=int, default=10, help="Length of the DNA sequence.")
+    ensemble_parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    ensemble_parser.add_argument("--mothers", choices=sorted(SELECTIONS), default="fittest",
+                                 help="Selection operator for the first parents.")
+    ensemble_parser.add_argument("--fathers", choices=sorted(SELECTIONS), default="uniform",
+                                 help="Selection operator for the second parents.")
+    ensemble_parser.add_argument("--elites", type=int, default=0, help="Fittest organisms carried over.")
+    ensemble_parser.add_argument("--crossover", choices=sorted(CROSSOVERS), default="uniform",
+                                 help="Crossover operator.")
+    ensemble_parser.add_argument("--confidence", type=float, default=0.95, help="Coverage of the intervals.")
+    ensemble_parser.add_argument("--curves", default=None, help="NPZ file to save every replicate's curves to.")
+    ensemble_parser.add_argument("--format", choices=["text", "jsonl"], default="text", help="Output format.")
+    ensemble_parser.set_defaults(handler=ensemble_command)
+
+    history_parser = commands.add_parser("history", help="Print columns of a recorded history.")
+    history_parser.add_argument("directory", help="History directory written by run --history.")
+    history_parser.add_argument("--columns", type=lambda value: value.split(","),
+                                default=["generation", "best_fitness", "mean_fitness"],
+                                help=f"Comma-separated columns out of {', '.join(SUMMARY_DTYPES)}.")
+    history_parser.add_argument("--start", type=int, default=None, help="First generation.")
+    history_parser.add_argument("--stop", type=int, default=None, help="Generation after the last one.")
+    history_parser.set_defaults(handler=history_command)
+
+    bench_parser = commands.add_parser("bench", help="Time every operator and whole generations.")
+    bench_parser.add_argument("--benchmarks", type=lambda value: value.split(","), default=None,
+                              help=f"Comma-separated benchmarks out of {', '.join(BENCHMARKS)}.")
+    bench_parser.add_argument("--sizes", type=int_list, default=list(DEFAULT_SIZES),
+                              help="Comma-separated population sizes.")
+    bench_parser.add_argument("--lengths", type=int_list, default=list(DEFAULT_LENGTHS),
+                              help="Comma-separated DNA lengths.")
+    bench_parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per case.")
+    bench_parser.add_argument("--min-time", type=float, default=0.05, help="Shortest duration of one repeat.")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Seed of every benchmark population.")
+    bench_parser.add_argument("--output", default=None, help="JSON file to save the results to.")
+    bench_parser.add_argument("--baseline", default=None, help="JSON results to compare against.")
+    bench_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown.")
+    bench_parser.set_defaults(handler=bench_command)
+
+    serve_parser = commands.add_parser("serve", help="Serve simulation jobs over HTTP.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Jobs run at once; defaults to all cores.")
+    serve_parser.add_argument("--directory", default=None, help="Directory for job checkpoints.")
+    serve_parser.set_defaults(handler=serve_command)
+
+    dashboard_parser = commands.add_parser("dashboard", help="Open the live Tk dashboard.")
+    dashboard_parser.add_argument("--frame-rate", type=int, default=30, help="Most redraws per second.")
+    dashboard_parser.add_argument("--top", type=int, default=10, help="Fittest organisms shown.")
+    dashboard_parser.set_defaults(handler=dashboard_command)
+    return parser
+
+
+def add_stopping_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the early-stopping rules of a ``ConvergenceMonitor`` to a command.
+    """
+    parser.add_argument("--stagnation", type=int, default=None,
+                        help="Stop after this many generations without improvement of the best fitness.")
+    parser.add_argument("--min-improvement", type=float, default=0.0,
+                        help="Smallest rise of the best fitness that counts as improvement.")
+    parser.add_argument("--target-fitness", type=float, default=None, help="Stop once the best fitness reaches this.")
+    parser.add_argument("--diversity-floor", type=float, default=None,
+                        help="Stop once the Hamming diversity per gene falls to this.")
+    parser.add_argument("--unique-floor", type=int, default=None,
+                        help="Stop once the distinct genomes in a sample fall to this.")
+    parser.add_argument("--time-budget", type=float, default=None, help="Stop after this many seconds.")
+
+
+def stopping_rules(args: argparse.Namespace) -> Optional[Dict[str, object]]:
+    """
+    Returns the ``ConvergenceMonitor`` arguments given on the command line, or None if no rule is on.
+    """
+    rules = {'stagnation': args.stagnation, 'target_fitness': args.target_fitness,
+             'diversity_floor': args.diversity_floor, 'unique_floor': args.unique_floor,
+             'time_budget': args.time_budget}
+    if all(value is None for value in rules.values()):
+        return None
+    return dict(rules, min_improvement=args.min_improvement)
+
+
+def int_list(value: str) -> List[int]:
+    """
+    Parses a comma-separated list of integers.
+    """
+    return [int(item) for item in value.split(",") if item]
+
+
+def grid_shape(value: str) -> Tuple[int, int]:
+    """
+    Parses a HEIGHTxWIDTH grid shape.
+    """
+    height, _, width = value.lower().partition("x")
+    return int(height), int(width or height)
+
+
+def check_run_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Rejects combinations of run options that would silently give wrong results.
+    """
+    if args.cache and args.fitness == "spatial":
+        parser.error("--cache cannot be used with --fitness spatial, whose fitness depends on position")
+    if args.grid and args.schedule:
+        parser.error("--grid and --schedule are two different environments; give only one")
+    if args.resume:
+        given = [name for name in RESUMED_OPTIONS if getattr(args, name) is not None]
+        if given:
+            parser.error(f"--resume continues with the checkpoint's {', '.join(given)}; "
+                         f"drop {', '.join('--' + name for name in given)}")
+    header = read_header(args.resume) if args.resume else None
+    days = None
+    if args.schedule:
+        days = load_schedule(args.schedule).days
+    elif header is not None:
+        table = header['arrays'].get('schedule_temperature')
+        days = None if table is None else table['shape'][0] - 1
+    if days is not None and args.generations > days:
+        parser.error(f"--generations {args.generations} is longer than the schedule of {days} days")
+    if args.history and os.path.isdir(args.history):
+        # A history only grows, so a run may append to one only from where it left off
+        recorded = HistoryStore(args.history).last_generation
+        if recorded > (header['generation'] if header is not None else 0):
+            parser.error(f"--history {args.history} already holds generations up to {recorded}; use a new directory "
+                         f"or --resume from a checkpoint at generation {recorded} or later")
+
+
+def check_schedule_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Rejects schedule options that cannot describe a climate.
+    """
+    if args.shock_length < 1:
+        parser.error(f"--shock-length must be at least 1 day, not {args.shock_length}")
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Runs one simulation and writes its summaries to standard output.
+    """
+    evaluator = FitnessEvaluator(args.fitness, args.fitness_backend, args.workers)
+    fitness = FitnessCache(evaluator) if args.cache else evaluator
+    survival = Survival(fecundity=args.fecundity, max_size=args.max_population) if args.survival else None
+    pipeline = Pipeline(instrument=bool(args.timings or args.folded), trace_allocations=args.trace_allocations,
+                        profile=bool(args.profile))
+    for stage in args.disable_stage:
+        pipeline.disable(stage)
+    mutation = None
+    if args.mutation_rate is not None or args.adaptation or args.duplication_rate or args.deletion_rate:
+        mutation = MutationEngine(0.05 if args.mutation_rate is None else args.mutation_rate, args.duplication_rate,
+                                  args.deletion_rate, args.max_length, args.adaptation)
+    speciation = None
+    if args.speciation:
+        speciation = Speciation(args.species_threshold, args.species_bands, args.species_bits, args.interspecies)
+    rules = stopping_rules(args)
+    monitor = ConvergenceMonitor(**rules) if rules else None
+    lineage = LineageTracker() if args.lineage else None
+    if args.resume:
+        simulation = load_checkpoint(args.resume, fitness=fitness, survival=survival, pipeline=pipeline,
+                                     mutation=mutation, monitor=monitor, lineage=lineage, speciation=speciation)
+        if args.schedule:
+            simulation.environment = load_schedule(args.schedule).replay(simulation.generation)
+    else:
+        environment = None
+        if args.grid:
+            environment = SpatialEnvironment.uniform(*args.grid)
+        elif args.schedule:
+            environment = load_schedule(args.schedule)
+        operators = {name: getattr(args, name) for name in ('mothers', 'fathers', 'crossover', 'elites')
+                     if getattr(args, name) is not None}
+        simulation = Simulation(args.population_size, args.dna_length, args.seed, environment, fitness=fitness,
+                                survival=survival, pipeline=pipeline, mutation=mutation, monitor=monitor,
+                                lineage=lineage, speciation=speciation, **operators)
+    writer = CheckpointWriter(args.checkpoint, args.checkpoint_every) if args.checkpoint else None
+    if args.history:
+        simulation.history = HistoryStore(args.history)
+    try:
+        for summary in simulation.run(args.generations - simulation.generation):
+            if writer:
+                writer.maybe_submit(simulation)
+            last = summary.generation == args.generations or simulation.stop_reason is not None
+            if summary.generation % args.every and not last:
+                continue
+            if args.format == "jsonl":
+                sys.stdout.write(json.dumps(summary._asdict()) + "\n")
+            else:
+                sys.stdout.write(f"Generation {summary.generation}: best {summary.best_fitness:g} "
+                                 f"mean {summary.mean_fitness:.3f} population {summary.population_size} "
+                                 f"temperature {summary.temperature}\n")
+        if writer:
+            writer.flush(simulation)
+        if simulation.stop_reason is not None:
+            sys.stderr.write(f"Stopped at generation {simulation.generation}: {simulation.stop_reason}\n")
+        if simulation.speciation is not None:
+            sys.stderr.write(f"Species: {len(simulation.speciation)} living, "
+                             f"{simulation.speciation.next_species} founded\n")
+        if simulation.lineage is not None and simulation.population.ids is not None:
+            write_lineage(simulation.lineage, simulation.population)
+    finally:
+        evaluator.close()
+        if writer:
+            writer.close()
+        if simulation.history is not None:
+            simulation.history.close()
+        write_instrumentation(pipeline, args)
+    return 0
+
+
+def write_instrumentation(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    """
+    Writes the timings, folded stacks and profile a run was asked for, and prints the per-stage totals.
+    """
+    if args.timings:
+        pipeline.write_timings(args.timings)
+        for name, total in pipeline.stage_totals().items():
+            sys.stderr.write(f"{name:<10} {total['seconds']:10.4f}s {total['share']:7.1%} "
+                             f"{total['allocated'] / 2 ** 20:10.1f} MiB\n")
+    if args.folded:
+        pipeline.write_folded(args.folded)
+    if args.profile:
+        pipeline.dump_profile(args.profile)
+
+
+def write_lineage(lineage: LineageTracker, population: PopulationArray) -> None:
+    """
+    Prints the size of the lineage and the most recent common ancestor of the living organisms.
+    """
+    ancestor = lineage.common_ancestor(population.ids)
+    if ancestor is None:
+        sys.stderr.write(f"Lineage: {len(lineage)} nodes, no common ancestor since the founders\n")
+        return
+    node = lineage.node(ancestor)
+    sys.stderr.write(f"Lineage: {len(lineage)} nodes, most recent common ancestor {ancestor} born at "
+                     f"generation {node.generation} with {node.length} genes\n")
+
+
+def sweep_command(args: argparse.Namespace) -> int:
+    """
+    Runs or resumes a parameter sweep and reports how many cells were run.
+    """
+    cells = grid(args.generations, args.population_size, args.dna_length, args.seeds,
+                 args.temperature, args.food, args.predators)
+    if args.samples is not None:
+        cells = sample(cells, args.samples, args.sample_seed)
+    count = run_sweep(cells, args.output, args.workers, stopping=stopping_rules(args))
+    sys.stdout.write(f"Ran {count} of {len(cells)} cells into {args.output}\n")
+    return 0
+
+
+def islands_command(args: argparse.Namespace) -> int:
+    """
+    Runs an island-model simulation and prints the final state of every island.
+    """
+    results = run_islands(args.generations, args.population_size, args.dna_length, args.islands,
+                          args.migrants, args.interval, args.topology, args.seed)
+    for result in results:
+        last = result.summaries[-1]
+        sys.stdout.write(f"Island {result.island}: best {last.best_fitness:g} mean {last.mean_fitness:.3f} "
+                         f"unique genomes {result.unique_genomes}\n")
+    return 0
+
+
+def schedule_command(args: argparse.Namespace) -> int:
+    """
+    Generates an environment schedule, saves it and prints its range.
+    """
+    temperature_range = (args.min_temperature, args.max_temperature)
+    schedule = EnvironmentSchedule.generate(args.days, args.seed, temperature_range=temperature_range,
+                                            season=(args.season_amplitude, args.season_period),
+                                            shock_rate=args.shock_rate, shock_size=args.shock_size,
+                                            shock_length=args.shock_length)
+    schedule.save(args.output)
+    for name, table in schedule.tables().items():
+        sys.stdout.write(f"{name}: {table.min()} to {table.max()}, ending at {table[-1]}\n")
+    return 0
+
+
+def ensemble_command(args: argparse.Namespace) -> int:
+    """
+    Runs an ensemble and prints the mean best and mean fitness of every generation with their intervals.
+    """
+    ensemble = Ensemble(args.replicates, args.population_size, args.dna_length, args.seed, args.mothers,
+                        args.fathers, args.elites, args.crossover)
+    result = ensemble.evolve(args.generations)
+    if args.curves:
+        result.save(args.curves)
+    best = result.aggregate("best_fitness", args.confidence)
+    mean = result.aggregate("mean_fitness", args.confidence)
+    for row, generation in enumerate(result.generation):
+        if args.format == "jsonl":
+            record = {"generation": int(generation)}
+            for name, curve in (("best_fitness", best), ("mean_fitness", mean)):
+                record.update({f"{name}_{key}": float(values[row]) for key, values in curve.items()})
+            sys.stdout.write(json.dumps(record) + "\n")
+        else:
+            sys.stdout.write(f"Generation {generation}: best {best['mean'][row]:.3f} "
+                             f"[{best['lower'][row]:.3f}, {best['upper'][row]:.3f}] "
+                             f"mean {mean['mean'][row]:.3f} [{mean['lower'][row]:.3f}, {mean['upper'][row]:.3f}]\n")
+    return 0
+
+
+def history_command(args: argparse.Namespace) -> int:
+    """
+    Prints the requested history columns as tab-separated rows.
+    """
+    store = HistoryStore(args.directory)
+    columns = [store.column(name, args.start, args.stop) for name in args.columns]
+    sys.stdout.write("\t".join(args.columns) + "\n")
+    for row in zip(*columns):
+        sys.stdout.write("\t".join(f"{value:g}" for value in row) + "\n")
+    return 0
+
+
+def bench_command(args: argparse.Namespace) -> int:
+    """
+    Runs the benchmarks, optionally saves them, and fails if any regressed against the baseline.
+    """
+    def report(result) -> None:
+        sys.stdout.write(f"{result.key:<40} {result.seconds * 1e3:12.4f} ms "
+                         f"{result.organisms_per_second:14.0f} organisms/s\n")
+        sys.stdout.flush()
+
+    results = run_benchmarks(args.benchmarks, args.sizes, args.lengths, args.repeats, args.min_time, args.seed,
+                             progress=report)
+    if args.output:
+        save_results(results, args.output)
+    if not args.baseline:
+        return 0
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        sys.stderr.write(f"REGRESSION {regression.key}: {regression.baseline * 1e3:.4f} ms -> "
+                         f"{regression.seconds * 1e3:.4f} ms ({regression.ratio:.2f}x slower)\n")
+    return 1 if regressions else 0
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    """
+    Serves simulation jobs over HTTP until interrupted.
+    """
+    sys.stderr.write(f"Serving jobs on http://{args.host}:{args.port}/jobs\n")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.directory))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def dashboard_command(args: argparse.Namespace) -> int:
+    """
+    Opens the live dashboard until its window is closed.
+    """
+    # Imported here so headless commands work without Tk
+    from .dashboard import main as dashboard
+
+    dashboard(args.frame_rate, args.top)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of ``python -m evolite``.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        check_run_arguments(parser, args)
+    elif args.command == "schedule":
+        check_schedule_arguments(parser, args)
+    return args.handler(args)
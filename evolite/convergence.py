@@ -0,0 +1,197 @@
+import time
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from .bits import row_keys, unpack_bits
+from .population import PopulationArray
+
+STOP_REASONS = ('target_fitness', 'stagnation', 'diversity_floor', 'unique_floor', 'time_budget')
+
+
+class Diversity(NamedTuple):
+    """
+    Measures how varied the genomes of a population are.
+    """
+
+    hamming: float
+    normalized: float
+    unique: int
+    sampled: int
+
+
+def sample_rows(population: PopulationArray, sample: Optional[int] = None) -> np.ndarray:
+    """
+    Returns evenly spaced positions of at most ``sample`` organisms, without drawing random numbers.
+
+    Args:
+        population (PopulationArray): The organisms.
+        sample (int, optional): The most organisms to keep. Defaults to all of them.
+
+    Returns:
+        np.ndarray: The positions of the sampled organisms.
+    """
+    if sample is None or len(population) <= sample:
+        return np.arange(len(population))
+    return np.linspace(0, len(population) - 1, sample).astype(np.int64)
+
+
+def allele_frequencies(population: PopulationArray, sample: Optional[int] = None) -> np.ndarray:
+    """
+    Returns the share of organisms carrying a one at every gene position, a missing gene counting as zero.
+
+    Args:
+        population (PopulationArray): The organisms.
+        sample (int, optional): The most organisms to count. Defaults to all of them.
+
+    Returns:
+        np.ndarray: One frequency per position up to ``max_length``.
+    """
+    rows = sample_rows(population, sample)
+    if not len(rows):
+        return np.zeros(population.max_length)
+    counts = unpack_bits(population.genomes[rows], population.max_length).sum(axis=0, dtype=np.int64)
+    return counts / len(rows)
+
+
+def diversity(population: PopulationArray, sample: Optional[int] = 1000) -> Diversity:
+    """
+    Measures the mean pairwise Hamming distance and the number of distinct genomes of a population.
+
+    The mean distance over all pairs follows from the allele frequencies ``p`` alone as
+    ``sum(2 p (1 - p)) * n / (n - 1)``, so it costs one pass over the packed genomes instead of one per pair.
+
+    Args:
+        population (PopulationArray): The organisms.
+        sample (int, optional): The most organisms to measure, evenly spaced. Defaults to 1000.
+
+    Returns:
+        Diversity: The mean distance, the distance per gene of the mean genome length, and the distinct
+        genomes among the sampled organisms.
+    """
+    rows = sample_rows(population, sample)
+    if len(rows) < 2:
+        return Diversity(0.0, 0.0, len(rows), len(rows))
+    frequencies = allele_frequencies(population.take(rows))
+    hamming = float(np.sum(2 * frequencies * (1 - frequencies)) * len(rows) / (len(rows) - 1))
+    unique = len(np.unique(row_keys(population.genomes[rows], population.lengths[rows])))
+    return Diversity(hamming, hamming / float(population.lengths[rows].mean()), unique, len(rows))
+
+
+class ConvergenceMonitor:
+    """
+    Watches a run's summaries and genomes and tells when it should stop early.
+
+    The rules are checked after every evaluated generation, and any rule left as None is off:
+    reaching a target fitness, no improvement of the best fitness for a stagnation window, diversity
+    falling to a floor, or a wall-clock budget running out.
+    """
+
+    def __init__(self, stagnation: Optional[int] = None, min_improvement: float = 0.0,
+                 target_fitness: Optional[float] = None, diversity_floor: Optional[float] = None,
+                 unique_floor: Optional[int] = None, time_budget: Optional[float] = None, sample: int = 1000,
+                 every: int = 1) -> None:
+        """
+        Initializes a ConvergenceMonitor.
+
+        Args:
+            stagnation (int, optional): The generations without improvement after which the run stops.
+            min_improvement (float, optional): The smallest rise of the best fitness that counts as
+                improvement. Defaults to 0.0.
+            target_fitness (float, optional): The best fitness at which the run stops.
+            diversity_floor (float, optional): The normalized Hamming diversity at or below which the run stops.
+            unique_floor (int, optional): The number of distinct sampled genomes at or below which the run stops.
+            time_budget (float, optional): The seconds after the first generation at which the run stops.
+            sample (int, optional): The most organisms measured for diversity. Defaults to 1000.
+            every (int, optional): The generations between diversity measurements. Defaults to 1.
+        """
+        self.stagnation = stagnation
+        self.min_improvement = min_improvement
+        self.target_fitness = target_fitness
+        self.diversity_floor = diversity_floor
+        self.unique_floor = unique_floor
+        self.time_budget = time_budget
+        self.sample = sample
+        self.every = every
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets every observed generation.
+        """
+        self.best_fitness = float('-inf')
+        self.last_improvement: Optional[int] = None
+        self.diversity: Optional[Diversity] = None
+        self.stop_reason: Optional[str] = None
+        self._started: Optional[float] = None
+
+    def state(self) -> Dict[str, object]:
+        """
+        Returns what the monitor has observed so far as JSON fields, for checkpoints.
+
+        The time budget is saved as the seconds already spent, so a resumed run counts on from them rather
+        than from its own start.
+        """
+        return {
+            'best_fitness': None if self.last_improvement is None else self.best_fitness,
+            'last_improvement': self.last_improvement,
+            'diversity': None if self.diversity is None else list(self.diversity),
+            'stop_reason': self.stop_reason,
+            'elapsed': None if self._started is None else time.perf_counter() - self._started,
+        }
+
+    def restore(self, state: Dict[str, object]) -> None:
+        """
+        Puts back a state returned by ``state``, forgetting everything observed since.
+
+        Args:
+            state (Dict[str, object]): The JSON fields.
+        """
+        self.reset()
+        if state['last_improvement'] is not None:
+            self.best_fitness, self.last_improvement = state['best_fitness'], state['last_improvement']
+        self.diversity = None if state['diversity'] is None else Diversity(*state['diversity'])
+        self.stop_reason = state['stop_reason']
+        if state['elapsed'] is not None:
+            self._started = time.perf_counter() - state['elapsed']
+
+    @property
+    def measures_diversity(self) -> bool:
+        """
+        Returns whether any rule needs the diversity of the population.
+        """
+        return self.diversity_floor is not None or self.unique_floor is not None
+
+    def observe(self, generation: int, best_fitness: float, population: PopulationArray) -> Optional[str]:
+        """
+        Records one evaluated generation and checks every stopping rule.
+
+        Args:
+            generation (int): The generation number.
+            best_fitness (float): The best fitness of the generation.
+            population (PopulationArray): The evaluated organisms.
+
+        Returns:
+            Optional[str]: The rule that says the run should stop, from ``STOP_REASONS``, or None.
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        if best_fitness > self.best_fitness + self.min_improvement or self.last_improvement is None:
+            self.best_fitness = max(self.best_fitness, best_fitness)
+            self.last_improvement = generation
+        if self.measures_diversity and generation % self.every == 0:
+            self.diversity = diversity(population, self.sample)
+
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            self.stop_reason = 'target_fitness'
+        elif self.stagnation is not None and generation - self.last_improvement >= self.stagnation:
+            self.stop_reason = 'stagnation'
+        elif (self.diversity_floor is not None and self.diversity is not None
+              and self.diversity.normalized <= self.diversity_floor):
+            self.stop_reason = 'diversity_floor'
+        elif (self.unique_floor is not None and self.diversity is not None
+              and self.diversity.unique <= self.unique_floor):
+            self.stop_reason = 'unique_floor'
+        elif self.time_budget is not None and time.perf_counter() - self._started >= self.time_budget:
+            self.stop_reason = 'time_budget'
+        return self.stop_reason
@@ -0,0 +1,208 @@
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from .crossover import Crossover
+from .environment import Environment
+from .fitness import FitnessFunction, get_fitness
+from .pipeline import Pipeline
+from .population import PopulationArray
+from .rng import ENVIRONMENT_STREAM, POPULATION_STREAM, RandomStreams, SeedLike, as_streams
+from .selection import Selection
+
+if TYPE_CHECKING:
+    from .convergence import ConvergenceMonitor
+    from .history import HistoryStore
+    from .lineage import LineageTracker
+    from .speciation import Speciation
+    from .mutation import MutationEngine
+    from .survival import Survival
+
+
+class GenerationSummary(NamedTuple):
+    """
+    Summarizes one generation of a simulation run.
+    """
+
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    population_size: int
+    temperature: int
+    food: int
+    predators: int
+
+
+def default_environment() -> Environment:
+    """
+    Returns the starting environment used by the simulations: 100 food and 5 predators at 25 degrees.
+    """
+    return Environment({'food': 100}, {'number': 5})
+
+
+class Simulation:
+    """
+    Holds the state of a headless simulation run and advances it one generation at a time.
+    """
+
+    def __init__(self, population_size: int, dna_length: int, seed: Union[SeedLike, RandomStreams] = None,
+                 environment: Optional[Environment] = None, mothers: Union[str, Selection] = 'fittest',
+                 fathers: Union[str, Selection] = 'uniform', elites: int = 0,
+                 crossover: Union[str, Crossover] = 'uniform', population: Optional[PopulationArray] = None,
+                 history: Optional['HistoryStore'] = None,
+                 fitness: Union[None, str, FitnessFunction] = None, survival: Optional['Survival'] = None,
+                 pipeline: Optional[Pipeline] = None, mutation: Optional['MutationEngine'] = None,
+                 monitor: Optional['ConvergenceMonitor'] = None, lineage: Optional['LineageTracker'] = None,
+                 speciation: Optional['Speciation'] = None) -> None:
+        """
+        Initializes a Simulation with a random population, or with a given one.
+
+        Args:
+            population_size (int): The size of the population.
+            dna_length (int): The length of the DNA sequence.
+            seed (Union[SeedLike, RandomStreams], optional): The root seed of the run's random streams.
+                Defaults to an unseeded run.
+            environment (Environment, optional): The starting environment. Defaults to 100 food and 5 predators.
+            mothers (Union[str, Selection], optional): The selection operator for the first parents.
+                Defaults to 'fittest'.
+            fathers (Union[str, Selection], optional): The selection operator for the second parents.
+                Defaults to 'uniform'.
+            elites (int, optional): The number of fittest organisms carried over unchanged. Defaults to 0.
+            crossover (Union[str, Crossover], optional): The crossover operator. Defaults to 'uniform'.
+            population (PopulationArray, optional): The starting population, e.g. from a checkpoint.
+                Defaults to a random one of ``population_size`` organisms with ``dna_length`` genes.
+            history (HistoryStore, optional): The store every evaluated generation is recorded to.
+            fitness (Union[str, FitnessFunction], optional): A registered fitness name, or a function computing
+                the fitness vector of a population in an environment. Defaults to
+                ``PopulationArray.calculate_fitness``.
+            survival (Survival, optional): The starvation and predation stage culling every evaluated
+                generation before it breeds, which lets the population size vary. Defaults to a fixed size.
+            pipeline (Pipeline, optional): The stages every generation runs through. Defaults to the
+                uninstrumented ``DEFAULT_STAGES``.
+            mutation (MutationEngine, optional): The engine mutating every child. Defaults to one random
+                point, duplication or deletion per child.
+            monitor (ConvergenceMonitor, optional): The stopping rules that end ``run`` early. Defaults to
+                always running every generation.
+            lineage (LineageTracker, optional): Records the parents, mutations and genome of every child.
+                Defaults to discarding ancestry.
+            speciation (Speciation, optional): Shares fitness and mates organisms within species. Defaults to
+                selecting from the whole population.
+        """
+        # Separate streams keep the climate trajectory independent of the population size
+        self.streams = as_streams(seed)
+        self.rng = self.streams.stream(POPULATION_STREAM)
+        self.environment_rng = self.streams.stream(ENVIRONMENT_STREAM)
+        self.environment = environment or default_environment()
+        if population is None:
+            population = PopulationArray.random(population_size, dna_length, self.rng)
+        self.population = population
+        self.environment.settle(self.population, self.rng)
+        self.mothers = mothers
+        self.fathers = fathers
+        self.elites = elites
+        self.crossover = crossover
+        self.history = history
+        self.fitness = fitness if fitness is None else get_fitness(fitness)
+        self.survival = survival
+        self.pipeline = pipeline or Pipeline()
+        self.mutation = mutation
+        self.monitor = monitor
+        self.lineage = lineage
+        self.speciation = speciation
+        self.stop_reason: Optional[str] = None
+        self.generation = 0
+
+    def evaluate(self) -> np.ndarray:
+        """
+        Calculates the fitness of the current population in the current environment.
+
+        Returns:
+            np.ndarray: The fitness vector, also stored on the population.
+        """
+        if self.fitness is None:
+            return self.population.calculate_fitness(self.environment)
+        self.population.fitness = np.asarray(self.fitness(self.population, self.environment), dtype=np.float64)
+        return self.population.fitness
+
+    def summary(self) -> GenerationSummary:
+        """
+        Returns the summary of the current, already evaluated, generation.
+        """
+        fitness = self.population.fitness
+        return GenerationSummary(
+            generation=self.generation,
+            best_fitness=float(fitness.max()) if len(fitness) else 0.0,
+            mean_fitness=float(fitness.mean()) if len(fitness) else 0.0,
+            population_size=len(self.population),
+            temperature=self.environment.temperature,
+            food=self.environment.resources['food'],
+            predators=self.environment.predators['number'],
+        )
+
+    def step(self) -> GenerationSummary:
+        """
+        Runs one generation through the pipeline: by default it is evaluated, culled if there is a survival
+        stage, bred into the next one, and a day is cycled.
+
+        Returns:
+            GenerationSummary: The summary of the generation that was evaluated.
+        """
+        self.generation += 1
+        return self.pipeline.run(self).summary
+
+    def run(self, num_generations: int) -> Iterator[GenerationSummary]:
+        """
+        Advances the simulation, yielding one summary per generation.
+
+        The run ends early, after yielding the generation that triggered it, when the convergence monitor
+        sets ``stop_reason``.
+
+        Args:
+            num_generations (int): The most generations to run the simulation for.
+
+        Yields:
+            GenerationSummary: The summary of each generation as soon as it is evaluated.
+        """
+        for _ in range(num_generations):
+            yield self.step()
+            if self.stop_reason is not None:
+                return
+
+
+def run(num_generations: int, population_size: int, dna_length: int, seed: Optional[int] = None,
+        environment: Optional[Environment] = None) -> Iterator[GenerationSummary]:
+    """
+    Runs a headless simulation, yielding one summary per generation.
+
+    Args:
+        num_generations (int): The number of generations to run the simulation for.
+        population_size (int): The size of the population.
+        dna_length (int): The length of the DNA sequence.
+        seed (int, optional): The seed of the random generator. Defaults to an unseeded run.
+        environment (Environment, optional): The starting environment. Defaults to 100 food and 5 predators.
+
+    Yields:
+        GenerationSummary: The summary of each generation.
+    """
+    return Simulation(population_size, dna_length, seed, environment).run(num_generations)
+
+
+def simulate(num_generations: int, population_size: int, dna_length: int, seed: Optional[int] = None,
+             environment: Optional[Environment] = None) -> Tuple[PopulationArray, Environment]:
+    """
+    Runs a simulation for a given number of generations and returns its final state.
+
+    Args:
+        num_generations (int): The number of generations to run the simulation for.
+        population_size (int): The size of the population.
+        dna_length (int): The length of the DNA sequence.
+        seed (int, optional): The seed of the random generator. Defaults to an unseeded run.
+        environment (Environment, optional): The starting environment. Defaults to 100 food and 5 predators.
+
+    Returns:
+        Tuple[PopulationArray, Environment]: The final population and environment.
+    """
+    simulation = Simulation(population_size, dna_length, seed, environment)
+    for _ in simulation.run(num_generations):
+        pass
+    return simulation.population, simulation.environment
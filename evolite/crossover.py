@@ -0,0 +1,136 @@
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+
+from .bits import low_masks, shift_left, shift_right
+
+Crossover = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.random.Generator, int],
+                     Tuple[np.ndarray, np.ndarray]]
+
+
+def uniform(mothers: np.ndarray, mother_lengths: np.ndarray, fathers: np.ndarray, father_lengths: np.ndarray,
+            rng: np.random.Generator, max_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds every child by taking each gene from either parent with equal probability.
+
+    Children keep the mother's length; past the end of the father's genome the mother's genes are kept.
+
+    Args:
+        mothers (np.ndarray): The (children, words) ``uint64`` genomes of the first parents.
+        mother_lengths (np.ndarray): The number of genes of each first parent.
+        fathers (np.ndarray): The (children, words) ``uint64`` genomes of the second parents.
+        father_lengths (np.ndarray): The number of genes of each second parent.
+        rng (np.random.Generator): The random generator to draw from.
+        max_length (int): The genome length cap.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The child genomes and their lengths.
+    """
+    from_father = rng.integers(0, np.iinfo(np.uint64).max, size=mothers.shape, dtype=np.uint64, endpoint=True)
+    from_father &= low_masks(max_length)[np.minimum(mother_lengths, father_lengths)]
+    return mothers ^ ((mothers ^ fathers) & from_father), mother_lengths
+
+
+def one_point(mothers: np.ndarray, mother_lengths: np.ndarray, fathers: np.ndarray, father_lengths: np.ndarray,
+              rng: np.random.Generator, max_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds every child from the mother's genes before a random cut and the father's genes after it.
+
+    The cut falls within the shorter parent; children keep the mother's length.
+
+    Args:
+        mothers (np.ndarray): The (children, words) ``uint64`` genomes of the first parents.
+        mother_lengths (np.ndarray): The number of genes of each first parent.
+        fathers (np.ndarray): The (children, words) ``uint64`` genomes of the second parents.
+        father_lengths (np.ndarray): The number of genes of each second parent.
+        rng (np.random.Generator): The random generator to draw from.
+        max_length (int): The genome length cap.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The child genomes and their lengths.
+    """
+    masks = low_masks(max_length)
+    shared = np.minimum(mother_lengths, father_lengths)
+    cut = rng.integers(0, shared + 1)
+    from_father = masks[shared] & ~masks[cut]
+    return mothers ^ ((mothers ^ fathers) & from_father), mother_lengths
+
+
+def two_point(mothers: np.ndarray, mother_lengths: np.ndarray, fathers: np.ndarray, father_lengths: np.ndarray,
+              rng: np.random.Generator, max_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds every child from the mother's genes with the segment between two random cuts taken from the father.
+
+    Both cuts fall within the shorter parent; children keep the mother's length.
+
+    Args:
+        mothers (np.ndarray): The (children, words) ``uint64`` genomes of the first parents.
+        mother_lengths (np.ndarray): The number of genes of each first parent.
+        fathers (np.ndarray): The (children, words) ``uint64`` genomes of the second parents.
+        father_lengths (np.ndarray): The number of genes of each second parent.
+        rng (np.random.Generator): The random generator to draw from.
+        max_length (int): The genome length cap.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The child genomes and their lengths.
+    """
+    masks = low_masks(max_length)
+    shared = np.minimum(mother_lengths, father_lengths)
+    first, second = rng.integers(0, shared + 1), rng.integers(0, shared + 1)
+    start, end = np.minimum(first, second), np.maximum(first, second)
+    from_father = masks[end] & ~masks[start]
+    return mothers ^ ((mothers ^ fathers) & from_father), mother_lengths
+
+
+def length_aware(mothers: np.ndarray, mother_lengths: np.ndarray, fathers: np.ndarray, father_lengths: np.ndarray,
+                 rng: np.random.Generator, max_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds every child by splicing a head of the mother onto a tail of the father, cut at independent points.
+
+    Unlike the other operators the child's length varies, so genes gained by duplication in either
+    parent can be inherited. Children are truncated to ``max_length`` genes.
+
+    Args:
+        mothers (np.ndarray): The (children, words) ``uint64`` genomes of the first parents.
+        mother_lengths (np.ndarray): The number of genes of each first parent.
+        fathers (np.ndarray): The (children, words) ``uint64`` genomes of the second parents.
+        father_lengths (np.ndarray): The number of genes of each second parent.
+        rng (np.random.Generator): The random generator to draw from.
+        max_length (int): The genome length cap.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The child genomes and their lengths.
+    """
+    masks = low_masks(max_length)
+    head = rng.integers(1, mother_lengths + 1)
+    tail_start = rng.integers(0, father_lengths)
+    lengths = np.minimum(head + father_lengths - tail_start, max_length)
+    tail = shift_left(shift_right(fathers, tail_start), head)
+    return ((mothers & masks[head]) | tail) & masks[lengths], lengths
+
+
+CROSSOVERS: Dict[str, Crossover] = {
+    'uniform': uniform,
+    'one_point': one_point,
+    'two_point': two_point,
+    'length_aware': length_aware,
+}
+
+
+def get_crossover(crossover: Union[str, Crossover]) -> Crossover:
+    """
+    Resolves a crossover operator by name, passing callables through unchanged.
+
+    Args:
+        crossover (Union[str, Crossover]): A name from ``CROSSOVERS`` or a callable with the same
+            signature as ``uniform``.
+
+    Returns:
+        Crossover: The crossover operator.
+    """
+    if callable(crossover):
+        return crossover
+    try:
+        return CROSSOVERS[crossover]
+    except KeyError:
+        raise ValueError(f"Unknown crossover {crossover!r}, expected one of {sorted(CROSSOVERS)}") from None
@@ -0,0 +1,336 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .core import GenerationSummary, Simulation
+from .pipeline import GenerationState
+from .selection import elite
+
+FRAME_RATE = 30
+TOP_ORGANISMS = 10
+MAX_CHART_POINTS = 600
+MAX_DNA_SHOWN = 200
+
+
+class TopOrganism(NamedTuple):
+    """
+    Describes one of the fittest organisms of a generation for the dashboard table.
+    """
+
+    index: int
+    fitness: float
+    length: int
+    dna: str
+
+
+class GenerationUpdate(NamedTuple):
+    """
+    Carries one generation from the worker thread to the dashboard.
+    """
+
+    summary: GenerationSummary
+    top: List[TopOrganism]
+
+
+class SimulationWorker:
+    """
+    Runs a simulation on a background thread and pushes one ``GenerationUpdate`` per generation to a queue.
+
+    The fittest organisms are sampled by a pipeline stage right after evaluation, while their fitness is
+    still current. The queue carries only summaries and the small top-N sample, so the consumer's cost per
+    generation does not grow with the population.
+    """
+
+    def __init__(self, simulation: Simulation, num_generations: int, top: int = TOP_ORGANISMS) -> None:
+        """
+        Initializes the worker; ``start`` launches it.
+
+        Args:
+            simulation (Simulation): The simulation to advance.
+            num_generations (int): The number of generations to run.
+            top (int, optional): The number of fittest organisms sampled per generation. Defaults to 10.
+        """
+        self.simulation = simulation
+        self.num_generations = num_generations
+        self.top = top
+        self.updates: 'queue.Queue[Optional[GenerationUpdate]]' = queue.Queue()
+        self.error: Optional[BaseException] = None
+        self._sample: List[TopOrganism] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._work, name="evolite-dashboard", daemon=True)
+        if 'sample_top' not in simulation.pipeline.names:
+            simulation.pipeline.insert('sample_top', self._sample_top, after='evaluate')
+
+    def _sample_top(self, state: GenerationState) -> None:
+        population = state.simulation.population
+        best = elite(population.fitness, min(self.top, len(population)))
+        self._sample = [TopOrganism(int(index), float(population.fitness[index]), int(population.lengths[index]),
+                                    ''.join(map(str, population.dna(index)[:MAX_DNA_SHOWN]))) for index in best]
+
+    def start(self) -> None:
+        """
+        Starts running the simulation.
+        """
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Asks the worker to stop after the current generation.
+        """
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        """
+        Returns whether the worker thread is still running.
+        """
+        return self._thread.is_alive()
+
+    def drain(self, limit: Optional[int] = None) -> Tuple[List[GenerationUpdate], bool]:
+        """
+        Takes the updates queued so far without blocking.
+
+        Args:
+            limit (int, optional): The most updates to take. Defaults to all of them.
+
+        Returns:
+            Tuple[List[GenerationUpdate], bool]: The updates, oldest first, and whether the run has finished.
+        """
+        updates, finished = [], False
+        while limit is None or len(updates) < limit:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            if update is None:
+                finished = True
+                break
+            updates.append(update)
+        return updates, finished
+
+    def _work(self) -> None:
+        try:
+            for summary in self.simulation.run(self.num_generations):
+                self.updates.put(GenerationUpdate(summary, self._sample))
+                if self._stop.is_set():
+                    break
+        except BaseException as error:
+            self.error = error
+        finally:
+            self.updates.put(None)
+
+
+class FitnessChart:
+    """
+    Draws the best and mean fitness and the population size against the generation on a canvas.
+
+    Every series is one line item whose coordinates are replaced on each frame, decimated to at most
+    ``MAX_CHART_POINTS`` points, so a frame costs the same however long the run has been going.
+    """
+
+    COLORS = {'best_fitness': '#d62728', 'mean_fitness': '#1f77b4', 'population_size': '#2ca02c'}
+
+    def __init__(self, parent: tk.Widget, width: int = 640, height: int = 280) -> None:
+        """
+        Initializes an empty chart.
+
+        Args:
+            parent (tk.Widget): The widget the canvas is placed in.
+            width (int, optional): The width of the canvas in pixels. Defaults to 640.
+            height (int, optional): The height of the canvas in pixels. Defaults to 280.
+        """
+        self.canvas = tk.Canvas(parent, width=width, height=height, background='white')
+        self.width, self.height, self.margin = width, height, 30
+        self.points: Dict[str, List[Tuple[int, float]]] = {name: [] for name in self.COLORS}
+        self.maxima = dict.fromkeys(self.COLORS, 0.0)
+        self.lines = {name: self.canvas.create_line(0, 0, 0, 0, fill=color, width=2)
+                      for name, color in self.COLORS.items()}
+        self.labels = {name: self.canvas.create_text(self.margin + 5, 12 + 14 * row, anchor='w', fill=color,
+                                                     text=name.replace('_', ' '))
+                       for row, (name, color) in enumerate(self.COLORS.items())}
+        self.scale = self.canvas.create_text(width - 5, height - 10, anchor='e', text='')
+
+    def extend(self, summaries: List[GenerationSummary]) -> None:
+        """
+        Appends the points of new generations; they are drawn on the next ``redraw``.
+
+        Args:
+            summaries (List[GenerationSummary]): The new generations, oldest first.
+        """
+        for summary in summaries:
+            for name, points in self.points.items():
+                value = float(getattr(summary, name))
+                points.append((summary.generation, value))
+                self.maxima[name] = max(self.maxima[name], value)
+
+    def clear(self) -> None:
+        """
+        Removes every point.
+        """
+        for points in self.points.values():
+            points.clear()
+        self.maxima = dict.fromkeys(self.COLORS, 0.0)
+        self.redraw()
+
+    def redraw(self) -> None:
+        """
+        Rescales every series to the canvas and updates its line.
+        """
+        series = self.points['best_fitness']
+        if len(series) < 2:
+            for line in self.lines.values():
+                self.canvas.coords(line, 0, 0, 0, 0)
+            return
+        first, last = series[0][0], series[-1][0]
+        step = max(1, len(series) // MAX_CHART_POINTS)
+        fitness_top = max(self.maxima['best_fitness'], self.maxima['mean_fitness'])
+        population_top = self.maxima['population_size']
+        plot_width, plot_height = self.width - 2 * self.margin, self.height - 2 * self.margin
+        for name, points in self.points.items():
+            top = population_top if name == 'population_size' else fitness_top
+            coordinates = []
+            for generation, value in points[::step] + points[-1:]:
+                coordinates.append(self.margin + plot_width * (generation - first) / max(1, last - first))
+                coordinates.append(self.height - self.margin - plot_height * value / (top or 1))
+            self.canvas.coords(self.lines[name], *coordinates)
+        self.canvas.itemconfigure(self.scale, text=f"generations {first}-{last}   fitness 0-{fitness_top:g}   "
+                                                   f"population 0-{population_top:g}")
+
+
+class Dashboard:
+    """
+    Shows a live simulation without blocking the Tk main loop.
+
+    The simulation runs in a ``SimulationWorker`` thread. The main loop drains its queue with ``after()``
+    at most ``frame_rate`` times per second, appends the new generations to a ``FitnessChart`` and
+    refreshes a fixed set of rows showing the fittest organisms of the latest generation.
+    """
+
+    def __init__(self, root: tk.Tk, frame_rate: int = FRAME_RATE, top: int = TOP_ORGANISMS) -> None:
+        """
+        Builds the dashboard widgets.
+
+        Args:
+            root (tk.Tk): The window to build the dashboard in.
+            frame_rate (int, optional): The most redraws per second. Defaults to 30.
+            top (int, optional): The number of fittest organisms shown. Defaults to 10.
+        """
+        self.root = root
+        self.interval = max(1, 1000 // frame_rate)
+        self.top = top
+        self.worker: Optional[SimulationWorker] = None
+        root.title("Evolite")
+
+        controls = ttk.Frame(root, padding=5)
+        controls.pack(fill='x')
+        self.settings = {}
+        for column, (name, default) in enumerate([('Generations', 1000), ('Population', 1000),
+                                                  ('DNA length', 10), ('Seed', '')]):
+            ttk.Label(controls, text=name).grid(row=0, column=2 * column, padx=2)
+            variable = tk.StringVar(value=str(default))
+            ttk.Entry(controls, textvariable=variable, width=8).grid(row=0, column=2 * column + 1, padx=2)
+            self.settings[name] = variable
+        self.start_button = ttk.Button(controls, text="Start", command=self.start)
+        self.start_button.grid(row=0, column=8, padx=2)
+        self.stop_button = ttk.Button(controls, text="Stop", command=self.stop, state='disabled')
+        self.stop_button.grid(row=0, column=9, padx=2)
+
+        self.status = tk.StringVar(value="Ready")
+        ttk.Label(root, textvariable=self.status, padding=5).pack(fill='x')
+        self.chart = FitnessChart(root)
+        self.chart.canvas.pack(fill='both', expand=True)
+
+        columns = ('rank', 'fitness', 'length', 'dna')
+        self.table = ttk.Treeview(root, columns=columns, show='headings', height=top)
+        for column, width in zip(columns, (50, 80, 60, 450)):
+            self.table.heading(column, text=column.capitalize())
+            self.table.column(column, width=width, anchor='w')
+        self.table.pack(fill='x')
+        self.rows = [self.table.insert('', 'end', values=(rank + 1, '', '', '')) for rank in range(top)]
+        root.protocol("WM_DELETE_WINDOW", self.close)
+
+    def start(self) -> None:
+        """
+        Starts a new run with the settings entered in the controls.
+        """
+        try:
+            generations, population, dna_length = (int(self.settings[name].get())
+                                                   for name in ('Generations', 'Population', 'DNA length'))
+            seed = int(self.settings['Seed'].get()) if self.settings['Seed'].get().strip() else None
+        except ValueError:
+            self.status.set("Generations, population, DNA length and seed must be integers")
+            return
+        self.chart.clear()
+        self.worker = SimulationWorker(Simulation(population, dna_length, seed), generations, self.top)
+        self.worker.start()
+        self.start_button.configure(state='disabled')
+        self.stop_button.configure(state='normal')
+        self.status.set("Running")
+        self.root.after(self.interval, self.poll)
+
+    def stop(self) -> None:
+        """
+        Stops the current run after its current generation.
+        """
+        if self.worker is not None:
+            self.worker.stop()
+
+    def poll(self) -> None:
+        """
+        Renders the generations queued since the last frame and schedules the next frame.
+        """
+        if self.worker is None:
+            return
+        updates, finished = self.worker.drain()
+        if updates:
+            self.chart.extend([update.summary for update in updates])
+            self.chart.redraw()
+            self.show(updates[-1])
+        if finished:
+            error = self.worker.error
+            self.status.set(f"Failed: {error!r}" if error else f"Finished at {self.status.get()}")
+            self.start_button.configure(state='normal')
+            self.stop_button.configure(state='disabled')
+            self.worker = None
+            return
+        self.root.after(self.interval, self.poll)
+
+    def show(self, update: GenerationUpdate) -> None:
+        """
+        Shows the latest generation in the status line and the table.
+
+        Args:
+            update (GenerationUpdate): The latest generation.
+        """
+        summary = update.summary
+        self.status.set(f"generation {summary.generation}: best {summary.best_fitness:g}, "
+                        f"mean {summary.mean_fitness:.3f}, population {summary.population_size}, "
+                        f"temperature {summary.temperature}")
+        for rank, row in enumerate(self.rows):
+            if rank < len(update.top):
+                organism = update.top[rank]
+                self.table.item(row, values=(rank + 1, f"{organism.fitness:g}", organism.length, organism.dna))
+            else:
+                self.table.item(row, values=(rank + 1, '', '', ''))
+
+    def close(self) -> None:
+        """
+        Stops any run and closes the window.
+        """
+        self.stop()
+        self.root.destroy()
+
+
+def main(frame_rate: int = FRAME_RATE, top: int = TOP_ORGANISMS) -> None:
+    """
+    Opens the dashboard window and runs the Tk main loop.
+
+    Args:
+        frame_rate (int, optional): The most redraws per second. Defaults to 30.
+        top (int, optional): The number of fittest organisms shown. Defaults to 10.
+    """
+    root = tk.Tk()
+    Dashboard(root, frame_rate, top)
+    root.mainloop()
@@ -0,0 +1,328 @@
+from statistics import NormalDist
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .bits import popcount
+from .crossover import Crossover
+from .population import PopulationArray, concatenate
+from .rng import ENVIRONMENT_STREAM, POPULATION_STREAM, RandomStreams, SeedLike, as_streams
+from .selection import Selection, elite, get_selection
+
+# A batched selection draws ``count`` parents in every replicate from a (replicates, organisms) fitness matrix
+BatchedSelection = Callable[[np.ndarray, int, np.random.Generator], np.ndarray]
+
+
+class EnvironmentArray:
+    """
+    Holds one environment per replicate as temperature, food and predator vectors.
+    """
+
+    def __init__(self, replicates: int, temperature: int = 25, food: int = 100, predators: int = 5) -> None:
+        """
+        Initializes every replicate with the same starting environment.
+
+        Args:
+            replicates (int): The number of replicates.
+            temperature (int, optional): The starting temperature. Defaults to 25.
+            food (int, optional): The starting amount of food. Defaults to 100.
+            predators (int, optional): The starting number of predators. Defaults to 5.
+        """
+        self.temperature = np.full(replicates, temperature, dtype=np.int64)
+        self.food = np.full(replicates, food, dtype=np.int64)
+        self.predators = np.full(replicates, predators, dtype=np.int64)
+
+    def cycle_day(self, rng: np.random.Generator) -> None:
+        """
+        Cycles a day in every replicate with the steps of ``Environment.cycle_day``.
+
+        Args:
+            rng (np.random.Generator): The random generator to draw from.
+        """
+        replicates = len(self.temperature)
+        self.temperature += 2 * rng.integers(0, 2, size=replicates) - 1
+        self.food = np.maximum(0, self.food + rng.integers(-10, 11, size=replicates))
+        self.predators = np.maximum(0, self.predators + 2 * rng.integers(0, 2, size=replicates) - 1)
+
+
+def ensemble_fitness(population: PopulationArray, environments: EnvironmentArray, replicates: int) -> np.ndarray:
+    """
+    Calculates the fitness of every organism as ``PopulationArray.calculate_fitness`` does, with the bonus
+    above 30 degrees taken from each organism's own replicate.
+
+    Args:
+        population (PopulationArray): The organisms of every replicate, replicate by replicate.
+        environments (EnvironmentArray): The environment of every replicate.
+        replicates (int): The number of replicates.
+
+    Returns:
+        np.ndarray: The fitness vector.
+    """
+    bonus = np.repeat(environments.temperature > 30, len(population) // replicates)
+    return popcount(population.genomes) + bonus.astype(np.float64)
+
+
+def batched_fittest(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects the fittest organism of every replicate for every draw.
+    """
+    return np.repeat(np.argmax(fitness, axis=1)[:, None], count, axis=1)
+
+
+def batched_uniform(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects parents uniformly at random within every replicate.
+    """
+    return rng.integers(0, fitness.shape[1], size=(fitness.shape[0], count))
+
+
+def batched_tournament(fitness: np.ndarray, count: int, rng: np.random.Generator, size: int = 2) -> np.ndarray:
+    """
+    Selects the fittest of ``size`` contestants drawn within the replicate for every draw.
+    """
+    contestants = rng.integers(0, fitness.shape[1], size=(fitness.shape[0], count, size))
+    scores = np.take_along_axis(fitness[:, None, :], contestants.reshape(fitness.shape[0], 1, -1), axis=2)
+    winners = np.argmax(scores.reshape(contestants.shape), axis=2)
+    return np.take_along_axis(contestants, winners[..., None], axis=2)[..., 0]
+
+
+BATCHED_SELECTIONS: Dict[str, BatchedSelection] = {
+    'fittest': batched_fittest,
+    'uniform': batched_uniform,
+    'tournament': batched_tournament,
+}
+
+
+def get_batched_selection(selection: Union[str, Selection]) -> BatchedSelection:
+    """
+    Resolves a selection operator for a fitness matrix, applying any other operator replicate by replicate.
+
+    Args:
+        selection (Union[str, Selection]): A name from ``SELECTIONS`` or a selection callable.
+
+    Returns:
+        BatchedSelection: The operator, returning (replicates, count) positions within each replicate.
+    """
+    if isinstance(selection, str) and selection in BATCHED_SELECTIONS:
+        return BATCHED_SELECTIONS[selection]
+    single = get_selection(selection)
+    return lambda fitness, count, rng: np.stack([single(row, count, rng) for row in fitness])
+
+
+def select_living(selection: BatchedSelection, fitness: np.ndarray, living: np.ndarray, count: int,
+                  rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws parents among the living organisms of every replicate, as the 'filter' stage leaves them.
+
+    Replicates where every organism lives are drawn in one batch; the others are drawn one by one from their
+    living members. A replicate whose organisms have all died breeds from them anyway, since it cannot shrink.
+
+    Args:
+        selection (BatchedSelection): The batched selection operator.
+        fitness (np.ndarray): The (replicates, organisms) fitness matrix.
+        living (np.ndarray): The (replicates, organisms) mask of organisms whose lifespan has not run out.
+        count (int): The number of parents to draw in every replicate.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The (replicates, count) positions within each replicate.
+    """
+    full = living.all(axis=1) | ~living.any(axis=1)
+    if full.all():
+        return selection(fitness, count, rng)
+    picks = np.empty((len(fitness), count), dtype=np.int64)
+    if full.any():
+        picks[full] = selection(fitness[full], count, rng)
+    for row in np.flatnonzero(~full):
+        members = np.flatnonzero(living[row])
+        picks[row] = members[selection(fitness[row:row + 1, members], count, rng)[0]]
+    return picks
+
+
+def living_elites(fitness: np.ndarray, living: np.ndarray, count: int) -> np.ndarray:
+    """
+    Picks the fittest living organisms of every replicate, chosen and ordered as ``elite`` picks them from
+    the population the 'filter' stage leaves, so ties are broken as in ``Simulation``.
+
+    Args:
+        fitness (np.ndarray): The (replicates, organisms) fitness matrix.
+        living (np.ndarray): The (replicates, organisms) mask of organisms whose lifespan has not run out.
+        count (int): The most elites per replicate.
+
+    Returns:
+        np.ndarray: The positions of the elites in the stacked population, replicate after replicate; a
+        replicate with fewer living organisms than ``count`` keeps them all.
+    """
+    replicates, size = fitness.shape
+    offsets = (np.arange(replicates) * size)[:, None]
+    if living.all():
+        best = np.argpartition(fitness, size - count, axis=1)[:, size - count:]
+        order = np.argsort(np.take_along_axis(fitness, best, axis=1), axis=1, kind='stable')[:, ::-1]
+        return (np.take_along_axis(best, order, axis=1) + offsets).reshape(-1)
+    rows = []
+    for row in range(replicates):
+        members = np.flatnonzero(living[row])
+        rows.append(members[elite(fitness[row, members], count)] + offsets[row])
+    return np.concatenate(rows)
+
+
+class EnsembleResult(NamedTuple):
+    """
+    Holds the per-generation curves of every replicate of an ensemble, one column per replicate.
+    """
+
+    generation: np.ndarray
+    best_fitness: np.ndarray
+    mean_fitness: np.ndarray
+    temperature: np.ndarray
+    food: np.ndarray
+    predators: np.ndarray
+
+    def aggregate(self, name: str = 'best_fitness', confidence: float = 0.95) -> Dict[str, np.ndarray]:
+        """
+        Averages one curve over the replicates, with a normal-approximation confidence interval.
+
+        Args:
+            name (str, optional): The curve, one of the fields. Defaults to 'best_fitness'.
+            confidence (float, optional): The coverage of the interval. Defaults to 0.95.
+
+        Returns:
+            Dict[str, np.ndarray]: The 'mean', 'std', 'lower' and 'upper' curves, one value per generation.
+        """
+        values = getattr(self, name).astype(np.float64)
+        replicates = values.shape[1]
+        mean = values.mean(axis=1)
+        std = values.std(axis=1, ddof=1) if replicates > 1 else np.zeros(len(values))
+        half = NormalDist().inv_cdf(0.5 + confidence / 2) * std / np.sqrt(replicates)
+        return {'mean': mean, 'std': std, 'lower': mean - half, 'upper': mean + half}
+
+    def save(self, path: str) -> None:
+        """
+        Writes every curve to a ``.npz`` file.
+
+        Args:
+            path (str): The output file.
+        """
+        np.savez(path, **self._asdict())
+
+
+class Ensemble:
+    """
+    Evolves many independent replicates of the same configuration in one array pass per generation.
+
+    The replicates are stacked along the organism axis of one ``PopulationArray``, replicate after
+    replicate, with one environment per replicate in an ``EnvironmentArray``. Selection runs on the
+    (replicates, organisms) fitness matrix, so parents are only ever drawn from their own replicate;
+    crossover and mutation then treat all replicates as one batch. Every generation follows the steps of
+    ``Simulation.step``, including its 'filter' stage: organisms whose lifespan ran out neither breed nor
+    are carried over, and children take the place of dead elites so every replicate keeps its size. The
+    replicates share one random stream, so they are independent and reproducible from the seed but do not
+    match single runs with per-replicate seeds.
+    """
+
+    def __init__(self, replicates: int, population_size: int, dna_length: int,
+                 seed: Union[SeedLike, RandomStreams] = None, mothers: Union[str, Selection] = 'fittest',
+                 fathers: Union[str, Selection] = 'uniform', elites: int = 0,
+                 crossover: Union[str, Crossover] = 'uniform', environments: Optional[EnvironmentArray] = None) -> None:
+        """
+        Initializes an Ensemble with a random population in every replicate.
+
+        Args:
+            replicates (int): The number of replicates.
+            population_size (int): The size of the population of every replicate.
+            dna_length (int): The length of the DNA sequence.
+            seed (Union[SeedLike, RandomStreams], optional): The root seed. Defaults to an unseeded run.
+            mothers (Union[str, Selection], optional): The selection operator for the first parents.
+                Defaults to 'fittest'.
+            fathers (Union[str, Selection], optional): The selection operator for the second parents.
+                Defaults to 'uniform'.
+            elites (int, optional): The fittest organisms of every replicate carried over. Defaults to 0.
+            crossover (Union[str, Crossover], optional): The crossover operator. Defaults to 'uniform'.
+            environments (EnvironmentArray, optional): The starting environments. Defaults to 100 food and
+                5 predators at 25 degrees in every replicate.
+        """
+        self.replicates = replicates
+        self.population_size = population_size
+        self.streams = as_streams(seed)
+        self.rng = self.streams.stream(POPULATION_STREAM)
+        self.environment_rng = self.streams.stream(ENVIRONMENT_STREAM)
+        self.environments = environments or EnvironmentArray(replicates)
+        self.population = PopulationArray.random(replicates * population_size, dna_length, self.rng)
+        self.mothers = get_batched_selection(mothers)
+        self.fathers = get_batched_selection(fathers)
+        self.elites = min(elites, population_size)
+        self.crossover = crossover
+        self.generation = 0
+
+    def fitness_matrix(self) -> np.ndarray:
+        """
+        Returns the fitness of every organism as a (replicates, organisms) view.
+        """
+        return self.population.fitness.reshape(self.replicates, self.population_size)
+
+    def step(self) -> Dict[str, np.ndarray]:
+        """
+        Advances every replicate by one generation.
+
+        Returns:
+            Dict[str, np.ndarray]: The best and mean fitness and the environment of every replicate, as
+            evaluated at the start of the generation.
+        """
+        self.generation += 1
+        population, replicates, size = self.population, self.replicates, self.population_size
+        population.fitness = ensemble_fitness(population, self.environments, replicates)
+        fitness = self.fitness_matrix()
+        record = {'best_fitness': fitness.max(axis=1), 'mean_fitness': fitness.mean(axis=1),
+                  'temperature': self.environments.temperature.copy(), 'food': self.environments.food.copy(),
+                  'predators': self.environments.predators.copy()}
+        population.decrease_lifespan()
+
+        # Organisms whose lifespan ran out neither breed nor are carried over, as in the 'filter' stage
+        living = (population.lifespans > 0).reshape(replicates, size)
+        kept = np.minimum(self.elites, living.sum(axis=1))
+        count = size - int(kept.min())
+        offsets = (np.arange(replicates) * size)[:, None]
+        mothers = (select_living(self.mothers, fitness, living, count, self.rng) + offsets).reshape(-1)
+        fathers = (select_living(self.fathers, fitness, living, count, self.rng) + offsets).reshape(-1)
+        offspring = population.reproduce(mothers, fathers, self.rng, self.crossover)
+        offspring.mutate(self.rng)
+        if kept.any():
+            elites = living_elites(fitness, living, self.elites)
+            joined = concatenate([population.take(elites), offspring])
+            # Put every replicate's elite back in front of its own children, which fill the slots of dead elites
+            slots = np.arange(size)
+            elite_rows = (np.cumsum(kept) - kept)[:, None] + slots
+            child_rows = len(elites) + (np.arange(replicates) * count)[:, None] + slots - kept[:, None]
+            offspring = joined.take(np.where(slots < kept[:, None], elite_rows, child_rows).reshape(-1))
+        self.population = offspring
+        self.environments.cycle_day(self.environment_rng)
+        return record
+
+    def run(self, num_generations: int) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Advances every replicate, yielding one record per generation.
+
+        Args:
+            num_generations (int): The number of generations to run.
+
+        Yields:
+            Dict[str, np.ndarray]: The record of ``step``, one value per replicate.
+        """
+        for _ in range(num_generations):
+            yield self.step()
+
+    def evolve(self, num_generations: int) -> EnsembleResult:
+        """
+        Runs every replicate and collects its curves.
+
+        Args:
+            num_generations (int): The number of generations to run.
+
+        Returns:
+            EnsembleResult: The (generations, replicates) curves.
+        """
+        first = self.generation + 1
+        records = list(self.run(num_generations))
+        columns = {name: np.array([record[name] for record in records]).reshape(len(records), self.replicates)
+                   for name in EnsembleResult._fields[1:]}
+        return EnsembleResult(np.arange(first, first + len(records)), **columns)
@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .population import PopulationArray
+
+
+class Environment:
+    """
+    Represents an environment with resources, predators, and temperature.
+    """
+
+    def __init__(self, resources: Dict[str, int], predators: Dict[str, int], temperature: int = 25) -> None:
+        """
+        Initializes an Environment instance with resources and predators.
+
+        Args:
+            resources (Dict[str, int]): The resources available in the environment.
+            predators (Dict[str, int]): The predators present in the environment.
+            temperature (int, optional): The temperature of the environment. Defaults to 25.
+        """
+        self.resources = resources
+        self.predators = predators
+        self.temperature = temperature
+
+    def cycle_day(self, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Cycles a day in the environment, updating the temperature, resources and predators.
+
+        Args:
+            rng (np.random.Generator, optional): The random generator to draw from.
+                Defaults to a fresh unseeded generator.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        temperature_step, food_step, predator_step = rng.integers(0, 2), rng.integers(-10, 11), rng.integers(0, 2)
+        self.temperature += 2 * int(temperature_step) - 1
+        self.resources['food'] = max(0, self.resources['food'] + int(food_step))
+        self.predators['number'] = max(0, self.predators['number'] + 2 * int(predator_step) - 1)
+
+    def settle(self, population: 'PopulationArray', rng: np.random.Generator) -> None:
+        """
+        Places a new generation of organisms in the environment.
+
+        The global environment has no positions, so this does nothing; spatial environments move the
+        organisms and record where they live.
+
+        Args:
+            population (PopulationArray): The organisms of the new generation.
+            rng (np.random.Generator): The random generator to draw from.
+        """
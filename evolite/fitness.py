@@ -0,0 +1,199 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from .environment import Environment
+from .genome import Genome
+from .population import PopulationArray
+
+FitnessFunction = Callable[[PopulationArray, Environment], np.ndarray]
+GenomeFitness = Callable[[Genome, Environment], float]
+
+FITNESS_FUNCTIONS: Dict[str, FitnessFunction] = {}
+
+BACKENDS = ('auto', 'serial', 'vectorized', 'process')
+
+
+def register_fitness(name: str, vectorized: bool = True) -> Callable:
+    """
+    Registers a fitness function under a name so runs, sweeps and the CLI can refer to it.
+
+    Args:
+        name (str): The name of the function.
+        vectorized (bool, optional): Whether the function takes a whole ``(population, environment)`` batch
+            and returns a fitness vector. Otherwise it takes one ``(genome, environment)`` pair and returns a
+            float, and is wrapped to loop over the batch. Defaults to True.
+
+    Returns:
+        Callable: The decorator, which returns the function unchanged.
+    """
+    def decorator(function: Callable) -> Callable:
+        FITNESS_FUNCTIONS[name] = function if vectorized else PerGenome(function)
+        return function
+    return decorator
+
+
+class PerGenome:
+    """
+    Adapts a one-genome fitness function to the batch signature by calling it for every organism.
+    """
+
+    def __init__(self, function: GenomeFitness) -> None:
+        """
+        Wraps a one-genome fitness function.
+
+        Args:
+            function (GenomeFitness): Takes a Genome and the environment and returns a float.
+        """
+        self.function = function
+
+    def __call__(self, population: PopulationArray, environment: Environment) -> np.ndarray:
+        return np.array([self.function(population.genome(index), environment) for index in range(len(population))],
+                        dtype=np.float64)
+
+
+def get_fitness(fitness: Union[str, FitnessFunction]) -> FitnessFunction:
+    """
+    Resolves a fitness function by name, passing callables through unchanged.
+
+    Args:
+        fitness (Union[str, FitnessFunction]): A name from ``FITNESS_FUNCTIONS`` or a batch fitness function.
+
+    Returns:
+        FitnessFunction: The fitness function.
+    """
+    if callable(fitness):
+        return fitness
+    try:
+        return FITNESS_FUNCTIONS[fitness]
+    except KeyError:
+        raise ValueError(f"Unknown fitness {fitness!r}, expected one of {sorted(FITNESS_FUNCTIONS)}") from None
+
+
+@register_fitness('count_ones')
+def count_ones(population: PopulationArray, environment: Optional[Environment]) -> np.ndarray:
+    """
+    Scores each organism by its number of ones, plus one above 30 degrees, as the Beta scripts do.
+
+    Args:
+        population (PopulationArray): The organisms to score.
+        environment (Environment): The environment in which the organisms are living.
+
+    Returns:
+        np.ndarray: The fitness vector.
+    """
+    return population.calculate_fitness(environment)
+
+
+@register_fitness('traits')
+def trait_fitness(population: PopulationArray, environment: Environment) -> np.ndarray:
+    """
+    Scores each organism on its heat tolerance and camouflage against temperature and predators, as IUI.py does.
+
+    Args:
+        population (PopulationArray): The organisms to score.
+        environment (Environment): The environment in which the organisms are living.
+
+    Returns:
+        np.ndarray: The fitness vector.
+    """
+    traits = population.calculate_traits()
+    fitness = traits['heat_tolerance'] + traits['camouflage']
+    fitness += traits['heat_tolerance'] * (environment.temperature - 25)
+    fitness += traits['camouflage'] * (1 - environment.predators['number'] / 10)
+    return fitness
+
+
+def _evaluate_chunk(function: FitnessFunction, population: PopulationArray, environment: Environment) -> np.ndarray:
+    return np.asarray(function(population, environment), dtype=np.float64)
+
+
+class FitnessEvaluator:
+    """
+    Dispatches a fitness function over a population serially, as one vectorized call, or in chunks across a
+    process pool, so expensive models can use every core while selection and mutation stay in this process.
+    """
+
+    def __init__(self, fitness: Union[str, FitnessFunction], backend: str = 'auto', workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None, parallel_threshold: float = 0.05) -> None:
+        """
+        Initializes the evaluator; the process pool is started on first use.
+
+        Args:
+            fitness (Union[str, FitnessFunction]): The registered name or the batch fitness function. It must be
+                picklable (defined at module level) for the process backend.
+            backend (str, optional): 'serial' evaluates chunk by chunk in this process, 'vectorized' in one call,
+                'process' across the pool, and 'auto' times the first call and switches to the pool when a
+                generation would take longer than ``parallel_threshold``. Defaults to 'auto'.
+            workers (int, optional): The number of worker processes. Defaults to every core.
+            chunk_size (int, optional): The number of organisms per chunk. Defaults to about four chunks per worker.
+            parallel_threshold (float, optional): The estimated seconds per call above which 'auto' uses the pool.
+                Defaults to 0.05.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        self.fitness = get_fitness(fitness)
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self.seconds_per_organism: Optional[float] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __call__(self, population: PopulationArray, environment: Environment) -> np.ndarray:
+        """
+        Returns the fitness of every organism.
+
+        Args:
+            population (PopulationArray): The population to evaluate.
+            environment (Environment): The environment the organisms live in.
+
+        Returns:
+            np.ndarray: The fitness vector.
+        """
+        backend = self.backend
+        if backend == 'auto':
+            backend = self._choose(len(population))
+        if backend == 'process' and len(population) > 1:
+            return self._parallel(population, environment)
+        if backend == 'serial':
+            return np.concatenate([_evaluate_chunk(self.fitness, population.take(chunk), environment)
+                                   for chunk in self._chunks(len(population))] or [np.empty(0)])
+        started = time.perf_counter()
+        fitness = _evaluate_chunk(self.fitness, population, environment)
+        if len(population):
+            self.seconds_per_organism = (time.perf_counter() - started) / len(population)
+        return fitness
+
+    def _choose(self, size: int) -> str:
+        if self.seconds_per_organism is None or self.workers < 2:
+            return 'vectorized'
+        return 'process' if self.seconds_per_organism * size > self.parallel_threshold else 'vectorized'
+
+    def _chunks(self, size: int):
+        chunk_size = self.chunk_size or max(1, -(-size // (self.workers * 4)))
+        return [slice(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    def _parallel(self, population: PopulationArray, environment: Environment) -> np.ndarray:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self._executor.submit(_evaluate_chunk, self.fitness, population.take(chunk), environment)
+                   for chunk in self._chunks(len(population))]
+        return np.concatenate([future.result() for future in futures])
+
+    def close(self) -> None:
+        """
+        Shuts the process pool down, if it was started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'FitnessEvaluator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,156 @@
+from typing import Iterator, List
+
+
+class Genome:
+    """
+    Represents a variable-length DNA sequence packed into the bits of a single integer.
+
+    Gene ``i`` is bit ``i`` of ``bits``, so ``to_bytes`` with little-endian byte order gives
+    the same layout as a row of a ``PopulationArray``.
+    """
+
+    __slots__ = ('bits', 'length')
+
+    def __init__(self, bits: int = 0, length: int = 0) -> None:
+        """
+        Initializes a Genome from its packed bits and number of genes.
+
+        Args:
+            bits (int): The genes packed into an integer, gene ``i`` at bit ``i``.
+            length (int): The number of genes.
+        """
+        self.bits = bits & ((1 << length) - 1)
+        self.length = length
+
+    @classmethod
+    def from_list(cls, dna: List[int]) -> 'Genome':
+        """
+        Packs a list of 0/1 genes into a Genome.
+
+        Args:
+            dna (List[int]): The DNA sequence.
+
+        Returns:
+            Genome: The packed genome.
+        """
+        bits = 0
+        for index, gene in enumerate(dna):
+            if gene:
+                bits |= 1 << index
+        return cls(bits, len(dna))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, length: int) -> 'Genome':
+        """
+        Unpacks a Genome from a little-endian packed byte string.
+
+        Args:
+            data (bytes): The packed genes, as stored in a ``PopulationArray`` row.
+            length (int): The number of genes.
+
+        Returns:
+            Genome: The genome.
+        """
+        return cls(int.from_bytes(data, 'little'), length)
+
+    def to_bytes(self, width: int) -> bytes:
+        """
+        Packs the Genome into a little-endian byte string of the given width.
+
+        Args:
+            width (int): The number of bytes to produce.
+
+        Returns:
+            bytes: The packed genes.
+        """
+        return self.bits.to_bytes(width, 'little')
+
+    def to_list(self) -> List[int]:
+        """
+        Returns the genes as a list of 0/1 values.
+        """
+        return [(self.bits >> index) & 1 for index in range(self.length)]
+
+    def ones(self) -> int:
+        """
+        Returns the number of genes set to 1.
+        """
+        return self.bits.bit_count()
+
+    def flip(self, index: int) -> 'Genome':
+        """
+        Returns a copy with the gene at ``index`` flipped.
+
+        Args:
+            index (int): The position of the gene to flip.
+
+        Returns:
+            Genome: The mutated genome.
+        """
+        return Genome(self.bits ^ (1 << index), self.length)
+
+    def duplicate(self, index: int) -> 'Genome':
+        """
+        Returns a copy with the gene at ``index`` inserted again right after itself.
+
+        Args:
+            index (int): The position of the gene to duplicate.
+
+        Returns:
+            Genome: The mutated genome, one gene longer.
+        """
+        low = self.bits & ((1 << (index + 1)) - 1)
+        high = (self.bits >> index) << (index + 1)
+        return Genome(low | high, self.length + 1)
+
+    def delete(self, index: int) -> 'Genome':
+        """
+        Returns a copy with the gene at ``index`` removed.
+
+        Args:
+            index (int): The position of the gene to remove.
+
+        Returns:
+            Genome: The mutated genome, one gene shorter.
+        """
+        low = self.bits & ((1 << index) - 1)
+        high = (self.bits >> (index + 1)) << index
+        return Genome(low | high, self.length - 1)
+
+    def crossover(self, other: 'Genome', mask: int) -> 'Genome':
+        """
+        Returns a child taking genes from ``other`` where ``mask`` is set and from this genome elsewhere.
+
+        The child has this genome's length; genes past the end of ``other`` are kept from this genome.
+
+        Args:
+            other (Genome): The second parent.
+            mask (int): The gene positions to take from ``other``.
+
+        Returns:
+            Genome: The child genome.
+        """
+        mask &= (1 << min(self.length, other.length)) - 1
+        return Genome(self.bits ^ ((self.bits ^ other.bits) & mask), self.length)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("genome index out of range")
+        return (self.bits >> index) & 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Genome) and self.bits == other.bits and self.length == other.length
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.length))
+
+    def __repr__(self) -> str:
+        return f"Genome({self.to_list()})"
@@ -0,0 +1,226 @@
+import json
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .core import GenerationSummary
+from .population import PopulationArray
+from .selection import elite
+
+SUMMARY_DTYPES: Dict[str, str] = {
+    'generation': '<i8',
+    'best_fitness': '<f8',
+    'mean_fitness': '<f8',
+    'population_size': '<i8',
+    'temperature': '<i8',
+    'food': '<i8',
+    'predators': '<i8',
+}
+
+GENOME_COLUMNS: Dict[str, str] = {
+    'genome_generation': '<i8',
+    'genome_index': '<i8',
+    'genome_length': '<i8',
+    'genome_fitness': '<f8',
+}
+
+
+class HistoryStore:
+    """
+    Streams per-generation statistics, and optionally the fittest genomes, to append-only column files.
+
+    Every column lives in its own raw little-endian file inside ``directory``, so a query maps only the
+    columns it needs and slices them by generation range without loading the rest. The most recent
+    summaries are also kept in a bounded in-memory ring buffer.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ring_size: int = 1000, chunk_size: int = 256,
+                 sample_genomes: int = 1) -> None:
+        """
+        Initializes the store, resuming an existing directory if there is one.
+
+        Args:
+            directory (str, optional): The directory of the column files. Defaults to keeping only the
+                in-memory ring buffer.
+            ring_size (int, optional): The number of recent summaries kept in memory. Defaults to 1000.
+            chunk_size (int, optional): The number of generations buffered between writes. Defaults to 256.
+            sample_genomes (int, optional): The number of fittest genomes stored per generation. Defaults to 1.
+        """
+        self.directory = directory
+        self.recent: Deque[GenerationSummary] = deque(maxlen=ring_size)
+        self.chunk_size = chunk_size
+        self.sample_genomes = sample_genomes
+        self.width: Optional[int] = None
+        self.last_generation = 0
+        self._pending: Dict[str, List] = {name: [] for name in list(SUMMARY_DTYPES) + list(GENOME_COLUMNS)}
+        self._pending_genomes: List[np.ndarray] = []
+        self._buffered = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            schema_path = os.path.join(directory, 'schema.json')
+            if os.path.exists(schema_path):
+                with open(schema_path) as schema:
+                    self.width = json.load(schema)['width']
+                generations = self._map('generation')
+                if len(generations):
+                    self.last_generation = int(generations[-1])
+
+    def record(self, summary: GenerationSummary, population: Optional[PopulationArray] = None) -> None:
+        """
+        Records one evaluated generation.
+
+        Args:
+            summary (GenerationSummary): The statistics of the generation.
+            population (PopulationArray, optional): The evaluated population to sample genomes from.
+
+        Raises:
+            ValueError: If the generation is not after the last recorded one.
+        """
+        if summary.generation <= self.last_generation:
+            raise ValueError(f"Generation {summary.generation} recorded after generation {self.last_generation}")
+        self.last_generation = summary.generation
+        self.recent.append(summary)
+        if not self.directory:
+            return
+        for name in SUMMARY_DTYPES:
+            self._pending[name].append(getattr(summary, name))
+        if population is not None and self.sample_genomes and len(population):
+            self._sample(summary.generation, population)
+        self._buffered += 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def _sample(self, generation: int, population: PopulationArray) -> None:
+        width = population.genomes.shape[1]
+        if self.width is None or width > self.width:
+            self._widen(width)
+        best = elite(population.fitness, self.sample_genomes)
+        self._pending['genome_generation'].extend([generation] * len(best))
+        self._pending['genome_index'].extend(best.tolist())
+        self._pending['genome_length'].extend(population.lengths[best].tolist())
+        self._pending['genome_fitness'].extend(population.fitness[best].tolist())
+        self._pending_genomes.append(np.pad(population.genomes[best], ((0, 0), (0, self.width - width))))
+
+    def _widen(self, width: int) -> None:
+        # Genes are packed low bit first, so padding the stored rows with zero bytes keeps every gene in place
+        if self.width is not None:
+            padding = ((0, 0), (0, width - self.width))
+            self._pending_genomes = [np.pad(rows, padding) for rows in self._pending_genomes]
+            path = self._path('genomes')
+            if os.path.exists(path):
+                stored = np.fromfile(path, dtype=np.uint8).reshape(-1, self.width)
+                np.pad(stored, padding).tofile(path + '.tmp')
+                os.replace(path + '.tmp', path)
+        self.width = width
+        with open(os.path.join(self.directory, 'schema.json'), 'w') as schema:
+            json.dump({'width': self.width, 'columns': dict(SUMMARY_DTYPES, **GENOME_COLUMNS)}, schema)
+
+    def flush(self) -> None:
+        """
+        Appends every buffered generation to the column files.
+        """
+        if not self.directory or not self._buffered:
+            return
+        columns = dict(SUMMARY_DTYPES, **GENOME_COLUMNS)
+        for name, values in self._pending.items():
+            if values:
+                with open(self._path(name), 'ab') as column:
+                    column.write(np.asarray(values, dtype=columns[name]).tobytes())
+                values.clear()
+        if self._pending_genomes:
+            with open(self._path('genomes'), 'ab') as column:
+                for rows in self._pending_genomes:
+                    column.write(np.ascontiguousarray(rows).tobytes())
+            self._pending_genomes.clear()
+        self._buffered = 0
+
+    def close(self) -> None:
+        """
+        Flushes the buffered generations.
+        """
+        self.flush()
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def column(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Returns one statistic for the generations in ``[start, stop)``.
+
+        Args:
+            name (str): A ``GenerationSummary`` field, e.g. 'best_fitness'.
+            start (int, optional): The first generation. Defaults to the first recorded one.
+            stop (int, optional): The generation after the last one. Defaults to past the last recorded one.
+
+        Returns:
+            np.ndarray: The values, in generation order.
+        """
+        if name not in SUMMARY_DTYPES:
+            raise ValueError(f"Unknown column {name!r}, expected one of {sorted(SUMMARY_DTYPES)}")
+        if not self.directory:
+            generations = np.array([summary.generation for summary in self.recent], dtype=np.int64)
+            values = np.array([getattr(summary, name) for summary in self.recent], dtype=SUMMARY_DTYPES[name])
+            return values[self._range(generations, start, stop)]
+        self.flush()
+        return np.array(self._map(name)[self._range(self._map('generation'), start, stop)])
+
+    def fitness_curve(self, start: Optional[int] = None, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Returns the generation numbers with the best and mean fitness for a generation range.
+
+        Args:
+            start (int, optional): The first generation. Defaults to the first recorded one.
+            stop (int, optional): The generation after the last one. Defaults to past the last recorded one.
+
+        Returns:
+            Dict[str, np.ndarray]: The 'generation', 'best_fitness' and 'mean_fitness' columns.
+        """
+        return {name: self.column(name, start, stop) for name in ('generation', 'best_fitness', 'mean_fitness')}
+
+    def genomes(self, start: Optional[int] = None,
+                stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the sampled genomes of a generation range, fittest first within each generation.
+
+        With the default of one sample per generation this is the lineage of champions.
+
+        Args:
+            start (int, optional): The first generation. Defaults to the first recorded one.
+            stop (int, optional): The generation after the last one. Defaults to past the last recorded one.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The generation of every sample, its
+            packed genome rows, its lengths and its fitness.
+        """
+        if not self.directory or self.width is None:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, np.empty((0, self.width or 0), dtype=np.uint8), empty, np.empty(0)
+        self.flush()
+        generations = self._map('genome_generation')
+        rows = self._range(generations, start, stop)
+        packed = self._map('genomes', np.uint8)
+        packed = packed.reshape(-1, self.width) if len(packed) else packed.reshape(0, self.width)
+        return (np.array(generations[rows]), np.array(packed[rows]), np.array(self._map('genome_length')[rows]),
+                np.array(self._map('genome_fitness')[rows]))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + '.bin')
+
+    def _map(self, name: str, dtype: Optional[str] = None) -> np.ndarray:
+        dtype = np.dtype(dtype or dict(SUMMARY_DTYPES, **GENOME_COLUMNS)[name])
+        path = self._path(name)
+        if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(os.path.getsize(path) // dtype.itemsize,))
+
+    @staticmethod
+    def _range(generations: np.ndarray, start: Optional[int], stop: Optional[int]) -> slice:
+        # Generations are recorded in increasing order, so the range is found by binary search
+        low = 0 if start is None else int(np.searchsorted(generations, start, side='left'))
+        high = len(generations) if stop is None else int(np.searchsorted(generations, stop, side='left'))
+        return slice(low, high)
@@ -0,0 +1,190 @@
+import multiprocessing
+import os
+import threading
+import traceback
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .core import GenerationSummary, Simulation
+from .bits import packed_width, row_keys
+from .population import DEFAULT_LIFESPAN, MAX_DNA_LENGTH
+from .rng import RandomStreams
+
+
+def ring(island: int, count: int) -> List[int]:
+    """
+    Returns the island that sends migrants to ``island`` on a one-way ring.
+    """
+    return [(island - 1) % count] if count > 1 else []
+
+
+def fully_connected(island: int, count: int) -> List[int]:
+    """
+    Returns every other island as a source of migrants for ``island``.
+    """
+    return [source for source in range(count) if source != island]
+
+
+TOPOLOGIES: Dict[str, Callable[[int, int], List[int]]] = {
+    'ring': ring,
+    'full': fully_connected,
+}
+
+
+class MigrantBuffer:
+    """
+    Holds the emigrants of every island as packed genomes in memory shared between processes.
+    """
+
+    def __init__(self, islands: int, migrants: int, max_length: int, context=multiprocessing) -> None:
+        """
+        Allocates the shared genome, length and fitness blocks.
+
+        Args:
+            islands (int): The number of islands.
+            migrants (int): The number of emigrants per island and migration.
+            max_length (int): The genome length cap, which fixes the packed row width.
+            context (optional): The multiprocessing context to allocate from. Defaults to the module default.
+        """
+        self.shape = (islands, migrants)
+        self.width = packed_width(max_length)
+        self.raw_genomes = context.RawArray('B', islands * migrants * self.width)
+        self.raw_lengths = context.RawArray('q', islands * migrants)
+        self.raw_fitness = context.RawArray('d', islands * migrants)
+
+    @property
+    def genomes(self) -> np.ndarray:
+        return np.frombuffer(self.raw_genomes, dtype=np.uint8).reshape(self.shape + (self.width,))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.frombuffer(self.raw_lengths, dtype=np.int64).reshape(self.shape)
+
+    @property
+    def fitness(self) -> np.ndarray:
+        return np.frombuffer(self.raw_fitness, dtype=np.float64).reshape(self.shape)
+
+
+class IslandResult(NamedTuple):
+    """
+    Reports the outcome of one island.
+    """
+
+    island: int
+    summaries: List[GenerationSummary]
+    unique_genomes: int
+    best_dna: List[int]
+
+
+def unique_genomes(simulation: Simulation) -> int:
+    """
+    Counts the distinct genomes in a simulation's population.
+    """
+    population = simulation.population
+    return len(np.unique(row_keys(population.genomes, population.lengths)))
+
+
+def emigrate(simulation: Simulation, buffer: MigrantBuffer, island: int) -> None:
+    """
+    Writes the fittest organisms of an island into its slot of the migrant buffer.
+    """
+    population = simulation.population
+    fitness = simulation.evaluate()
+    best = np.argsort(fitness, kind='stable')[::-1][:buffer.shape[1]]
+    buffer.genomes[island, :len(best)] = population.genomes[best]
+    buffer.lengths[island, :len(best)] = population.lengths[best]
+    buffer.fitness[island, :len(best)] = fitness[best]
+
+
+def immigrate(simulation: Simulation, buffer: MigrantBuffer, sources: List[int]) -> None:
+    """
+    Replaces the least fit organisms of an island with the fittest migrants sent by its sources.
+    """
+    if not sources:
+        return
+    population = simulation.population
+    count = min(buffer.shape[1], len(population))
+    fitness = buffer.fitness[sources].ravel()
+    incoming = np.argsort(fitness, kind='stable')[::-1][:count]
+    worst = np.argsort(population.fitness, kind='stable')[:count]
+    population.genomes[worst] = buffer.genomes[sources].reshape(-1, buffer.width)[incoming]
+    population.lengths[worst] = buffer.lengths[sources].ravel()[incoming]
+    population.lifespans[worst] = DEFAULT_LIFESPAN
+
+
+def _island_worker(island: int, count: int, num_generations: int, population_size: int, dna_length: int,
+                   streams: RandomStreams, interval: int, topology: str, buffer: MigrantBuffer,
+                   barrier: threading.Barrier, results) -> None:
+    """
+    Evolves one island, exchanging migrants with the others every ``interval`` generations.
+    """
+    try:
+        simulation = Simulation(population_size, dna_length, streams)
+        sources = TOPOLOGIES[topology](island, count)
+        summaries = []
+        for summary in simulation.run(num_generations):
+            summaries.append(summary)
+            if summary.generation % interval == 0 and summary.generation < num_generations:
+                emigrate(simulation, buffer, island)
+                barrier.wait()
+                immigrate(simulation, buffer, sources)
+                # Nobody may overwrite its slot before every island has read its migrants
+                barrier.wait()
+        population = simulation.population
+        best = int(np.argmax(simulation.evaluate()))
+        results.put(IslandResult(island, summaries, unique_genomes(simulation), population.dna(best)))
+    except threading.BrokenBarrierError:
+        # Another island failed and aborted the barrier; it reports the actual error
+        results.put((island, None))
+    except BaseException:
+        barrier.abort()
+        results.put((island, traceback.format_exc()))
+
+
+def run_islands(num_generations: int, population_size: int, dna_length: int, islands: Optional[int] = None,
+                migrants: int = 2, interval: int = 10, topology: str = 'ring',
+                seed: Optional[int] = None) -> List[IslandResult]:
+    """
+    Runs an island-model simulation with one worker process per island.
+
+    Args:
+        num_generations (int): The number of generations every island runs for.
+        population_size (int): The total population, split evenly across islands.
+        dna_length (int): The length of the DNA sequence.
+        islands (int, optional): The number of islands. Defaults to the number of cores.
+        migrants (int, optional): The number of organisms each island sends per migration. Defaults to 2.
+        interval (int, optional): The number of generations between migrations. Defaults to 10.
+        topology (str, optional): Either 'ring' or 'full'. Defaults to 'ring'.
+        seed (int, optional): The seed every island's stream is derived from. Defaults to an unseeded run.
+
+    Returns:
+        List[IslandResult]: The outcome of every island, ordered by island.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r}, expected one of {sorted(TOPOLOGIES)}")
+    islands = islands or os.cpu_count() or 1
+    if population_size < islands:
+        raise ValueError(f"Population of {population_size} cannot be split across {islands} islands")
+    context = multiprocessing.get_context()
+    buffer = MigrantBuffer(islands, migrants, max(dna_length, MAX_DNA_LENGTH), context)
+    barrier = context.Barrier(islands)
+    results = context.Queue()
+    streams = RandomStreams(seed)
+    sizes = [population_size // islands + (island < population_size % islands) for island in range(islands)]
+
+    workers = [context.Process(target=_island_worker,
+                               args=(island, islands, num_generations, sizes[island], dna_length, streams.child(island),
+                                     interval, topology, buffer, barrier, results))
+               for island in range(islands)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    failures = [outcome for outcome in outcomes if not isinstance(outcome, IslandResult) and outcome[1]]
+    if failures:
+        island, error = min(failures)
+        raise RuntimeError(f"Island {island} failed:\n{error}")
+    return sorted(outcomes)
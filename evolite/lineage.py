@@ -0,0 +1,355 @@
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .bits import popcount
+from .population import PopulationArray
+
+if TYPE_CHECKING:
+    from .pipeline import GenerationState
+
+# The mother of a founder, which has no parents
+NO_PARENT = -1
+
+_COLUMNS = {'ids': np.int64, 'mothers': np.int64, 'fathers': np.int64, 'generations': np.int32,
+            'lengths': np.int32, 'mutations': np.int32, 'length_changes': np.int16}
+
+
+def _distinct(rows: np.ndarray) -> np.ndarray:
+    rows = np.sort(rows)
+    return rows[np.concatenate([[True], rows[1:] != rows[:-1]])] if len(rows) else rows
+
+
+class Ancestor(NamedTuple):
+    """
+    Describes one node of the lineage.
+    """
+
+    id: int
+    mother: int
+    father: int
+    generation: int
+    length: int
+    mutations: int
+    length_change: int
+
+
+class LineageTracker:
+    """
+    Records the ancestry of a simulation as one node per organism in fixed-width integer columns.
+
+    Every child gets a node with the ids of its mother and father, the number of births since the founders,
+    its genome, and the mutation it took: the genes that differ from its unmutated crossover child and the
+    change in length. Node ids grow with every birth, so the columns stay sorted by id and a node is found
+    by binary search.
+
+    The lineage is the maternal tree: a child is born where its mother lives and inherits her mutation
+    rate, and every ancestry query follows mothers. Every ``prune_every`` births the nodes without living maternal
+    descendants are dropped. As lineages coalesce the tree keeps about ``2 N log G`` nodes for N organisms
+    over G generations, so memory stays near the size of the population. Fathers are recorded but not
+    followed, so a father's node may have been pruned.
+    """
+
+    def __init__(self, prune_every: int = 10) -> None:
+        """
+        Initializes an empty LineageTracker.
+
+        Args:
+            prune_every (int, optional): The births between prunings of extinct branches; 0 never prunes.
+                Defaults to 10.
+        """
+        self.prune_every = prune_every
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self.genomes = np.empty((0, 0), dtype=np.uint8)
+        self.max_length = 0
+        self.next_id = 0
+        self.births = 0
+        self._pending: List[Dict[str, np.ndarray]] = []
+        self._mother_rows = np.empty(0, dtype=np.int64)
+        self._parents: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._unmutated: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        self._compact()
+        return len(self.columns['ids'])
+
+    def state(self) -> Tuple[Dict[str, object], Dict[str, np.ndarray]]:
+        """
+        Returns the tree as JSON fields and arrays, for checkpoints.
+
+        Returns:
+            Tuple[Dict[str, object], Dict[str, np.ndarray]]: The JSON fields and a copy of the arrays.
+        """
+        self._compact()
+        arrays = dict(self.columns, genomes=self.genomes, mother_rows=self._mother_rows)
+        return ({'next_id': self.next_id, 'births': self.births, 'max_length': self.max_length},
+                {name: np.array(array) for name, array in arrays.items()})
+
+    def restore(self, fields: Dict[str, object], arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Replaces the tree with a state returned by ``state``.
+
+        Args:
+            fields (Dict[str, object]): The JSON fields.
+            arrays (Dict[str, np.ndarray]): The arrays.
+        """
+        self.next_id, self.births, self.max_length = fields['next_id'], fields['births'], fields['max_length']
+        self.columns = {name: np.array(arrays[name]) for name in _COLUMNS}
+        self.genomes = np.array(arrays['genomes'])
+        self._mother_rows = np.array(arrays['mother_rows'])
+        self._pending = []
+
+    def _new_ids(self, count: int) -> np.ndarray:
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self.next_id += count
+        return ids
+
+    def _append(self, population: PopulationArray, generation: int, mothers: np.ndarray, fathers: np.ndarray,
+                mother_rows: np.ndarray, mutations: np.ndarray, length_changes: np.ndarray) -> None:
+        self.max_length = max(self.max_length, population.max_length)
+        self._pending.append({'ids': population.ids, 'mothers': mothers, 'fathers': fathers,
+                              'generations': np.full(len(population), generation), 'lengths': population.lengths,
+                              'mutations': mutations, 'length_changes': length_changes,
+                              'genomes': population.genomes.copy(), 'mother_rows': mother_rows})
+
+    def _locate(self, ids: np.ndarray) -> np.ndarray:
+        # Rows as they will be once the pending chunks are compacted; every chunk holds a contiguous id range
+        rows = np.empty(len(ids), dtype=np.int64)
+        offset = len(self.columns['ids'])
+        compacted = ids < (self._pending[0]['ids'][0] if self._pending else self.next_id)
+        rows[compacted] = self._search(ids[compacted])
+        for chunk in self._pending:
+            inside = (ids >= chunk['ids'][0]) & (ids < chunk['ids'][0] + len(chunk['ids']))
+            rows[inside] = offset + ids[inside] - chunk['ids'][0]
+            offset += len(chunk['ids'])
+        return rows
+
+    def found(self, population: PopulationArray) -> None:
+        """
+        Gives every organism of a population without ancestry a founder node.
+
+        Args:
+            population (PopulationArray): The organisms, whose ``ids`` are set.
+        """
+        population.ids = self._new_ids(len(population))
+        none = np.full(len(population), NO_PARENT, dtype=np.int64)
+        zeros = np.zeros(len(population), dtype=np.int64)
+        self._append(population, self.births, none, none, none, zeros, zeros)
+
+    def birth(self, state: 'GenerationState') -> None:
+        """
+        Gives the children of a generation their ids and keeps their genomes before mutation.
+
+        Args:
+            state (GenerationState): The generation, right after reproduction.
+        """
+        if state.parents.ids is None:
+            self.found(state.parents)
+        offspring = state.offspring
+        offspring.ids = self._new_ids(len(offspring))
+        # Mothers are resolved to rows once, so walking a lineage is a gather rather than a search
+        mother_rows = self._locate(state.parents.ids)[state.mothers]
+        self._parents = (state.parents.ids[state.mothers], state.parents.ids[state.fathers], mother_rows)
+        self._unmutated = (offspring.genomes.copy(), offspring.lengths.copy())
+
+    def record(self, state: 'GenerationState') -> None:
+        """
+        Records the mutated children of a generation and prunes extinct branches when due.
+
+        Args:
+            state (GenerationState): The generation, right after the children replaced their parents.
+        """
+        offspring = state.offspring
+        if self._unmutated is None or offspring.ids is None:
+            return
+        (genomes, lengths), (mothers, fathers, mother_rows) = self._unmutated, self._parents
+        width = min(genomes.shape[1], offspring.genomes.shape[1])
+        mutations = popcount(genomes[:, :width] ^ offspring.genomes[:, :width])
+        self.births += 1
+        self._append(offspring, self.births, mothers, fathers, mother_rows, mutations, offspring.lengths - lengths)
+        self._unmutated = self._parents = None
+        if self.prune_every and self.births % self.prune_every == 0:
+            self.prune(state.simulation.population.ids)
+
+    def _compact(self) -> None:
+        if not self._pending:
+            return
+        width = max([self.genomes.shape[1]] + [chunk['genomes'].shape[1] for chunk in self._pending])
+        genomes = [np.pad(block, ((0, 0), (0, width - block.shape[1])))
+                   for block in [self.genomes] + [chunk['genomes'] for chunk in self._pending]]
+        self.genomes = np.concatenate(genomes)
+        for name, dtype in _COLUMNS.items():
+            self.columns[name] = np.concatenate([self.columns[name]] + [chunk[name].astype(dtype)
+                                                                       for chunk in self._pending])
+        self._mother_rows = np.concatenate([self._mother_rows] + [chunk['mother_rows'] for chunk in self._pending])
+        self._pending = []
+
+    def _search(self, ids: np.ndarray) -> np.ndarray:
+        # Searching sorted keys walks the table once instead of jumping around it for every key
+        if len(ids) < 2 or np.all(ids[1:] >= ids[:-1]):
+            return np.searchsorted(self.columns['ids'], ids)
+        keys, inverse = np.unique(ids, return_inverse=True)
+        return np.searchsorted(self.columns['ids'], keys)[inverse]
+
+    def rows(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the rows of the given nodes in the columns.
+
+        Args:
+            ids (np.ndarray): The node ids, which must not have been pruned.
+
+        Returns:
+            np.ndarray: The rows.
+        """
+        self._compact()
+        ids = np.asarray(ids, dtype=np.int64)
+        known = self.columns['ids']
+        rows = self._search(ids)
+        if len(ids) and (not len(known) or not np.array_equal(known[np.minimum(rows, len(known) - 1)], ids)):
+            raise KeyError("Some nodes are not in the lineage; they may have been pruned")
+        return rows
+
+    def prune(self, living: np.ndarray) -> int:
+        """
+        Drops every node that is neither living nor a maternal ancestor of a living organism.
+
+        The generations are visited from the newest back, each marking the mothers of its kept nodes, so
+        the cost is one pass over the nodes.
+
+        Args:
+            living (np.ndarray): The node ids of the living organisms.
+
+        Returns:
+            int: The number of nodes dropped.
+        """
+        self._compact()
+        generations = self.columns['generations']
+        keep = np.zeros(len(generations), dtype=bool)
+        keep[self.rows(living)] = True
+        bounds = np.searchsorted(generations, np.arange(int(generations[-1]) + 2)) if len(generations) else [0]
+        for generation in range(len(bounds) - 2, 0, -1):
+            start, end = bounds[generation], bounds[generation + 1]
+            keep[self._mother_rows[start:end][keep[start:end]]] = True
+        dropped = int(len(keep) - keep.sum())
+        if dropped:
+            # A kept node's mother is always kept, so its row only moves down by the rows dropped before it
+            moved = np.cumsum(keep) - 1
+            mother_rows = self._mother_rows[keep]
+            self._mother_rows = np.where(mother_rows == NO_PARENT, NO_PARENT, moved[mother_rows])
+            self.columns = {name: column[keep] for name, column in self.columns.items()}
+            self.genomes = self.genomes[keep]
+        return dropped
+
+    def node(self, id: int) -> Ancestor:
+        """
+        Returns one node of the lineage.
+
+        Args:
+            id (int): The node id.
+
+        Returns:
+            Ancestor: The node.
+        """
+        row = int(self.rows(np.array([id]))[0])
+        return Ancestor(*(int(self.columns[name][row]) for name in _COLUMNS))
+
+    def ancestors(self, ids: np.ndarray, generation: int) -> np.ndarray:
+        """
+        Returns the maternal ancestor of every given node that was born at or before a generation.
+
+        Lineages are walked back together as a set of distinct nodes, which shrinks as they coalesce, so
+        each generation walked costs less than the one before.
+
+        Args:
+            ids (np.ndarray): The node ids, such as a population's ``ids``.
+            generation (int): The births since the founders at which to stop.
+
+        Returns:
+            np.ndarray: One ancestor id per given node, the node itself if it is old enough.
+        """
+        rows, inverse = np.unique(self.rows(ids), return_inverse=True)
+        generations = self.columns['generations']
+        while True:
+            young = generations[rows] > generation
+            if not young.any():
+                return self.columns['ids'][rows[inverse]]
+            mothers = self._mother_rows[rows[young]]
+            if np.any(mothers == NO_PARENT):
+                raise ValueError(f"Some lineages begin after generation {generation}")
+            rows[young] = mothers
+            rows, merged = np.unique(rows, return_inverse=True)
+            inverse = merged[inverse]
+
+    def lineage(self, id: int) -> np.ndarray:
+        """
+        Returns the maternal line of a node back to its founder.
+
+        Args:
+            id (int): The node id.
+
+        Returns:
+            np.ndarray: The node ids, newest first.
+        """
+        rows = [int(self.rows(np.array([id]))[0])]
+        while self._mother_rows[rows[-1]] != NO_PARENT:
+            rows.append(int(self._mother_rows[rows[-1]]))
+        return self.columns['ids'][rows]
+
+    def common_ancestor(self, ids: np.ndarray) -> Optional[int]:
+        """
+        Finds the most recent common maternal ancestor of a set of nodes.
+
+        The youngest nodes of the set are replaced by their mothers until one node is left.
+
+        Args:
+            ids (np.ndarray): The node ids, such as a population's ``ids``.
+
+        Returns:
+            Optional[int]: The ancestor's id, or None if the nodes descend from different founders.
+        """
+        rows = _distinct(self.rows(ids))
+        generations = self.columns['generations']
+        while len(rows) > 1:
+            # Rows are sorted and generations never decrease with the row, so the youngest come last
+            youngest = generations[rows] == generations[rows[-1]]
+            mothers = self._mother_rows[rows[youngest]]
+            if np.any(mothers == NO_PARENT):
+                return None
+            rows = _distinct(np.concatenate([rows[~youngest], mothers]))
+        return int(self.columns['ids'][rows[0]]) if len(rows) else None
+
+    def population(self, ids: np.ndarray) -> PopulationArray:
+        """
+        Reconstructs the genomes of the given nodes as a population.
+
+        Args:
+            ids (np.ndarray): The node ids, such as the result of ``ancestors``.
+
+        Returns:
+            PopulationArray: The genomes, with the node ids as ``ids``.
+        """
+        rows = self.rows(ids)
+        lengths = self.columns['lengths'][rows].astype(np.int64)
+        return PopulationArray(self.genomes[rows], lengths, np.zeros(len(rows), dtype=np.int64), self.max_length,
+                               ids=np.asarray(ids, dtype=np.int64))
+
+    def origin(self, id: int, gene: int) -> int:
+        """
+        Finds the oldest maternal ancestor from which a node's gene has kept its current value.
+
+        Args:
+            id (int): The node id.
+            gene (int): The gene position.
+
+        Returns:
+            int: The id of the ancestor in which the gene last changed, or the founder if it never did.
+        """
+        line = self.lineage(id)
+        rows = self.rows(line)
+        if self.columns['lengths'][rows[0]] <= gene:
+            raise ValueError(f"Node {id} has no gene {gene}")
+        present = self.columns['lengths'][rows] > gene
+        values = (self.genomes[rows, gene >> 3] >> (gene & 7)) & 1
+        same = present & (values == values[0])
+        changed = np.flatnonzero(~same)
+        return int(line[changed[0] - 1] if len(changed) else line[-1])
@@ -0,0 +1,253 @@
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .bits import as_words, low_masks, packed_width, shift_down, shift_up
+from .pipeline import GenerationState
+from .population import DELETION, DUPLICATION, PopulationArray
+
+ADAPTATIONS = (None, 'one_fifth', 'self')
+
+
+def flip_genes(population: PopulationArray, rates: Union[float, np.ndarray], rng: np.random.Generator) -> int:
+    """
+    Flips every gene of every genome with its organism's rate, in one pass over the packed words.
+
+    The genes of the population are treated as one flat buffer with per-genome offsets, and the flipped
+    positions are found by geometric skips at the highest rate, so the cost grows with the number of
+    flips rather than the number of genes. Genomes with lower rates keep each candidate with the ratio
+    of their rate to the highest, which makes every gene an exact Bernoulli trial.
+
+    Args:
+        population (PopulationArray): The organisms, modified in place.
+        rates (Union[float, np.ndarray]): The per-gene flip probability, shared or one per organism.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        int: The number of genes flipped.
+    """
+    lengths = population.lengths
+    ends = np.cumsum(lengths)
+    total = int(ends[-1]) if len(ends) else 0
+    highest = float(np.max(rates)) if total else 0.0
+    if highest <= 0:
+        return 0
+    expected = total * highest
+    positions = np.cumsum(rng.geometric(highest, size=int(expected + 5 * np.sqrt(expected)) + 16)) - 1
+    while positions[-1] < total:
+        more = np.cumsum(rng.geometric(highest, size=len(positions)))
+        positions = np.concatenate([positions, positions[-1] + more])
+    positions = positions[positions < total]
+    rows = np.searchsorted(ends, positions, side='right')
+    if np.ndim(rates):
+        keep = rng.random(len(rows)) * highest < np.asarray(rates)[rows]
+        positions, rows = positions[keep], rows[keep]
+    columns = positions - (ends[rows] - lengths[rows])
+
+    # Positions are sorted, so flips landing in the same word are adjacent and can be merged
+    words = as_words(population.genomes)
+    keys = rows * words.shape[1] + (columns >> 6)
+    masks = np.left_shift(np.uint64(1), (columns & 63).astype(np.uint64))
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if len(keys) else keys
+    flat = words.reshape(-1)
+    flat[keys[starts]] ^= np.bitwise_or.reduceat(masks, starts) if len(keys) else masks
+    return len(rows)
+
+
+def edit_lengths(population: PopulationArray, duplication: Union[float, np.ndarray],
+                 deletion: Union[float, np.ndarray], rng: np.random.Generator) -> int:
+    """
+    Duplicates and deletes genes of every genome with per-gene rates, editing the packed words in place.
+
+    All edits of a generation are drawn at once and sorted from the highest position down within each
+    genome, so applying one never moves the genes a later one refers to. The k-th edits of all genomes
+    are then applied together with the same mask and shift operations as ``mutate_packed``, so the cost
+    grows with the number of edits per genome rather than with the genome length. As in
+    ``Organism.mutate``, duplications stop at ``max_length`` genes and deletions at one.
+
+    Args:
+        population (PopulationArray): The organisms, modified in place.
+        duplication (Union[float, np.ndarray]): The per-gene duplication probability, shared or one per organism.
+        deletion (Union[float, np.ndarray]): The per-gene deletion probability, shared or one per organism.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        int: The number of edits applied.
+    """
+    lengths = population.lengths.copy()
+    counts = [rng.binomial(lengths, duplication), rng.binomial(lengths, deletion)]
+    rows = np.concatenate([np.repeat(np.arange(len(lengths)), count) for count in counts])
+    if not len(rows):
+        return 0
+    kinds = np.repeat([DUPLICATION, DELETION], [count.sum() for count in counts])
+    positions = (rng.random(len(rows)) * lengths[rows]).astype(np.int64)
+    order = np.lexsort((-positions, rows))
+    rows, kinds, positions = rows[order], kinds[order], positions[order]
+    ranks = np.arange(len(rows)) - np.searchsorted(rows, rows)
+
+    words = as_words(population.genomes)
+    masks = low_masks(population.max_length)
+    applied = 0
+    for rank in range(int(ranks.max()) + 1):
+        step = ranks == rank
+        row, kind, at = rows[step], kinds[step], positions[step]
+        grow = (kind == DUPLICATION) & (lengths[row] < population.max_length)
+        shrink = (kind == DELETION) & (lengths[row] > 1) & (at < lengths[row])
+        target, index = row[grow], at[grow]
+        selected = words[target]
+        words[target] = (selected & masks[index + 1]) | shift_up(selected & ~masks[index])
+        lengths[target] += 1
+        target, index = row[shrink], at[shrink]
+        selected = words[target]
+        words[target] = (selected & masks[index]) | (shift_down(selected) & ~masks[index])
+        lengths[target] -= 1
+        applied += int(grow.sum() + shrink.sum())
+    population.lengths = lengths
+    return applied
+
+
+def widen(population: PopulationArray, max_length: int) -> None:
+    """
+    Raises the genome length cap of a population, padding its packed genomes.
+
+    Args:
+        population (PopulationArray): The organisms, modified in place.
+        max_length (int): The new cap; a lower cap is ignored.
+    """
+    if max_length <= population.max_length:
+        return
+    padding = packed_width(max_length) - population.genomes.shape[1]
+    if padding:
+        population.genomes = np.pad(population.genomes, ((0, 0), (0, padding)))
+    population.max_length = max_length
+
+
+class MutationEngine:
+    """
+    Mutates a whole generation with per-gene point, duplication and deletion rates, so a genome can take
+    any number of mutations and long genomes cost no more per gene than short ones.
+
+    The point mutation rate can adapt. With 'one_fifth' it follows Rechenberg's 1/5th success rule: after
+    every generation the rate grows if more than a fifth of the children beat their mother and shrinks
+    otherwise. With 'self' every organism carries its own rate, inherited from its mother and perturbed
+    log-normally before it is used, so selection tunes the rates along with the genes.
+    """
+
+    def __init__(self, rate: float = 0.05, duplication: float = 0.0, deletion: float = 0.0,
+                 max_length: Optional[int] = None, adaptation: Optional[str] = None, factor: float = 1.22,
+                 target: float = 0.2, tau: Optional[float] = None, min_rate: float = 1e-4,
+                 max_rate: float = 0.5) -> None:
+        """
+        Initializes a MutationEngine.
+
+        Args:
+            rate (float, optional): The starting probability that a gene flips. Defaults to 0.05.
+            duplication (float, optional): The probability that a gene is duplicated. Defaults to 0.0.
+            deletion (float, optional): The probability that a gene is deleted. Defaults to 0.0.
+            max_length (int, optional): The genome length cap, above the population's to let genomes grow
+                longer. Defaults to the population's cap.
+            adaptation (str, optional): None, 'one_fifth' or 'self'. Defaults to None.
+            factor (float, optional): The rate multiplier of the 1/5th rule. Defaults to 1.22.
+            target (float, optional): The success ratio the 1/5th rule aims for. Defaults to 0.2.
+            tau (float, optional): The log-normal step size of self-adaptive rates. Defaults to
+                ``1 / sqrt(max_length)``.
+            min_rate (float, optional): The lowest adapted rate. Defaults to 1e-4.
+            max_rate (float, optional): The highest adapted rate. Defaults to 0.5.
+        """
+        if adaptation not in ADAPTATIONS:
+            raise ValueError(f"Unknown adaptation {adaptation!r}, expected one of {ADAPTATIONS}")
+        self.rate = rate
+        self.duplication = duplication
+        self.deletion = deletion
+        self.max_length = max_length
+        self.adaptation = adaptation
+        self.factor = factor
+        self.target = target
+        self.tau = tau
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.success_ratio: Optional[float] = None
+        self._parent_fitness: Optional[np.ndarray] = None
+
+    def mutate(self, population: PopulationArray, rng: np.random.Generator,
+               rates: Union[None, float, np.ndarray] = None) -> None:
+        """
+        Applies every point, duplication and deletion of one generation in batch.
+
+        Args:
+            population (PopulationArray): The organisms, modified in place.
+            rng (np.random.Generator): The random generator to draw from.
+            rates (Union[None, float, np.ndarray], optional): The point mutation rate, shared or one per
+                organism. Defaults to ``self.rate``.
+        """
+        if not len(population):
+            return
+        if self.max_length is not None:
+            widen(population, self.max_length)
+        flip_genes(population, self.rate if rates is None else rates, rng)
+        if self.duplication or self.deletion:
+            edit_lengths(population, self.duplication, self.deletion, rng)
+
+    def adapt(self, population: PopulationArray) -> None:
+        """
+        Applies the 1/5th rule to the children of the last generation, now evaluated.
+
+        Children are the last organisms of the population, after any elite carried over.
+
+        Args:
+            population (PopulationArray): The evaluated population.
+        """
+        parents, self._parent_fitness = self._parent_fitness, None
+        if parents is None or not len(parents) or len(population) < len(parents):
+            return
+        self.success_ratio = float(np.mean(population.fitness[len(population) - len(parents):] > parents))
+        self.rate *= self.factor if self.success_ratio > self.target else 1 / self.factor
+        self.rate = min(self.max_rate, max(self.min_rate, self.rate))
+
+    def state(self) -> Tuple[Dict[str, object], Dict[str, np.ndarray]]:
+        """
+        Returns what the engine has adapted so far, for checkpoints.
+
+        Returns:
+            Tuple[Dict[str, object], Dict[str, np.ndarray]]: The JSON fields and a copy of the arrays.
+        """
+        arrays = {} if self._parent_fitness is None else {'parent_fitness': np.array(self._parent_fitness)}
+        return {'rate': self.rate, 'success_ratio': self.success_ratio}, arrays
+
+    def restore(self, fields: Dict[str, object], arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Puts back a state returned by ``state``.
+
+        Args:
+            fields (Dict[str, object]): The JSON fields.
+            arrays (Dict[str, np.ndarray]): The arrays; names the engine did not save are ignored.
+        """
+        self.rate, self.success_ratio = fields['rate'], fields['success_ratio']
+        self._parent_fitness = np.array(arrays['parent_fitness']) if 'parent_fitness' in arrays else None
+
+    def __call__(self, state: GenerationState) -> None:
+        """
+        Mutates the children of a generation; usable as the pipeline's 'mutate' stage.
+
+        Args:
+            state (GenerationState): The generation, whose ``offspring`` are mutated in place.
+        """
+        offspring, rng = state.offspring, state.simulation.rng
+        if not len(offspring):
+            return
+        # Elites are carried over from the parents, which must match the children or joining them fails or
+        # drops the children's rates
+        if self.max_length is not None:
+            widen(state.parents, self.max_length)
+        if self.adaptation == 'self' and state.parents.rates is None:
+            state.parents.rates = np.full(len(state.parents), self.rate)
+        rates = None
+        if self.adaptation == 'one_fifth':
+            self.adapt(state.simulation.population)
+            self._parent_fitness = state.parents.fitness[state.mothers]
+        elif self.adaptation == 'self':
+            rates = offspring.rates if offspring.rates is not None else np.full(len(offspring), self.rate)
+            tau = self.tau or 1 / np.sqrt(self.max_length or offspring.max_length)
+            rates = np.clip(rates * np.exp(tau * rng.standard_normal(len(offspring))), self.min_rate, self.max_rate)
+            offspring.rates = rates
+        self.mutate(offspring, rng, rates)
@@ -0,0 +1,105 @@
+import random
+from typing import Dict, List, Optional, Union
+
+from .environment import Environment
+from .genome import Genome
+from .population import DEFAULT_LIFESPAN, MAX_DNA_LENGTH
+
+
+class Organism:
+    """
+    Represents an organism with a packed DNA sequence and properties related to its fitness and lifespan.
+    """
+
+    __slots__ = ('genome', 'fitness', 'lifespan')
+
+    def __init__(self, dna: Union[Genome, List[int]], lifespan: int = DEFAULT_LIFESPAN) -> None:
+        """
+        Initializes an Organism instance with a DNA sequence and a lifespan.
+
+        Args:
+            dna (Union[Genome, List[int]]): The DNA sequence of the organism.
+            lifespan (int, optional): The lifespan of the organism. Defaults to 100.
+        """
+        self.genome = dna if isinstance(dna, Genome) else Genome.from_list(dna)
+        self.fitness = 0
+        self.lifespan = lifespan
+
+    @property
+    def dna(self) -> List[int]:
+        """
+        Returns the DNA sequence as a list of genes.
+        """
+        return self.genome.to_list()
+
+    @property
+    def traits(self) -> Dict[str, float]:
+        """
+        Returns the traits derived from the DNA sequence.
+        """
+        return self.calculate_traits()
+
+    def calculate_traits(self) -> Dict[str, float]:
+        """
+        Calculates the traits of the organism based on the share of ones in its DNA sequence.
+
+        Returns:
+            Dict[str, float]: A dictionary containing the calculated traits (heat_tolerance, camouflage).
+        """
+        share = self.genome.ones() / self.genome.length
+        return {"heat_tolerance": share, "camouflage": share}
+
+    def mutate(self, rng: Optional[random.Random] = None) -> 'Organism':
+        """
+        Mutates the DNA sequence of the organism by performing a random mutation.
+
+        Args:
+            rng (random.Random, optional): The random generator to draw from. Defaults to the
+                ``random`` module.
+
+        Returns:
+            Organism: The mutated organism.
+        """
+        rng = rng or random
+        genome = self.genome
+        mutation_type = rng.choice(['point', 'duplication', 'deletion'])
+        if mutation_type == 'point':
+            self.genome = genome.flip(rng.randint(0, genome.length - 1))
+        elif mutation_type == 'duplication' and genome.length < MAX_DNA_LENGTH:
+            self.genome = genome.duplicate(rng.randint(0, genome.length - 1))
+        elif mutation_type == 'deletion' and genome.length > 1:
+            self.genome = genome.delete(rng.randint(0, genome.length - 1))
+        return self
+
+    def reproduce(self, parent: 'Organism', rng: Optional[random.Random] = None) -> 'Organism':
+        """
+        Reproduces the organism with another parent organism to create a new offspring.
+
+        Args:
+            parent (Organism): The parent organism to reproduce with.
+            rng (random.Random, optional): The random generator to draw from. Defaults to the
+                ``random`` module.
+
+        Returns:
+            Organism: The offspring organism.
+        """
+        rng = rng or random
+        return Organism(self.genome.crossover(parent.genome, rng.getrandbits(self.genome.length)))
+
+    def calculate_fitness(self, environment: Optional[Environment]) -> None:
+        """
+        Calculates the fitness of the organism based on its DNA sequence and the environment.
+
+        Args:
+            environment (Environment): The environment in which the organism is living.
+        """
+        self.fitness = self.genome.ones()
+        if environment and environment.temperature > 30:
+            self.fitness += 1
+
+    def decrease_lifespan(self) -> None:
+        """
+        Decreases the lifespan of the organism by 1.
+        """
+        if self.lifespan > 0:
+            self.lifespan -= 1
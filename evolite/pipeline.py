@@ -0,0 +1,442 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .population import PopulationArray, concatenate
+from .selection import elite, get_selection
+
+if TYPE_CHECKING:
+    from .core import GenerationSummary, Simulation
+
+
+class GenerationState:
+    """
+    Carries the intermediate results of one generation from stage to stage.
+    """
+
+    def __init__(self, simulation: 'Simulation') -> None:
+        """
+        Initializes the state of a generation about to run.
+
+        Args:
+            simulation (Simulation): The simulation being advanced; stages read and update it.
+        """
+        self.simulation = simulation
+        self.summary: Optional['GenerationSummary'] = None
+        self.parents: PopulationArray = simulation.population
+        self.size: Optional[int] = None
+        self.elites = 0
+        self.mothers = np.empty(0, dtype=np.int64)
+        self.fathers = np.empty(0, dtype=np.int64)
+        self.offspring: Optional[PopulationArray] = None
+
+
+Stage = Callable[[GenerationState], None]
+
+
+class StageTiming(NamedTuple):
+    """
+    Measures one stage of one generation.
+    """
+
+    generation: int
+    stage: str
+    seconds: float
+    allocated: int
+    organisms: int
+
+
+def evaluate(state: GenerationState) -> None:
+    """
+    Calculates the fitness of the population and summarizes the generation.
+    """
+    state.simulation.evaluate()
+    state.summary = state.simulation.summary()
+
+
+def record(state: GenerationState) -> None:
+    """
+    Records the evaluated generation to the history store, if there is one.
+    """
+    if state.simulation.history is not None:
+        state.simulation.history.record(state.summary, state.simulation.population)
+
+
+def monitor(state: GenerationState) -> None:
+    """
+    Checks the stopping rules of the convergence monitor, if there is one, against the evaluated generation.
+    """
+    simulation = state.simulation
+    if simulation.monitor is not None:
+        simulation.stop_reason = simulation.monitor.observe(state.summary.generation, state.summary.best_fitness,
+                                                            simulation.population)
+
+
+def age(state: GenerationState) -> None:
+    """
+    Decreases the lifespan of every organism.
+    """
+    state.simulation.population.decrease_lifespan()
+
+
+def filter_dead(state: GenerationState) -> None:
+    """
+    Removes the organisms whose lifespan has run out, so carried-over elites do not live forever. The living
+    breed the generation back to its size, unless a survival stage sets another.
+    """
+    simulation, population = state.simulation, state.simulation.population
+    if not population.lifespans.all():
+        state.size = len(population)
+        simulation.population = state.parents = population.alive()
+
+
+def survive(state: GenerationState) -> None:
+    """
+    Culls the parents by starvation and predation and sets the next generation's size, if there is a
+    survival stage.
+    """
+    simulation = state.simulation
+    if simulation.survival is not None:
+        state.parents = simulation.survival(state.parents, simulation.environment, simulation.rng)
+        state.size = simulation.survival.offspring(len(state.parents))
+
+
+def speciate(state: GenerationState) -> None:
+    """
+    Places the parents in species, if the simulation has a speciation.
+    """
+    if state.simulation.speciation is not None and len(state.parents):
+        state.simulation.speciation.assign(state.parents)
+
+
+def select(state: GenerationState) -> None:
+    """
+    Draws the mother and father of every child and the number of elites carried over, within species if the
+    simulation has a speciation.
+    """
+    simulation, parents = state.simulation, state.parents
+    if not len(parents):
+        return
+    if simulation.speciation is not None:
+        simulation.speciation.select(state)
+        return
+    size = len(parents) if state.size is None else state.size
+    state.elites = min(simulation.elites, len(parents), size)
+    count = size - state.elites
+    state.mothers = get_selection(simulation.mothers)(parents.fitness, count, simulation.rng)
+    state.fathers = get_selection(simulation.fathers)(parents.fitness, count, simulation.rng)
+
+
+def reproduce(state: GenerationState) -> None:
+    """
+    Breeds one child per selected pair of parents.
+    """
+    if not len(state.parents):
+        state.offspring = state.parents
+        return
+    state.offspring = state.parents.reproduce(state.mothers, state.fathers, state.simulation.rng,
+                                              state.simulation.crossover)
+
+
+def birth(state: GenerationState) -> None:
+    """
+    Gives the children their lineage ids, if ancestry is tracked.
+    """
+    if state.simulation.lineage is not None and len(state.offspring):
+        state.simulation.lineage.birth(state)
+
+
+def mutate(state: GenerationState) -> None:
+    """
+    Mutates every child with the simulation's mutation engine, or applies one random mutation to each.
+    """
+    if not len(state.offspring):
+        return
+    if state.simulation.mutation is not None:
+        state.simulation.mutation(state)
+    else:
+        state.offspring.mutate(state.simulation.rng)
+
+
+def replace(state: GenerationState) -> None:
+    """
+    Replaces the population with the children and the carried-over elite.
+    """
+    offspring = state.offspring
+    if state.elites:
+        offspring = concatenate([state.parents.take(elite(state.parents.fitness, state.elites)), offspring])
+    state.simulation.population = offspring
+
+
+def lineage(state: GenerationState) -> None:
+    """
+    Records the children in the lineage and prunes extinct branches, if ancestry is tracked.
+    """
+    if state.simulation.lineage is not None and len(state.offspring):
+        state.simulation.lineage.record(state)
+
+
+def settle(state: GenerationState) -> None:
+    """
+    Places the new generation in the environment.
+    """
+    state.simulation.environment.settle(state.simulation.population, state.simulation.rng)
+
+
+def cycle_day(state: GenerationState) -> None:
+    """
+    Cycles a day in the environment.
+    """
+    state.simulation.environment.cycle_day(state.simulation.environment_rng)
+
+
+STAGES: Dict[str, Stage] = {
+    'evaluate': evaluate,
+    'record': record,
+    'monitor': monitor,
+    'age': age,
+    'filter': filter_dead,
+    'survive': survive,
+    'speciate': speciate,
+    'select': select,
+    'reproduce': reproduce,
+    'birth': birth,
+    'mutate': mutate,
+    'replace': replace,
+    'lineage': lineage,
+    'settle': settle,
+    'cycle_day': cycle_day,
+}
+
+DEFAULT_STAGES = tuple(STAGES)
+
+
+class Pipeline:
+    """
+    Runs a generation as an ordered list of named stages that can be reordered, replaced or disabled.
+
+    With ``instrument`` set, the wall time, the bytes allocated at peak and the population size after
+    every stage are recorded as one ``StageTiming`` row per stage and generation. With ``profile`` set,
+    every generation also runs under ``cProfile`` so the profile can be dumped for pstats, snakeviz or a
+    flamegraph converter.
+    """
+
+    def __init__(self, stages: Optional[Sequence[Union[str, Tuple[str, Stage]]]] = None, instrument: bool = False,
+                 trace_allocations: bool = False, profile: bool = False) -> None:
+        """
+        Initializes a Pipeline.
+
+        Args:
+            stages (Sequence[Union[str, Tuple[str, Stage]]], optional): The stages in order, as names from
+                ``STAGES`` or (name, stage) pairs. Defaults to ``DEFAULT_STAGES``.
+            instrument (bool, optional): Record a timing row per stage and generation. Defaults to False.
+            trace_allocations (bool, optional): Also measure allocations with ``tracemalloc``, which slows
+                the run down noticeably. Defaults to False.
+            profile (bool, optional): Run every generation under ``cProfile``. Defaults to False.
+        """
+        self.stages: List[Tuple[str, Stage]] = [self._resolve(stage) for stage in (stages or DEFAULT_STAGES)]
+        self.disabled = set()
+        self.instrument = instrument or trace_allocations
+        self.trace_allocations = trace_allocations
+        self.timings: List[StageTiming] = []
+        self.profiler = cProfile.Profile() if profile else None
+
+    @staticmethod
+    def _resolve(stage: Union[str, Tuple[str, Stage]]) -> Tuple[str, Stage]:
+        if not isinstance(stage, str):
+            return stage
+        try:
+            return stage, STAGES[stage]
+        except KeyError:
+            raise ValueError(f"Unknown stage {stage!r}, expected one of {sorted(STAGES)}") from None
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Returns the names of the stages, in order, including disabled ones.
+        """
+        return [name for name, _ in self.stages]
+
+    def _index(self, name: str) -> int:
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise ValueError(f"No stage {name!r} in the pipeline, which has {self.names}") from None
+
+    def replace(self, name: str, stage: Stage) -> None:
+        """
+        Replaces the stage of a given name, keeping its position.
+
+        Args:
+            name (str): The name of the stage.
+            stage (Stage): The new stage.
+        """
+        self.stages[self._index(name)] = (name, stage)
+
+    def insert(self, name: str, stage: Stage, before: Optional[str] = None, after: Optional[str] = None) -> None:
+        """
+        Adds a stage before or after another one, or at the end.
+
+        Args:
+            name (str): The name of the new stage.
+            stage (Stage): The new stage.
+            before (str, optional): The stage to insert in front of.
+            after (str, optional): The stage to insert behind.
+        """
+        if name in self.names:
+            raise ValueError(f"Stage {name!r} is already in the pipeline")
+        if before is not None:
+            position = self._index(before)
+        elif after is not None:
+            position = self._index(after) + 1
+        else:
+            position = len(self.stages)
+        self.stages.insert(position, (name, stage))
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        del self.stages[self._index(name)]
+
+    def reorder(self, names: Sequence[str]) -> None:
+        """
+        Puts the stages in a new order.
+
+        Args:
+            names (Sequence[str]): Every stage name, in the new order.
+        """
+        if sorted(names) != sorted(self.names):
+            raise ValueError(f"Expected an order of {self.names}, got {list(names)}")
+        stages = dict(self.stages)
+        self.stages = [(name, stages[name]) for name in names]
+
+    def disable(self, name: str) -> None:
+        """
+        Skips a stage until it is enabled again.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        self._index(name)
+        self.disabled.add(name)
+
+    def enable(self, name: str) -> None:
+        """
+        Runs a disabled stage again.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        self.disabled.discard(name)
+
+    def run(self, simulation: 'Simulation') -> GenerationState:
+        """
+        Runs every enabled stage once, in order.
+
+        Args:
+            simulation (Simulation): The simulation to advance, whose generation counter is already set.
+
+        Returns:
+            GenerationState: The state after the last stage, including the generation summary.
+        """
+        state = GenerationState(simulation)
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            if self.instrument:
+                self._run_instrumented(state)
+            else:
+                for name, stage in self.stages:
+                    if name not in self.disabled:
+                        stage(state)
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+        return state
+
+    def _run_instrumented(self, state: GenerationState) -> None:
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        generation = state.simulation.generation
+        for name, stage in self.stages:
+            if name in self.disabled:
+                continue
+            if self.trace_allocations:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            stage(state)
+            seconds = time.perf_counter() - started
+            allocated = tracemalloc.get_traced_memory()[1] - before if self.trace_allocations else 0
+            self.timings.append(StageTiming(generation, name, seconds, allocated, len(state.simulation.population)))
+
+    def timing_table(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the recorded timings as columns.
+
+        Returns:
+            Dict[str, np.ndarray]: One array per ``StageTiming`` field, one row per stage and generation.
+        """
+        columns = list(zip(*self.timings)) or [()] * len(StageTiming._fields)
+        return {name: np.array(column) for name, column in zip(StageTiming._fields, columns)}
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the total and mean time and allocations of every stage, and its share of the total time.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The totals, keyed by stage name in pipeline order, followed by any
+            stage that has since been removed.
+        """
+        seconds: Dict[str, List[float]] = {name: [] for name in self.names}
+        allocated = dict.fromkeys(self.names, 0)
+        for timing in self.timings:
+            seconds.setdefault(timing.stage, []).append(timing.seconds)
+            allocated[timing.stage] = allocated.get(timing.stage, 0) + timing.allocated
+        total = sum(sum(values) for values in seconds.values())
+        return {name: {'seconds': sum(values), 'mean_seconds': sum(values) / len(values) if values else 0.0,
+                       'share': sum(values) / total if total else 0.0, 'allocated': allocated[name]}
+                for name, values in seconds.items()}
+
+    def write_timings(self, path: str) -> None:
+        """
+        Writes the recorded timings as JSON lines, one per stage and generation.
+
+        Args:
+            path (str): The output file.
+        """
+        with open(path, 'w') as output:
+            for timing in self.timings:
+                output.write(json.dumps(timing._asdict()) + '\n')
+
+    def write_folded(self, path: str) -> None:
+        """
+        Writes the stage times as folded stacks in microseconds, the input format of flamegraph tools.
+
+        Args:
+            path (str): The output file.
+        """
+        totals = self.stage_totals()
+        with open(path, 'w') as output:
+            for name, total in totals.items():
+                if total['seconds']:
+                    output.write(f"generation;{name} {int(round(total['seconds'] * 1e6))}\n")
+
+    def dump_profile(self, path: str) -> None:
+        """
+        Writes the ``cProfile`` statistics collected so far, readable with ``pstats``.
+
+        Args:
+            path (str): The output file.
+        """
+        if self.profiler is None:
+            raise ValueError("The pipeline was not created with profile=True")
+        self.profiler.dump_stats(path)
@@ -0,0 +1,331 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .bits import as_words, low_masks, pack_bits, packed_width, popcount, shift_down, shift_up, unpack_bits
+from .crossover import Crossover, get_crossover
+from .environment import Environment
+from .genome import Genome
+from .selection import Selection, elite, get_selection
+
+MAX_DNA_LENGTH = 20
+DEFAULT_LIFESPAN = 100
+
+POINT, DUPLICATION, DELETION = 0, 1, 2
+
+
+def mutate_packed(genomes: np.ndarray, lengths: np.ndarray, rng: np.random.Generator,
+                  max_length: int = MAX_DNA_LENGTH) -> np.ndarray:
+    """
+    Applies one random point, duplication or deletion mutation to every packed genome at once.
+
+    Mirrors ``Organism.mutate``: duplication only happens below ``max_length`` genes and
+    deletion only above one gene, otherwise the genome is left untouched.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix, modified in place.
+        lengths (np.ndarray): The number of genes in each genome.
+        rng (np.random.Generator): The random generator to draw from.
+        max_length (int, optional): The genome length cap. Defaults to 20.
+
+    Returns:
+        np.ndarray: The new lengths.
+    """
+    words = as_words(genomes)
+    masks = low_masks(max_length)
+    kinds = rng.integers(0, 3, size=len(lengths))
+    index = rng.integers(0, lengths)
+
+    point = np.flatnonzero(kinds == POINT)
+    words[point, index[point] >> 6] ^= np.left_shift(np.uint64(1), (index[point] & 63).astype(np.uint64))
+
+    # Duplication keeps genes up to the copied one and shifts the rest up by one
+    duplication = np.flatnonzero((kinds == DUPLICATION) & (lengths < max_length))
+    at, rows = index[duplication], words[duplication]
+    words[duplication] = (rows & masks[at + 1]) | shift_up(rows & ~masks[at])
+
+    # Deletion keeps genes below the removed one and shifts the rest down by one
+    deletion = np.flatnonzero((kinds == DELETION) & (lengths > 1))
+    at, rows = index[deletion], words[deletion]
+    words[deletion] = (rows & masks[at]) | (shift_down(rows) & ~masks[at])
+
+    lengths = lengths.copy()
+    lengths[duplication] += 1
+    lengths[deletion] -= 1
+    return lengths
+
+
+class PopulationArray:
+    """
+    Represents a whole generation of organisms as packed genome, length, fitness and lifespan arrays.
+    """
+
+    def __init__(self, genomes: np.ndarray, lengths: np.ndarray, lifespans: np.ndarray,
+                 max_length: int = MAX_DNA_LENGTH, fitness: Optional[np.ndarray] = None,
+                 positions: Optional[np.ndarray] = None, rates: Optional[np.ndarray] = None,
+                 ids: Optional[np.ndarray] = None, species: Optional[np.ndarray] = None) -> None:
+        """
+        Initializes a PopulationArray from already packed genomes.
+
+        Args:
+            genomes (np.ndarray): The (population, bytes) packed ``uint8`` genome matrix.
+            lengths (np.ndarray): The number of genes in each genome.
+            lifespans (np.ndarray): The remaining lifespan of each organism.
+            max_length (int, optional): The genome length cap. Defaults to 20.
+            fitness (np.ndarray, optional): The fitness of each organism. Defaults to zeros.
+            positions (np.ndarray, optional): The flat index of the patch each organism lives on in a spatial
+                environment. Defaults to no positions.
+            rates (np.ndarray, optional): The self-adapted mutation rate of each organism. Defaults to no rates.
+            ids (np.ndarray, optional): The lineage node of each organism. Defaults to untracked ancestry.
+            species (np.ndarray, optional): The species of each organism. Defaults to no species.
+        """
+        self.genomes = genomes
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.lifespans = np.asarray(lifespans, dtype=np.int64)
+        self.max_length = max_length
+        self.fitness = np.zeros(len(self.lengths)) if fitness is None else fitness
+        self.positions = positions
+        self.rates = rates
+        self.ids = ids
+        self.species = species
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray, lengths: np.ndarray, lifespans: Optional[np.ndarray] = None,
+                  max_length: Optional[int] = None) -> 'PopulationArray':
+        """
+        Creates a PopulationArray from an unpacked 0/1 gene matrix.
+
+        Args:
+            bits (np.ndarray): The (population, genes) gene matrix, zero past each genome's length.
+            lengths (np.ndarray): The number of genes in each genome.
+            lifespans (np.ndarray, optional): The lifespan of each organism. Defaults to 100 each.
+            max_length (int, optional): The genome length cap. Defaults to the matrix width.
+
+        Returns:
+            PopulationArray: The packed population.
+        """
+        if lifespans is None:
+            lifespans = np.full(len(lengths), DEFAULT_LIFESPAN, dtype=np.int64)
+        return cls(pack_bits(bits), lengths, lifespans, max_length or bits.shape[1])
+
+    @classmethod
+    def from_genomes(cls, genomes: Sequence[Genome], max_length: int = MAX_DNA_LENGTH,
+                     lifespan: int = DEFAULT_LIFESPAN) -> 'PopulationArray':
+        """
+        Packs a sequence of Genome objects into a PopulationArray.
+
+        Args:
+            genomes (Sequence[Genome]): The genomes of the organisms.
+            max_length (int, optional): The genome length cap. Defaults to 20.
+            lifespan (int, optional): The lifespan of each organism. Defaults to 100.
+
+        Returns:
+            PopulationArray: The packed population.
+        """
+        max_length = max([max_length] + [genome.length for genome in genomes])
+        width = packed_width(max_length)
+        data = b''.join(genome.to_bytes(width) for genome in genomes)
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(len(genomes), width).copy()
+        lengths = np.array([genome.length for genome in genomes], dtype=np.int64)
+        return cls(packed, lengths, np.full(len(genomes), lifespan, dtype=np.int64), max_length)
+
+    @classmethod
+    def random(cls, population_size: int, dna_length: int, rng: np.random.Generator,
+               max_length: int = MAX_DNA_LENGTH, lifespan: int = DEFAULT_LIFESPAN) -> 'PopulationArray':
+        """
+        Generates a population of organisms with random DNA sequences.
+
+        Args:
+            population_size (int): The number of organisms in the population.
+            dna_length (int): The length of the DNA sequence of each organism.
+            rng (np.random.Generator): The random generator to draw from.
+            max_length (int, optional): The genome length cap. Defaults to 20.
+            lifespan (int, optional): The lifespan of each organism. Defaults to 100.
+
+        Returns:
+            PopulationArray: The generated population.
+        """
+        max_length = max(max_length, dna_length)
+        bits = np.zeros((population_size, max_length), dtype=np.uint8)
+        bits[:, :dna_length] = rng.integers(0, 2, size=(population_size, dna_length), dtype=np.uint8)
+        lengths = np.full(population_size, dna_length, dtype=np.int64)
+        return cls.from_bits(bits, lengths, np.full(population_size, lifespan, dtype=np.int64), max_length)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def bits(self) -> np.ndarray:
+        """
+        Returns the unpacked (population, max_length) gene matrix.
+        """
+        return unpack_bits(self.genomes, self.max_length)
+
+    def dna(self, index: int) -> List[int]:
+        """
+        Returns the DNA sequence of one organism as a list of genes.
+
+        Args:
+            index (int): The position of the organism in the population.
+
+        Returns:
+            List[int]: The organism's genes.
+        """
+        row = unpack_bits(self.genomes[index:index + 1], self.max_length)[0]
+        return row[:self.lengths[index]].tolist()
+
+    def genome(self, index: int) -> Genome:
+        """
+        Returns the genome of one organism as a Genome object.
+
+        Args:
+            index (int): The position of the organism in the population.
+
+        Returns:
+            Genome: The organism's genome.
+        """
+        return Genome.from_bytes(self.genomes[index].tobytes(), int(self.lengths[index]))
+
+    def take(self, indices: np.ndarray) -> 'PopulationArray':
+        """
+        Returns a new population made of the organisms at the given positions.
+
+        Args:
+            indices (np.ndarray): The positions, or a boolean mask, of the organisms to keep.
+
+        Returns:
+            PopulationArray: The selected organisms.
+        """
+        positions = None if self.positions is None else self.positions[indices]
+        rates = None if self.rates is None else self.rates[indices]
+        ids = None if self.ids is None else self.ids[indices]
+        species = None if self.species is None else self.species[indices]
+        return PopulationArray(self.genomes[indices], self.lengths[indices], self.lifespans[indices],
+                               self.max_length, self.fitness[indices], positions, rates, ids, species)
+
+    def calculate_fitness(self, environment: Optional[Environment]) -> np.ndarray:
+        """
+        Calculates the fitness of every organism as its number of ones, plus one above 30 degrees.
+
+        Args:
+            environment (Environment): The environment in which the organisms are living.
+
+        Returns:
+            np.ndarray: The fitness vector, also stored on ``self.fitness``.
+        """
+        self.fitness = popcount(self.genomes).astype(np.float64)
+        if environment and environment.temperature > 30:
+            self.fitness += 1
+        return self.fitness
+
+    def calculate_traits(self) -> Dict[str, np.ndarray]:
+        """
+        Calculates the traits of every organism from the share of ones in its DNA sequence.
+
+        Returns:
+            Dict[str, np.ndarray]: The heat_tolerance and camouflage of each organism.
+        """
+        share = popcount(self.genomes) / self.lengths
+        return {"heat_tolerance": share, "camouflage": share}
+
+    def decrease_lifespan(self) -> None:
+        """
+        Decreases the lifespan of every living organism by 1.
+        """
+        np.subtract(self.lifespans, 1, out=self.lifespans, where=self.lifespans > 0)
+
+    def alive(self) -> 'PopulationArray':
+        """
+        Returns the organisms whose lifespan has not run out.
+        """
+        return self.take(self.lifespans > 0)
+
+    def reproduce(self, mothers: np.ndarray, fathers: np.ndarray, rng: np.random.Generator,
+                  crossover: Union[str, Crossover] = 'uniform') -> 'PopulationArray':
+        """
+        Creates one offspring per (mother, father) pair, building every child of the batch at once.
+
+        Args:
+            mothers (np.ndarray): The positions of the first parent of every child.
+            fathers (np.ndarray): The positions of the second parent of every child.
+            rng (np.random.Generator): The random generator to draw from.
+            crossover (Union[str, Crossover], optional): The crossover operator. Defaults to 'uniform'.
+
+        Returns:
+            PopulationArray: The offspring, with a fresh lifespan, born where their mother lives and
+            inheriting her mutation rate and species.
+        """
+        child, lengths = get_crossover(crossover)(as_words(self.genomes[mothers]), self.lengths[mothers],
+                                                  as_words(self.genomes[fathers]), self.lengths[fathers],
+                                                  rng, self.max_length)
+        lifespans = np.full(len(mothers), DEFAULT_LIFESPAN, dtype=np.int64)
+        positions = None if self.positions is None else self.positions[mothers]
+        rates = None if self.rates is None else self.rates[mothers]
+        species = None if self.species is None else self.species[mothers]
+        return PopulationArray(child.view(np.uint8), lengths, lifespans, self.max_length, positions=positions,
+                               rates=rates, species=species)
+
+    def mutate(self, rng: np.random.Generator) -> None:
+        """
+        Applies one random mutation to every organism.
+
+        Args:
+            rng (np.random.Generator): The random generator to draw from.
+        """
+        self.lengths = mutate_packed(self.genomes, self.lengths, rng, self.max_length)
+
+    def next_generation(self, rng: np.random.Generator, mothers: Union[str, Selection] = 'fittest',
+                        fathers: Union[str, Selection] = 'uniform', elites: int = 0,
+                        crossover: Union[str, Crossover] = 'uniform', size: Optional[int] = None) -> 'PopulationArray':
+        """
+        Generates the next generation by breeding selected parents and carrying over the elite.
+
+        The defaults breed the fittest organism with random partners, as ``next_generation`` does.
+
+        Args:
+            rng (np.random.Generator): The random generator to draw from.
+            mothers (Union[str, Selection], optional): The selection operator for the first parents.
+                Defaults to 'fittest'.
+            fathers (Union[str, Selection], optional): The selection operator for the second parents.
+                Defaults to 'uniform'.
+            elites (int, optional): The number of fittest organisms copied over unchanged. Defaults to 0.
+            crossover (Union[str, Crossover], optional): The crossover operator. Defaults to 'uniform'.
+            size (int, optional): The number of organisms in the next generation. Defaults to the current size.
+
+        Returns:
+            PopulationArray: The next generation of organisms, empty if this one has died out.
+        """
+        size = len(self) if size is None else size
+        if not len(self):
+            return self
+        elites = min(elites, len(self), size)
+        count = size - elites
+        mother_positions = get_selection(mothers)(self.fitness, count, rng)
+        father_positions = get_selection(fathers)(self.fitness, count, rng)
+        offspring = self.reproduce(mother_positions, father_positions, rng, crossover)
+        offspring.mutate(rng)
+        if elites:
+            offspring = concatenate([self.take(elite(self.fitness, elites)), offspring])
+        return offspring
+
+
+def concatenate(populations: Sequence[PopulationArray]) -> PopulationArray:
+    """
+    Joins several populations sharing the same genome length cap into one.
+
+    Positions, mutation rates, lineage ids and species are kept only if every population has them.
+
+    Args:
+        populations (Sequence[PopulationArray]): The populations to join, in order.
+
+    Returns:
+        PopulationArray: The joined population.
+    """
+    optional = {}
+    for name in ('positions', 'rates', 'ids', 'species'):
+        if all(getattr(population, name) is not None for population in populations):
+            optional[name] = np.concatenate([getattr(population, name) for population in populations])
+    return PopulationArray(np.concatenate([population.genomes for population in populations]),
+                           np.concatenate([population.lengths for population in populations]),
+                           np.concatenate([population.lifespans for population in populations]),
+                           populations[0].max_length,
+                           np.concatenate([population.fitness for population in populations]), **optional)
@@ -0,0 +1,112 @@
+import random
+from typing import List, Sequence, Union
+
+import numpy as np
+
+SeedLike = Union[None, int, Sequence[int], np.random.SeedSequence]
+
+POPULATION_STREAM = 0
+ENVIRONMENT_STREAM = 1
+
+
+class RandomStreams:
+    """
+    Hands out independent, reproducible random streams derived from one root seed.
+
+    A stream is identified by a key path such as ``(run, island)`` rather than by the order in
+    which it was requested, so every worker can derive its own stream locally and the result does
+    not depend on how the work is split across processes.
+    """
+
+    def __init__(self, seed: SeedLike = None) -> None:
+        """
+        Initializes the service from a root seed.
+
+        Args:
+            seed (SeedLike, optional): An integer, a sequence of integers or a SeedSequence.
+                Defaults to fresh entropy from the operating system.
+        """
+        self.root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    @property
+    def entropy(self) -> int:
+        """
+        Returns the root entropy, which reproduces every stream when passed back as the seed.
+        """
+        return self.root.entropy
+
+    def seed_sequence(self, *key: int) -> np.random.SeedSequence:
+        """
+        Returns the seed sequence of the stream identified by ``key``.
+
+        Args:
+            *key (int): The path of the stream below the root, e.g. a run or island number.
+
+        Returns:
+            np.random.SeedSequence: The child seed sequence, picklable for worker processes.
+        """
+        return np.random.SeedSequence(self.root.entropy, spawn_key=self.root.spawn_key + key,
+                                      pool_size=self.root.pool_size)
+
+    def stream(self, *key: int) -> np.random.Generator:
+        """
+        Returns a fresh generator for the stream identified by ``key``.
+
+        Args:
+            *key (int): The path of the stream below the root.
+
+        Returns:
+            np.random.Generator: The generator, always starting from the same state for the same key.
+        """
+        return np.random.Generator(np.random.PCG64(self.seed_sequence(*key)))
+
+    def python_random(self, *key: int) -> random.Random:
+        """
+        Returns a ``random.Random`` seeded from the stream identified by ``key``, for the object-based API.
+
+        Args:
+            *key (int): The path of the stream below the root.
+
+        Returns:
+            random.Random: The seeded generator, usable as the ``rng`` of ``Organism`` methods.
+        """
+        state = self.seed_sequence(*key).generate_state(4, np.uint64)
+        return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+    def child(self, *key: int) -> 'RandomStreams':
+        """
+        Returns the service rooted at the stream identified by ``key``, to hand to a worker.
+
+        Args:
+            *key (int): The path of the child root.
+
+        Returns:
+            RandomStreams: The child service.
+        """
+        return RandomStreams(self.seed_sequence(*key))
+
+    def spawn(self, count: int) -> List[np.random.Generator]:
+        """
+        Returns the generators of streams ``0`` to ``count - 1``.
+
+        Args:
+            count (int): The number of streams.
+
+        Returns:
+            List[np.random.Generator]: One generator per stream.
+        """
+        return [self.stream(index) for index in range(count)]
+
+
+def as_streams(seed: Union[SeedLike, RandomStreams]) -> RandomStreams:
+    """
+    Wraps a seed in a RandomStreams service, passing existing services through.
+
+    Args:
+        seed (Union[SeedLike, RandomStreams]): The seed or service.
+
+    Returns:
+        RandomStreams: The service.
+    """
+    return seed if isinstance(seed, RandomStreams) else RandomStreams(seed)
+
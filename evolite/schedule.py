@@ -0,0 +1,240 @@
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .environment import Environment
+from .rng import ENVIRONMENT_STREAM, RandomStreams, SeedLike, as_streams
+
+
+def bounded_walk(start: int, steps: np.ndarray, low: Optional[int] = None, high: Optional[int] = None) -> np.ndarray:
+    """
+    Accumulates a random walk that stops at its bounds, in one cumulative pass.
+
+    With one bound the walk is the Lindley recursion ``x = max(low, x + step)``, which is the free walk
+    minus its running minimum below the bound; this is exactly the clamping of ``Environment.cycle_day``.
+    With both bounds the free walk is folded back into the range, which reflects it at either end.
+
+    Args:
+        start (int): The value before the first step.
+        steps (np.ndarray): The step of every day.
+        low (int, optional): The lowest value. Defaults to unbounded.
+        high (int, optional): The highest value. Defaults to unbounded.
+
+    Returns:
+        np.ndarray: The walk, ``start`` followed by the value after every step.
+    """
+    walk = np.concatenate([[start], start + np.cumsum(steps)]).astype(np.int64)
+    if low is not None and high is not None:
+        width = high - low
+        if width <= 0:
+            return np.full(len(walk), low, dtype=np.int64)
+        folded = np.mod(walk - low, 2 * width)
+        return low + np.minimum(folded, 2 * width - folded)
+    if low is not None:
+        return walk - np.minimum(0, np.minimum.accumulate(walk - low))
+    if high is not None:
+        return walk - np.maximum(0, np.maximum.accumulate(walk - high))
+    return walk
+
+
+def seasonal(days: int, amplitude: float, period: float, phase: float = 0.0) -> np.ndarray:
+    """
+    Returns a sine cycle rounded to whole degrees, one value per day including day 0.
+
+    Args:
+        days (int): The number of days after day 0.
+        amplitude (float): The largest departure from the walk.
+        period (float): The length of one cycle in days.
+        phase (float, optional): The day the cycle starts rising from zero. Defaults to 0.
+
+    Returns:
+        np.ndarray: The seasonal offset of every day.
+    """
+    day = np.arange(days + 1)
+    return np.rint(amplitude * np.sin(2 * np.pi * (day - phase) / period)).astype(np.int64)
+
+
+def shocks(days: int, rate: float, size: float, length: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws sudden heat waves and cold snaps that hold for ``length`` days, overlapping ones adding up.
+
+    Args:
+        days (int): The number of days after day 0.
+        rate (float): The probability that a shock starts on any day.
+        size (float): The standard deviation of the size of a shock.
+        length (int): The days every shock lasts.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The shock offset of every day; day 0 has none.
+
+    Raises:
+        ValueError: If shocks would last less than one day.
+    """
+    if length < 1:
+        raise ValueError(f"Shocks must last at least one day, not {length}")
+    starts = np.concatenate([[False], rng.random(days) < rate])
+    sizes = np.where(starts, np.rint(rng.normal(0.0, size, days + 1)), 0).astype(np.int64)
+    held = np.cumsum(sizes)
+    held[length:] -= held[:-length].copy()
+    return held
+
+
+class EnvironmentSchedule(Environment):
+    """
+    Replays a precomputed trajectory of temperature, food and predators, one day per generation.
+
+    A schedule is an ``Environment`` whose state is read from lookup tables at the current ``day``, so it
+    can be passed to ``Simulation`` in place of one: fitness functions, survival and summaries read it as
+    usual, while ``cycle_day`` only advances the day and draws nothing. Generating the whole trajectory
+    up front lets many runs share one climate, and ``replay`` hands each run its own cursor over the same
+    tables. A schedule of ``days`` days serves runs of up to ``days`` generations.
+    """
+
+    def __init__(self, temperature: np.ndarray, food: np.ndarray, predators: np.ndarray, day: int = 0) -> None:
+        """
+        Initializes an EnvironmentSchedule from its lookup tables.
+
+        Args:
+            temperature (np.ndarray): The temperature of every day, day 0 first.
+            food (np.ndarray): The amount of food of every day.
+            predators (np.ndarray): The number of predators of every day.
+            day (int, optional): The current day. Defaults to 0.
+        """
+        if not len(temperature) == len(food) == len(predators):
+            raise ValueError("Every table of a schedule needs one value per day")
+        self.temperatures = np.asarray(temperature, dtype=np.int64)
+        self.food = np.asarray(food, dtype=np.int64)
+        self.predator_numbers = np.asarray(predators, dtype=np.int64)
+        self.day = day
+
+    @classmethod
+    def generate(cls, days: int, seed: Union[SeedLike, RandomStreams] = None,
+                 environment: Optional[Environment] = None, temperature_range: Tuple[Optional[int], ...] = (None, None),
+                 season: Tuple[float, float] = (0.0, 365.0), shock_rate: float = 0.0, shock_size: float = 5.0,
+                 shock_length: int = 5) -> 'EnvironmentSchedule':
+        """
+        Generates a trajectory with the steps of ``Environment.cycle_day``, drawn for every day at once.
+
+        The steps come from the environment stream of ``seed`` in the order ``cycle_day`` draws them, so
+        without season, shocks or temperature bounds the schedule is the climate a ``Simulation`` with the
+        same seed lives through.
+
+        Args:
+            days (int): The number of days after the starting one.
+            seed (Union[SeedLike, RandomStreams], optional): The root seed. Defaults to an unseeded draw.
+            environment (Environment, optional): The starting state. Defaults to 100 food and 5 predators
+                at 25 degrees.
+            temperature_range (Tuple[Optional[int], ...], optional): The lowest and highest temperature of
+                the walk, either may be None. Defaults to unbounded.
+            season (Tuple[float, float], optional): The amplitude and period of the seasonal cycle added to
+                the temperature. Defaults to no season.
+            shock_rate (float, optional): The daily probability of a temperature shock. Defaults to 0.
+            shock_size (float, optional): The standard deviation of a shock in degrees. Defaults to 5.
+            shock_length (int, optional): The days every shock lasts. Defaults to 5.
+
+        Returns:
+            EnvironmentSchedule: The schedule, at day 0.
+        """
+        rng = as_streams(seed).stream(ENVIRONMENT_STREAM)
+        if environment is None:
+            environment = Environment({'food': 100}, {'number': 5})
+        # One row per day of the temperature, food and predator draws of ``cycle_day``
+        draws = rng.integers([0, -10, 0], [2, 11, 2], size=(days, 3))
+        temperature = bounded_walk(environment.temperature, 2 * draws[:, 0] - 1, *temperature_range)
+        amplitude, period = season
+        if amplitude:
+            temperature += seasonal(days, amplitude, period)
+        if shock_rate:
+            temperature += shocks(days, shock_rate, shock_size, shock_length, rng)
+        food = bounded_walk(environment.resources['food'], draws[:, 1], low=0)
+        predators = bounded_walk(environment.predators['number'], 2 * draws[:, 2] - 1, low=0)
+        return cls(temperature, food, predators)
+
+    @classmethod
+    def record(cls, environment: Environment, days: int, rng: np.random.Generator) -> 'EnvironmentSchedule':
+        """
+        Records the trajectory of an environment by cycling a copy of it day by day.
+
+        Args:
+            environment (Environment): The starting state, left unchanged.
+            days (int): The number of days after the starting one.
+            rng (np.random.Generator): The random generator ``cycle_day`` draws from.
+
+        Returns:
+            EnvironmentSchedule: The schedule, at day 0.
+        """
+        copy = Environment(dict(environment.resources), dict(environment.predators), environment.temperature)
+        states = [(copy.temperature, copy.resources['food'], copy.predators['number'])]
+        for _ in range(days):
+            copy.cycle_day(rng)
+            states.append((copy.temperature, copy.resources['food'], copy.predators['number']))
+        return cls(*np.array(states, dtype=np.int64).T)
+
+    @property
+    def days(self) -> int:
+        """
+        Returns the number of days after the starting one.
+        """
+        return len(self.temperatures) - 1
+
+    @property
+    def temperature(self) -> int:
+        return int(self.temperatures[self.day])
+
+    @property
+    def resources(self) -> Dict[str, int]:
+        return {'food': int(self.food[self.day])}
+
+    @property
+    def predators(self) -> Dict[str, int]:
+        return {'number': int(self.predator_numbers[self.day])}
+
+    def tables(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the lookup tables, indexed by day, for fitness functions that read the whole trajectory.
+        """
+        return {'temperature': self.temperatures, 'food': self.food, 'predators': self.predator_numbers}
+
+    def cycle_day(self, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Moves on to the next day of the schedule, drawing nothing.
+
+        Args:
+            rng (np.random.Generator, optional): Ignored; accepted in place of ``Environment.cycle_day``.
+        """
+        if self.day >= self.days:
+            raise IndexError(f"The schedule of {self.days} days has run out")
+        self.day += 1
+
+    def replay(self, day: int = 0) -> 'EnvironmentSchedule':
+        """
+        Returns a schedule over the same tables with its own cursor, for another run.
+
+        Args:
+            day (int, optional): The day to start from. Defaults to 0.
+        """
+        return EnvironmentSchedule(self.temperatures, self.food, self.predator_numbers, day)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the lookup tables to a ``.npz`` file.
+
+        Args:
+            path (str): The output file.
+        """
+        np.savez(path, **self.tables())
+
+
+def load_schedule(path: str) -> EnvironmentSchedule:
+    """
+    Loads a schedule written by ``EnvironmentSchedule.save``, at day 0.
+
+    Args:
+        path (str): The ``.npz`` file.
+
+    Returns:
+        EnvironmentSchedule: The schedule.
+    """
+    with np.load(path) as tables:
+        return EnvironmentSchedule(tables['temperature'], tables['food'], tables['predators'])
@@ -0,0 +1,159 @@
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+Selection = Callable[[np.ndarray, int, np.random.Generator], np.ndarray]
+
+
+def fittest(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects the single fittest organism for every draw, as ``max(population, key=fitness)`` does.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    return np.full(count, int(np.argmax(fitness)))
+
+
+def uniform(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects parents uniformly at random, ignoring fitness, as ``random.choice(population)`` does.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    return rng.integers(0, len(fitness), size=count)
+
+
+def tournament(fitness: np.ndarray, count: int, rng: np.random.Generator, size: int = 2) -> np.ndarray:
+    """
+    Selects the fittest of ``size`` uniformly drawn contestants for every draw.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+        size (int, optional): The number of contestants per tournament. Defaults to 2.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    contestants = rng.integers(0, len(fitness), size=(count, size))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(count), winners]
+
+
+def roulette(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects parents with probability proportional to fitness, by binary search over the cumulative sum.
+
+    Negative fitness is shifted so the least fit organism has weight zero; when every weight is
+    zero the draw falls back to uniform.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    weights = np.asarray(fitness, dtype=np.float64)
+    if len(weights) and weights.min() < 0:
+        weights = weights - weights.min()
+    cumulative = np.cumsum(weights)
+    if not len(cumulative) or cumulative[-1] <= 0:
+        return uniform(fitness, count, rng)
+    picks = np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side='right')
+    return np.minimum(picks, len(cumulative) - 1)
+
+
+def rank(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects parents with probability proportional to their fitness rank, the least fit having rank 1.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    ranks = np.empty(len(fitness))
+    ranks[np.argsort(fitness, kind='stable')] = np.arange(1, len(fitness) + 1)
+    return roulette(ranks, count, rng)
+
+
+def truncation(fitness: np.ndarray, count: int, rng: np.random.Generator, proportion: float = 0.5) -> np.ndarray:
+    """
+    Selects parents uniformly from the fittest ``proportion`` of the population.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of parents to draw.
+        rng (np.random.Generator): The random generator to draw from.
+        proportion (float, optional): The share of the population allowed to breed. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The positions of the selected parents.
+    """
+    keep = elite(fitness, max(1, int(len(fitness) * proportion)))
+    return keep[rng.integers(0, len(keep), size=count)]
+
+
+def elite(fitness: np.ndarray, count: int) -> np.ndarray:
+    """
+    Returns the positions of the ``count`` fittest organisms, fittest first.
+
+    Args:
+        fitness (np.ndarray): The fitness of every organism.
+        count (int): The number of organisms to keep.
+
+    Returns:
+        np.ndarray: The positions of the elite.
+    """
+    count = min(count, len(fitness))
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+    best = np.argpartition(fitness, len(fitness) - count)[len(fitness) - count:]
+    return best[np.argsort(fitness[best], kind='stable')[::-1]]
+
+
+SELECTIONS: Dict[str, Selection] = {
+    'fittest': fittest,
+    'uniform': uniform,
+    'tournament': tournament,
+    'roulette': roulette,
+    'rank': rank,
+    'truncation': truncation,
+}
+
+
+def get_selection(selection: Union[str, Selection]) -> Selection:
+    """
+    Resolves a selection operator by name, passing callables through unchanged.
+
+    Args:
+        selection (Union[str, Selection]): A name from ``SELECTIONS`` or a callable taking
+            ``(fitness, count, rng)`` and returning parent positions.
+
+    Returns:
+        Selection: The selection operator.
+    """
+    if callable(selection):
+        return selection
+    try:
+        return SELECTIONS[selection]
+    except KeyError:
+        raise ValueError(f"Unknown selection {selection!r}, expected one of {sorted(SELECTIONS)}") from None
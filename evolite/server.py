@@ -0,0 +1,521 @@
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .checkpoint import save_checkpoint
+from .convergence import ConvergenceMonitor
+from .core import Simulation
+from .crossover import CROSSOVERS
+from .fitness import FITNESS_FUNCTIONS, FitnessEvaluator
+from .mutation import MutationEngine
+from .selection import SELECTIONS
+from .survival import Survival
+
+# Job states; a job moves from queued to running to one of the final three, or is cancelled while queued
+QUEUED, RUNNING, FINISHED, CANCELLED, FAILED = 'queued', 'running', 'finished', 'cancelled', 'failed'
+FINAL_STATES = (FINISHED, CANCELLED, FAILED)
+
+# Seconds between the batches of summaries a worker sends back, which is also how often it checks for cancellation
+FLUSH_INTERVAL = 0.05
+
+MAX_BODY = 1 << 20
+
+REASONS = {200: 'OK', 201: 'Created', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class JobConfig(NamedTuple):
+    """
+    Describes one simulation run submitted to the job server.
+    """
+
+    generations: int = 100
+    population_size: int = 50
+    dna_length: int = 10
+    seed: Optional[int] = None
+    mothers: str = 'fittest'
+    fathers: str = 'uniform'
+    crossover: str = 'uniform'
+    elites: int = 0
+    fitness: str = 'count_ones'
+    mutation_rate: Optional[float] = None
+    survival: bool = False
+    stopping: Optional[Dict[str, object]] = None
+    checkpoint_every: int = 10
+
+    @classmethod
+    def parse(cls, fields: Dict[str, object]) -> 'JobConfig':
+        """
+        Builds a config from submitted JSON fields, checking every name against the operator registries.
+
+        Args:
+            fields (Dict[str, object]): The fields; missing ones take their defaults.
+
+        Returns:
+            JobConfig: The config.
+        """
+        unknown = sorted(set(fields) - set(cls._fields))
+        if unknown:
+            raise ValueError(f"Unknown config fields {unknown}, expected some of {list(cls._fields)}")
+        config = cls(**fields)
+        if config.stopping is not None:
+            try:
+                ConvergenceMonitor(**config.stopping)
+            except TypeError as error:
+                raise ValueError(f"Invalid stopping rules: {error}") from None
+        for name, registry in (('mothers', SELECTIONS), ('fathers', SELECTIONS), ('crossover', CROSSOVERS),
+                               ('fitness', FITNESS_FUNCTIONS)):
+            if getattr(config, name) not in registry:
+                raise ValueError(f"Unknown {name} {getattr(config, name)!r}, expected one of {sorted(registry)}")
+        for name in ('generations', 'population_size', 'dna_length', 'checkpoint_every'):
+            if not isinstance(getattr(config, name), int) or getattr(config, name) < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        return config
+
+
+def run_job(job_id: str, config: JobConfig, events, cancel, checkpoint: str) -> None:
+    """
+    Runs one job in a worker process, sending its summaries back in batches.
+
+    Every message put on ``events`` is a ``(job_id, kind, payload)`` tuple: 'summaries' with a list of
+    summary dicts, then exactly one 'done' with the final state, sent last so the server sees every
+    summary of a job before it ends.
+
+    Args:
+        job_id (str): The job identifier.
+        config (JobConfig): The run to perform.
+        events: The queue shared with the server.
+        cancel: An event the server sets to stop the run after its current batch.
+        checkpoint (str): The file the run is checkpointed to.
+    """
+    evaluator = FitnessEvaluator(config.fitness, 'vectorized')
+    survival = Survival() if config.survival else None
+    mutation = MutationEngine(config.mutation_rate) if config.mutation_rate is not None else None
+    monitor = ConvergenceMonitor(**config.stopping) if config.stopping else None
+    simulation = Simulation(config.population_size, config.dna_length, config.seed, mothers=config.mothers,
+                            fathers=config.fathers, elites=config.elites, crossover=config.crossover,
+                            fitness=evaluator, survival=survival, mutation=mutation, monitor=monitor)
+    state, batch, flushed = FINISHED, [], time.perf_counter()
+    for summary in simulation.run(config.generations):
+        batch.append(summary._asdict())
+        if summary.generation % config.checkpoint_every == 0:
+            save_checkpoint(simulation, checkpoint)
+        if time.perf_counter() - flushed >= FLUSH_INTERVAL:
+            events.put((job_id, 'summaries', batch))
+            batch, flushed = [], time.perf_counter()
+            if cancel.is_set():
+                state = CANCELLED
+                break
+    if batch:
+        events.put((job_id, 'summaries', batch))
+    save_checkpoint(simulation, checkpoint)
+    events.put((job_id, 'done', {'state': state, 'stop_reason': simulation.stop_reason}))
+
+
+class Job:
+    """
+    Holds the state and the summaries received so far of one submitted run.
+    """
+
+    def __init__(self, job_id: str, owner: str, config: JobConfig, checkpoint: str) -> None:
+        """
+        Initializes a queued job.
+
+        Args:
+            job_id (str): The job identifier.
+            owner (str): The user the job is scheduled for.
+            config (JobConfig): The run to perform.
+            checkpoint (str): The file the run is checkpointed to.
+        """
+        self.id = job_id
+        self.owner = owner
+        self.config = config
+        self.checkpoint = checkpoint
+        self.state = QUEUED
+        self.summaries: List[Dict[str, object]] = []
+        self.stop_reason: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.cancel = None
+        self.changed = asyncio.Event()
+
+    def notify(self) -> None:
+        """
+        Wakes every stream waiting for this job to change.
+        """
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def describe(self, since: Optional[int] = None) -> Dict[str, object]:
+        """
+        Returns the job as JSON fields, with the summaries after generation ``since`` if it is given.
+        """
+        description = {'id': self.id, 'owner': self.owner, 'state': self.state, 'config': self.config._asdict(),
+                       'generations_run': len(self.summaries), 'stop_reason': self.stop_reason, 'error': self.error,
+                       'submitted': self.submitted, 'started': self.started, 'ended': self.ended,
+                       'checkpoint': os.path.exists(self.checkpoint)}
+        if since is not None:
+            description['summaries'] = self.summaries[since:]
+        return description
+
+
+class JobScheduler:
+    """
+    Queues submitted jobs per owner and runs them in a bounded process pool.
+
+    Whenever a worker is free, the next job is taken from the owner with the fewest running jobs, ties
+    going to the owner served longest ago, so one user queueing hundreds of runs cannot starve another
+    who submits one. Workers stream their summaries back through one shared queue, pumped into the
+    event loop by a thread.
+    """
+
+    def __init__(self, workers: Optional[int] = None, directory: Optional[str] = None) -> None:
+        """
+        Initializes a JobScheduler; ``start`` must be called from the event loop before submitting.
+
+        Args:
+            workers (int, optional): The most jobs running at once. Defaults to every core.
+            directory (str, optional): The directory checkpoints are written to. Defaults to a new
+                temporary directory.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.directory = directory or tempfile.mkdtemp(prefix='evolite-jobs-')
+        os.makedirs(self.directory, exist_ok=True)
+        self.jobs: Dict[str, Job] = {}
+        self.queues: Dict[str, Deque[Job]] = {}
+        self.running: Dict[str, int] = {}
+        self.served: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._turns = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._events = None
+        self._pump: Optional[threading.Thread] = None
+        self._closing = False
+
+    def start(self) -> None:
+        """
+        Starts the worker pool and the thread receiving the workers' messages.
+
+        Workers are spawned rather than forked, so a script starting a scheduler must guard its entry point
+        with ``if __name__ == '__main__'``.
+        """
+        self._loop = asyncio.get_running_loop()
+        # Forked workers would inherit the sockets of open connections and keep them from closing
+        context = multiprocessing.get_context('spawn')
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._manager = context.Manager()
+        self._events = self._manager.Queue()
+        self._pump = threading.Thread(target=self._receive, name="evolite-jobs", daemon=True)
+        self._pump.start()
+
+    def close(self) -> None:
+        """
+        Cancels every job and stops the worker pool.
+        """
+        self._closing = True
+        for job in self.jobs.values():
+            if job.cancel is not None:
+                job.cancel.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._events is not None:
+            self._events.put(None)
+            self._pump.join()
+            self._manager.shutdown()
+        self._executor = self._manager = self._events = None
+
+    def submit(self, config: JobConfig, owner: str = 'anonymous') -> Job:
+        """
+        Queues a run and starts it at once if a worker is free.
+
+        Args:
+            config (JobConfig): The run to perform.
+            owner (str, optional): The user the job is scheduled for. Defaults to 'anonymous'.
+
+        Returns:
+            Job: The new job.
+        """
+        job_id = str(next(self._ids))
+        job = Job(job_id, owner, config, os.path.join(self.directory, f"{job_id}.evolite"))
+        self.jobs[job_id] = job
+        self.queues.setdefault(owner, deque()).append(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job: Job) -> None:
+        """
+        Cancels a queued job at once, or asks a running one to stop after its current batch.
+
+        Args:
+            job (Job): The job to cancel; finished jobs are left alone.
+        """
+        if job.state == QUEUED:
+            self.queues[job.owner].remove(job)
+            self._end(job, CANCELLED)
+        elif job.state == RUNNING:
+            job.cancel.set()
+
+    def _next(self) -> Optional[Job]:
+        owners = [owner for owner, queue in self.queues.items() if queue]
+        if not owners:
+            return None
+        owner = min(owners, key=lambda name: (self.running.get(name, 0), self.served.get(name, -1)))
+        self.served[owner] = next(self._turns)
+        return self.queues[owner].popleft()
+
+    def _dispatch(self) -> None:
+        while not self._closing and sum(self.running.values()) < self.workers:
+            job = self._next()
+            if job is None:
+                return
+            job.state, job.started, job.cancel = RUNNING, time.time(), self._manager.Event()
+            self.running[job.owner] = self.running.get(job.owner, 0) + 1
+            future = self._executor.submit(run_job, job.id, job.config, self._events, job.cancel, job.checkpoint)
+            future.add_done_callback(lambda done, job=job: self._loop.call_soon_threadsafe(self._failed, job, done))
+            job.notify()
+
+    def _receive(self) -> None:
+        while True:
+            message = self._events.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._deliver, *message)
+
+    def _deliver(self, job_id: str, kind: str, payload) -> None:
+        job = self.jobs[job_id]
+        if job.state in FINAL_STATES:
+            return
+        if kind == 'summaries':
+            job.summaries.extend(payload)
+            job.notify()
+        else:
+            job.stop_reason = payload['stop_reason']
+            self._end(job, payload['state'])
+
+    def _failed(self, job: Job, future) -> None:
+        # A worker that returned normally has already sent 'done'; only errors are handled here
+        error = None if future.cancelled() else future.exception()
+        if job.state in FINAL_STATES:
+            return
+        if future.cancelled():
+            self._end(job, CANCELLED)
+        elif error is not None:
+            job.error = repr(error)
+            self._end(job, FAILED)
+
+    def _end(self, job: Job, state: str) -> None:
+        if job.state == RUNNING:
+            self.running[job.owner] -= 1
+        job.state, job.ended, job.cancel = state, time.time(), None
+        job.notify()
+        self._dispatch()
+
+
+class JobServer:
+    """
+    Serves a ``JobScheduler`` over HTTP/1.1 with plain asyncio streams, so it needs no web framework.
+
+    Routes, all JSON unless noted:
+
+    - ``POST /jobs`` submits ``{"owner": ..., "config": {...}}`` and returns the job.
+    - ``GET /jobs`` lists every job without its summaries.
+    - ``GET /jobs/<id>?since=N`` returns the job with its summaries after generation N, for polling.
+    - ``GET /jobs/<id>/events`` streams the summaries as Server-Sent Events, one 'generation' event per
+      summary and an 'end' event, resuming after the ``Last-Event-ID`` header or ``since`` parameter.
+    - ``POST /jobs/<id>/cancel`` or ``DELETE /jobs/<id>`` cancels the job.
+    - ``GET /jobs/<id>/checkpoint`` downloads the latest checkpoint, loadable with ``load_checkpoint``.
+    """
+
+    def __init__(self, scheduler: JobScheduler, host: str = '127.0.0.1', port: int = 8765) -> None:
+        """
+        Initializes a JobServer.
+
+        Args:
+            scheduler (JobScheduler): The scheduler to expose.
+            host (str, optional): The address to listen on. Defaults to localhost only.
+            port (int, optional): The port to listen on; 0 picks a free one. Defaults to 8765.
+        """
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+        Starts the scheduler and begins accepting connections; ``port`` is updated if it was 0.
+        """
+        self.scheduler.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """
+        Stops accepting connections and shuts the scheduler down.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.scheduler.close)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            await self._route(writer, *request)
+        except ValueError as error:
+            await self._respond(writer, 400, {'error': str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as error:
+            await self._respond(writer, 500, {'error': repr(error)})
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY:
+            raise ValueError(f"Request body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b''
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip('/') or '/', parse_qs(url.query), headers, body
+
+    async def _route(self, writer: asyncio.StreamWriter, method: str, path: str, query: Dict,
+                     headers: Dict[str, str], body: bytes) -> None:
+        if method == 'OPTIONS':
+            await self._respond(writer, 204, None)
+            return
+        parts = path.strip('/').split('/')
+        if parts[0] != 'jobs':
+            await self._respond(writer, 404, {'error': f"No route {path}"})
+            return
+        if len(parts) == 1:
+            if method == 'GET':
+                await self._respond(writer, 200, [job.describe() for job in self.scheduler.jobs.values()])
+            elif method == 'POST':
+                fields = json.loads(body or b'{}')
+                if not isinstance(fields, dict):
+                    raise ValueError("Expected a JSON object")
+                config = JobConfig.parse(fields.get('config', {}))
+                job = self.scheduler.submit(config, str(fields.get('owner', 'anonymous')))
+                await self._respond(writer, 201, job.describe())
+            else:
+                await self._respond(writer, 405, {'error': f"{method} not allowed on {path}"})
+            return
+
+        job = self.scheduler.jobs.get(parts[1])
+        action = parts[2] if len(parts) > 2 else None
+        if job is None or len(parts) > 3:
+            await self._respond(writer, 404, {'error': f"No job at {path}"})
+        elif (method, action) in (('POST', 'cancel'), ('DELETE', None)):
+            self.scheduler.cancel(job)
+            await self._respond(writer, 202, job.describe())
+        elif method != 'GET':
+            await self._respond(writer, 405, {'error': f"{method} not allowed on {path}"})
+        elif action is None:
+            await self._respond(writer, 200, job.describe(int(query.get('since', ['0'])[0])))
+        elif action == 'events':
+            since = int(headers.get('last-event-id', query.get('since', ['0'])[0]))
+            await self._stream(writer, job, since)
+        elif action == 'checkpoint':
+            await self._send_checkpoint(writer, job)
+        else:
+            await self._respond(writer, 404, {'error': f"No route {path}"})
+
+    async def _stream(self, writer: asyncio.StreamWriter, job: Job, since: int) -> None:
+        writer.write(self._head(200, 'text/event-stream', extra={'Cache-Control': 'no-cache'}))
+        position = max(0, since)
+        while True:
+            changed = job.changed
+            if position < len(job.summaries):
+                chunks = [f"id: {summary['generation']}\nevent: generation\ndata: {json.dumps(summary)}\n\n"
+                          for summary in job.summaries[position:]]
+                position = len(job.summaries)
+                writer.write(''.join(chunks).encode('utf-8'))
+                await writer.drain()
+            if job.state in FINAL_STATES:
+                end = json.dumps({'state': job.state, 'stop_reason': job.stop_reason, 'error': job.error})
+                writer.write(f"event: end\ndata: {end}\n\n".encode('utf-8'))
+                await writer.drain()
+                return
+            await changed.wait()
+
+    async def _send_checkpoint(self, writer: asyncio.StreamWriter, job: Job) -> None:
+        if not os.path.exists(job.checkpoint):
+            await self._respond(writer, 404, {'error': f"Job {job.id} has no checkpoint yet"})
+            return
+        # Checkpoints are replaced atomically, so the file read is always a complete one
+        with open(job.checkpoint, 'rb') as checkpoint:
+            data = await asyncio.get_running_loop().run_in_executor(None, checkpoint.read)
+        writer.write(self._head(200, 'application/octet-stream', len(data),
+                                {'Content-Disposition': f'attachment; filename="{job.id}.evolite"'}) + data)
+        await writer.drain()
+
+    @staticmethod
+    def _head(status: int, content_type: Optional[str], length: Optional[int] = None,
+              extra: Optional[Dict[str, str]] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Connection: close",
+                 "Access-Control-Allow-Origin: *", "Access-Control-Allow-Methods: GET, POST, DELETE, OPTIONS",
+                 "Access-Control-Allow-Headers: Content-Type, Last-Event-ID"]
+        if content_type is not None:
+            lines.append(f"Content-Type: {content_type}")
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: object) -> None:
+        if payload is None:
+            writer.write(self._head(status, None, 0))
+        else:
+            data = json.dumps(payload).encode('utf-8')
+            writer.write(self._head(status, 'application/json', len(data)) + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, workers: Optional[int] = None,
+                directory: Optional[str] = None) -> None:
+    """
+    Runs the job server until it is cancelled.
+
+    Args:
+        host (str, optional): The address to listen on. Defaults to localhost only.
+        port (int, optional): The port to listen on. Defaults to 8765.
+        workers (int, optional): The most jobs running at once. Defaults to every core.
+        directory (str, optional): The directory checkpoints are written to. Defaults to a new temporary
+            directory.
+    """
+    server = JobServer(JobScheduler(workers, directory), host, port)
+    await server.start()
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
@@ -0,0 +1,220 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .bits import popcount
+from .environment import Environment
+from .fitness import count_ones, register_fitness
+from .population import PopulationArray
+
+
+def laplacian(field: np.ndarray) -> np.ndarray:
+    """
+    Returns the five-point Laplacian of a grid, wrapping around its edges.
+
+    Args:
+        field (np.ndarray): The (height, width) grid.
+
+    Returns:
+        np.ndarray: The sum of the four neighbours minus four times every patch.
+    """
+    return (np.roll(field, 1, axis=0) + np.roll(field, -1, axis=0) + np.roll(field, 1, axis=1)
+            + np.roll(field, -1, axis=1) - 4 * field)
+
+
+def neighbourhood_sum(field: np.ndarray, radius: int = 1) -> np.ndarray:
+    """
+    Returns the sum of every square neighbourhood of a grid, wrapping around its edges.
+
+    The box is summed one axis at a time, so the cost grows with the radius rather than its square.
+
+    Args:
+        field (np.ndarray): The (height, width) grid.
+        radius (int, optional): The number of patches on each side of the centre. Defaults to 1.
+
+    Returns:
+        np.ndarray: The neighbourhood sums, with the same shape as the grid.
+    """
+    rows = field.copy()
+    for offset in range(1, radius + 1):
+        rows += np.roll(field, offset, axis=0) + np.roll(field, -offset, axis=0)
+    total = rows.copy()
+    for offset in range(1, radius + 1):
+        total += np.roll(rows, offset, axis=1) + np.roll(rows, -offset, axis=1)
+    return total
+
+
+class SpatialEnvironment(Environment):
+    """
+    Represents an environment made of a wrapping 2-D grid of patches, each with its own temperature,
+    food and predators.
+
+    The fields are updated each day with array stencils: food regrows logistically, is grazed by the
+    organisms on each patch and diffuses to the neighbouring patches, and predators breed where prey are
+    dense, crowd each other out, die off and spread. The scalar ``temperature``, ``resources['food']``
+    and ``predators['number']`` of ``Environment`` hold the grid mean temperature and the food and
+    predator totals, so summaries and global fitness functions keep working.
+    """
+
+    def __init__(self, temperature: np.ndarray, food: np.ndarray, predators: np.ndarray, diffusion: float = 0.1,
+                 predator_diffusion: float = 0.2, heat_diffusion: float = 0.05, regrowth: float = 0.1,
+                 capacity: Optional[float] = None, consumption: float = 1.0, predator_birth: float = 0.2,
+                 predator_death: float = 0.05, predator_capacity: float = 10.0, dispersal: int = 1,
+                 radius: int = 1) -> None:
+        """
+        Initializes a SpatialEnvironment from its starting fields.
+
+        Args:
+            temperature (np.ndarray): The (height, width) temperature of every patch.
+            food (np.ndarray): The food on every patch.
+            predators (np.ndarray): The predators on every patch.
+            diffusion (float, optional): The share of the food gradient that flows to neighbours each day;
+                at most 0.25 keeps the stencil stable. Defaults to 0.1.
+            predator_diffusion (float, optional): The same share for predators. Defaults to 0.2.
+            heat_diffusion (float, optional): The same share for temperature. Defaults to 0.05.
+            regrowth (float, optional): The logistic growth rate of the food. Defaults to 0.1.
+            capacity (float, optional): The most food a patch can hold. Defaults to the starting maximum.
+            consumption (float, optional): The food one organism eats per day. Defaults to 1.0.
+            predator_birth (float, optional): The most births per predator and day, approached where prey
+                are dense. Defaults to 0.2.
+            predator_death (float, optional): The share of predators dying each day. Defaults to 0.05.
+            predator_capacity (float, optional): The most predators a patch can hold. Defaults to 10.0.
+            dispersal (int, optional): The furthest an organism moves along each axis per generation.
+                Defaults to 1.
+            radius (int, optional): The radius of the neighbourhood organisms compete for food in.
+                Defaults to 1.
+        """
+        self.temperature_field = np.asarray(temperature, dtype=np.float32).copy()
+        self.food_field = np.asarray(food, dtype=np.float32).copy()
+        self.predator_field = np.asarray(predators, dtype=np.float32).copy()
+        self.diffusion = diffusion
+        self.predator_diffusion = predator_diffusion
+        self.heat_diffusion = heat_diffusion
+        self.regrowth = regrowth
+        self.capacity = float(self.food_field.max()) if capacity is None else capacity
+        self.consumption = consumption
+        self.predator_birth = predator_birth
+        self.predator_death = predator_death
+        self.predator_capacity = predator_capacity
+        self.dispersal = dispersal
+        self.radius = radius
+        self.density = np.zeros(self.shape, dtype=np.float32)
+        super().__init__({}, {})
+        self._aggregate()
+
+    @classmethod
+    def uniform(cls, height: int, width: int, temperature: float = 25, food: float = 100, predators: float = 5,
+                **parameters) -> 'SpatialEnvironment':
+        """
+        Creates a grid whose patches all start in the same state.
+
+        Args:
+            height (int): The number of rows of patches.
+            width (int): The number of columns of patches.
+            temperature (float, optional): The temperature of every patch. Defaults to 25.
+            food (float, optional): The food on every patch, also the default capacity. Defaults to 100.
+            predators (float, optional): The predators on every patch. Defaults to 5.
+            **parameters: The dynamics parameters of ``SpatialEnvironment``.
+
+        Returns:
+            SpatialEnvironment: The environment.
+        """
+        shape = (height, width)
+        return cls(np.full(shape, temperature), np.full(shape, food), np.full(shape, predators), **parameters)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Returns the (height, width) of the grid.
+        """
+        return self.food_field.shape
+
+    def _aggregate(self) -> None:
+        self.temperature = int(round(float(self.temperature_field.mean())))
+        self.resources['food'] = int(self.food_field.sum(dtype=np.float64))
+        self.predators['number'] = int(round(float(self.predator_field.sum(dtype=np.float64))))
+
+    def settle(self, population: PopulationArray, rng: np.random.Generator) -> None:
+        """
+        Moves every organism to a random patch within ``dispersal`` of where it was born and counts the
+        organisms on every patch.
+
+        Organisms without positions are scattered uniformly over the grid.
+
+        Args:
+            population (PopulationArray): The organisms of the new generation; their positions are updated.
+            rng (np.random.Generator): The random generator to draw from.
+        """
+        height, width = self.shape
+        if population.positions is None or len(population.positions) != len(population):
+            population.positions = rng.integers(0, height * width, size=len(population))
+        elif self.dispersal:
+            moves = rng.integers(-self.dispersal, self.dispersal + 1, size=(2, len(population)))
+            rows = (population.positions // width + moves[0]) % height
+            columns = (population.positions % width + moves[1]) % width
+            population.positions = rows * width + columns
+        counts = np.bincount(population.positions, minlength=height * width)
+        self.density = counts.reshape(self.shape).astype(np.float32)
+
+    def resource_share(self) -> np.ndarray:
+        """
+        Returns the share of its daily food an organism on every patch can find in its neighbourhood.
+
+        Returns:
+            np.ndarray: The (height, width) share, between 0 and 1.
+        """
+        demand = self.consumption * neighbourhood_sum(self.density, self.radius)
+        supply = neighbourhood_sum(self.food_field, self.radius)
+        return np.minimum(1, supply / np.maximum(demand, self.consumption))
+
+    def cycle_day(self, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Cycles a day on every patch at once, updating the temperature, food and predator fields.
+
+        Args:
+            rng (np.random.Generator, optional): The random generator to draw from.
+                Defaults to a fresh unseeded generator.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        # The weather moves the whole grid by one degree, then heat evens out between neighbours
+        self.temperature_field += 2 * int(rng.integers(0, 2)) - 1
+        self.temperature_field += self.heat_diffusion * laplacian(self.temperature_field)
+
+        food, predators = self.food_field, self.predator_field
+        grazing = np.minimum(food, self.consumption * self.density)
+        food += self.regrowth * food * (1 - food / self.capacity) - grazing
+        food += self.diffusion * laplacian(food)
+        np.maximum(food, 0, out=food)
+
+        # Births saturate with the prey on the patch and are capped logistically by the patch capacity
+        hunting = self.density / (1 + self.density) - predators / self.predator_capacity
+        predators += (self.predator_birth * hunting - self.predator_death) * predators
+        predators += self.predator_diffusion * laplacian(predators)
+        np.maximum(predators, 0, out=predators)
+        self._aggregate()
+
+
+@register_fitness('spatial')
+def spatial_fitness(population: PopulationArray, environment: Environment) -> np.ndarray:
+    """
+    Scores each organism by its number of ones, scaled by the share of food its neighbourhood can give it,
+    plus one where its patch is above 30 degrees.
+
+    Organisms competing for the same food score lower, so fitness depends on local density. The score
+    depends on positions, so it must not be wrapped in a ``FitnessCache``. Outside a spatial environment
+    it falls back to ``count_ones``.
+
+    Args:
+        population (PopulationArray): The organisms to score.
+        environment (Environment): The environment in which the organisms are living.
+
+    Returns:
+        np.ndarray: The fitness vector.
+    """
+    if not isinstance(environment, SpatialEnvironment) or population.positions is None:
+        return count_ones(population, environment)
+    positions = population.positions
+    share = environment.resource_share().ravel()[positions]
+    hot = environment.temperature_field.ravel()[positions] > 30
+    return popcount(population.genomes) * share + hot
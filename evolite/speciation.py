@@ -0,0 +1,245 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .bits import as_words, popcount
+from .population import PopulationArray
+from .selection import get_selection
+
+if TYPE_CHECKING:
+    from .pipeline import GenerationState
+
+# The species of an organism that belongs to none yet
+NO_SPECIES = -1
+
+
+def distances(genomes: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Counts the genes that differ between two packed genome matrices, row by row.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix.
+        others (np.ndarray): A packed genome matrix of the same shape.
+
+    Returns:
+        np.ndarray: The Hamming distance of every pair of rows.
+    """
+    return popcount((as_words(genomes) ^ as_words(others)).view(np.uint8))
+
+
+def largest_remainder(weights: np.ndarray, total: int) -> np.ndarray:
+    """
+    Splits a whole number into parts proportional to the weights, without drawing random numbers.
+
+    Args:
+        weights (np.ndarray): The non-negative weight of every part; all zeros weighs the parts equally.
+        total (int): The number to split.
+
+    Returns:
+        np.ndarray: The parts, summing to ``total``.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.sum() <= 0:
+        weights = np.ones(len(weights))
+    exact = total * weights / weights.sum()
+    parts = np.floor(exact).astype(np.int64)
+    remainder = total - int(parts.sum())
+    if remainder:
+        parts[np.argsort(parts - exact, kind='stable')[:remainder]] += 1
+    return parts
+
+
+class Speciation:
+    """
+    Splits the population into species of similar genomes, shares fitness within each species and
+    mates organisms within their species, so several niches survive side by side.
+
+    Every species keeps a representative genome. Bit-sampling LSH indexes the representatives: each
+    band reads ``bits`` fixed gene positions, and two genomes within a small Hamming distance agree on a
+    band with high probability. An organism is first checked against its own species, inherited from its
+    mother, so only the organisms that drifted away are looked up in the index. The index holds one entry
+    per species and persists across generations, so a generation costs O(n) rather than the O(n^2) of
+    pairwise fitness sharing, and species keep their ids while they live.
+
+    Offspring are divided between species in proportion to their mean fitness, which is explicit fitness
+    sharing: every organism's fitness is divided by the size of its species. Mothers are chosen within
+    each species by the simulation's mother operator, and fathers uniformly from the mother's species.
+    """
+
+    def __init__(self, threshold: float = 0.2, bands: int = 4, bits: int = 8, interspecies: float = 0.0,
+                 seed: Optional[int] = 0) -> None:
+        """
+        Initializes a Speciation.
+
+        Args:
+            threshold (float, optional): The largest distance from a species' representative, per gene of
+                the longer genome, at which an organism belongs to it. Defaults to 0.2.
+            bands (int, optional): The number of LSH bands a genome can match a species on. Defaults to 4.
+            bits (int, optional): The gene positions sampled per band; more make buckets tighter.
+                Defaults to 8.
+            interspecies (float, optional): The probability that a father is drawn from the whole
+                population by the simulation's father operator instead. Defaults to 0.0.
+            seed (int, optional): The seed of the sampled gene positions, kept apart from the simulation's
+                streams. Defaults to 0.
+        """
+        self.threshold = threshold
+        self.bands = bands
+        self.bits = bits
+        self.interspecies = interspecies
+        self.seed = seed
+        self.samples: Optional[np.ndarray] = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.genomes = np.empty((0, 0), dtype=np.uint8)
+        self.lengths = np.empty(0, dtype=np.int64)
+        self.keys = np.empty((0, bands), dtype=np.int64)
+        self.sizes = np.empty(0, dtype=np.int64)
+        self.next_species = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def band_keys(self, genomes: np.ndarray) -> np.ndarray:
+        """
+        Hashes packed genomes into one key per band from their sampled gene positions.
+
+        Args:
+            genomes (np.ndarray): The packed ``uint8`` genome matrix.
+
+        Returns:
+            np.ndarray: The (genomes, bands) keys.
+        """
+        samples = self.samples
+        genes = (genomes[:, samples >> 3] >> (samples & 7).astype(np.uint8)) & 1
+        return genes.astype(np.int64) @ (1 << np.arange(self.bits, dtype=np.int64))
+
+    def _within(self, population: PopulationArray, rows: np.ndarray, species: np.ndarray) -> np.ndarray:
+        # Whether the organisms at ``rows`` are close enough to the representatives at ``species``
+        apart = distances(population.genomes[rows], self.genomes[species])
+        return apart <= self.threshold * np.maximum(population.lengths[rows], self.lengths[species])
+
+    def _lookup(self, population: PopulationArray, rows: np.ndarray) -> np.ndarray:
+        # The nearest representative sharing a band key with each organism and close enough, or -1
+        keys = self.band_keys(population.genomes[rows])
+        best = np.full(len(rows), NO_SPECIES, dtype=np.int64)
+        nearest = np.full(len(rows), np.inf)
+        for band in range(self.bands):
+            order = np.argsort(self.keys[:, band], kind='stable')
+            sorted_keys = self.keys[order, band]
+            found = np.minimum(np.searchsorted(sorted_keys, keys[:, band]), len(order) - 1)
+            hit = np.flatnonzero(sorted_keys[found] == keys[:, band])
+            candidates = order[found[hit]]
+            apart = distances(population.genomes[rows[hit]], self.genomes[candidates]).astype(np.float64)
+            limit = self.threshold * np.maximum(population.lengths[rows[hit]], self.lengths[candidates])
+            better = (apart <= limit) & (apart < nearest[hit])
+            best[hit[better]], nearest[hit[better]] = candidates[better], apart[better]
+        return best
+
+    def _widen(self, width: int) -> None:
+        if width > self.genomes.shape[1]:
+            self.genomes = np.pad(self.genomes, ((0, 0), (0, width - self.genomes.shape[1])))
+
+    def assign(self, population: PopulationArray) -> np.ndarray:
+        """
+        Places every organism in a species, founds species for the rest and drops the extinct ones.
+
+        Organisms keep the species in their ``species`` column while they stay within the threshold of
+        its representative. The others join the nearest species they share a band with, and those left
+        over found one new species per distinct first-band key. Afterwards the fittest member of every
+        species becomes its representative for the next generation.
+
+        Args:
+            population (PopulationArray): The organisms, whose ``species`` are set.
+
+        Returns:
+            np.ndarray: The species id of every organism.
+        """
+        if self.samples is None:
+            rng = np.random.default_rng(self.seed)
+            self.samples = rng.integers(0, population.max_length, size=(self.bands, self.bits))
+        self._widen(population.genomes.shape[1])
+        genomes = population.genomes
+        if genomes.shape[1] < self.genomes.shape[1]:
+            genomes = np.pad(genomes, ((0, 0), (0, self.genomes.shape[1] - genomes.shape[1])))
+        padded = PopulationArray(genomes, population.lengths, population.lifespans, population.max_length)
+
+        # Rows into the representative arrays; inherited species that died out count as none
+        rows = np.full(len(population), NO_SPECIES, dtype=np.int64)
+        if population.species is not None and len(self.ids):
+            found = np.minimum(np.searchsorted(self.ids, population.species), len(self.ids) - 1)
+            known = self.ids[found] == population.species
+            rows[known] = found[known]
+        kept = np.flatnonzero(rows != NO_SPECIES)
+        rows[kept[~self._within(padded, kept, rows[kept])]] = NO_SPECIES
+
+        lost = np.flatnonzero(rows == NO_SPECIES)
+        if len(lost) and len(self.ids):
+            rows[lost] = self._lookup(padded, lost)
+
+        founders = np.flatnonzero(rows == NO_SPECIES)
+        if len(founders):
+            keys = self.band_keys(genomes[founders])
+            buckets, first, bucket = np.unique(keys[:, 0], return_index=True, return_inverse=True)
+            rows[founders] = len(self.ids) + bucket.reshape(-1)
+            self.ids = np.concatenate([self.ids, self.next_species + np.arange(len(buckets))])
+            self.genomes = np.concatenate([self.genomes, genomes[founders[first]]])
+            self.lengths = np.concatenate([self.lengths, population.lengths[founders[first]]])
+            self.keys = np.concatenate([self.keys, keys[first]])
+            self.next_species += len(buckets)
+
+        # Drop extinct species and re-centre the others on their fittest member
+        self.sizes = np.bincount(rows, minlength=len(self.ids))
+        order = np.lexsort((-population.fitness, rows))
+        heads = order[np.concatenate([[True], rows[order][1:] != rows[order][:-1]])] if len(order) else order
+        living = np.flatnonzero(self.sizes)
+        remap = np.cumsum(self.sizes > 0) - 1
+        self.ids, self.sizes = self.ids[living], self.sizes[living]
+        self.genomes, self.lengths = genomes[heads], population.lengths[heads]
+        self.keys = self.band_keys(self.genomes)
+        population.species = self.ids[remap[rows]]
+        return population.species
+
+    def shared_fitness(self, population: PopulationArray) -> np.ndarray:
+        """
+        Divides the fitness of every organism by the size of its species.
+
+        Args:
+            population (PopulationArray): The organisms, already assigned.
+
+        Returns:
+            np.ndarray: The shared fitness.
+        """
+        rows = np.searchsorted(self.ids, population.species)
+        return population.fitness / self.sizes[rows]
+
+    def select(self, state: 'GenerationState') -> None:
+        """
+        Draws the mother and father of every child within species; usable in place of the 'select' stage.
+
+        Args:
+            state (GenerationState): The generation, whose parents are already assigned.
+        """
+        simulation, parents, rng = state.simulation, state.parents, state.simulation.rng
+        if not len(parents):
+            return
+        size = len(parents) if state.size is None else state.size
+        state.elites = min(simulation.elites, len(parents), size)
+        count = size - state.elites
+        rows = np.searchsorted(self.ids, parents.species)
+        sizes = self.sizes
+        order = np.argsort(rows, kind='stable')
+        starts = np.cumsum(sizes) - sizes
+        means = np.bincount(rows, weights=parents.fitness, minlength=len(sizes)) / sizes
+        quotas = largest_remainder(means - min(0.0, means.min()), count)
+
+        select_mothers = get_selection(simulation.mothers)
+        mothers = [np.empty(0, dtype=np.int64)]
+        for row in np.flatnonzero(quotas):
+            members = order[starts[row]:starts[row] + sizes[row]]
+            mothers.append(members[select_mothers(parents.fitness[members], int(quotas[row]), rng)])
+        state.mothers = np.concatenate(mothers)
+
+        species = rows[state.mothers]
+        state.fathers = order[starts[species] + (rng.random(count) * sizes[species]).astype(np.int64)]
+        if self.interspecies:
+            outside = np.flatnonzero(rng.random(count) < self.interspecies)
+            state.fathers[outside] = get_selection(simulation.fathers)(parents.fitness, len(outside), rng)
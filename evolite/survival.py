@@ -0,0 +1,98 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .environment import Environment
+from .population import PopulationArray
+from .spatial import SpatialEnvironment
+
+
+class Survival:
+    """
+    Culls a generation by food-limited starvation and camouflage-dependent predation, and sets how many
+    offspring the survivors leave.
+
+    Every organism finds a share of the food it needs; that share is its chance of not starving, so a
+    population above the food's carrying capacity shrinks towards it. Predators then hunt with a
+    saturating (Holling type II) response: the hazard of each organism grows with the predators around it,
+    falls as prey become plentiful, and is scaled by one minus its camouflage trait. Both draws are made
+    for the whole population at once.
+    """
+
+    def __init__(self, consumption: float = 1.0, attack: float = 0.05, handling: float = 0.1,
+                 fecundity: float = 2.0, max_size: Optional[int] = None) -> None:
+        """
+        Initializes the stage.
+
+        Args:
+            consumption (float, optional): The food one organism needs per day. Defaults to 1.0.
+            attack (float, optional): The rate at which one predator finds a given prey. Defaults to 0.05.
+            handling (float, optional): The time a predator spends on each kill, which caps how many prey
+                it can take per day. Defaults to 0.1.
+            fecundity (float, optional): The offspring per survivor. Defaults to 2.0.
+            max_size (int, optional): The largest population allowed. Defaults to no limit.
+        """
+        self.consumption = consumption
+        self.attack = attack
+        self.handling = handling
+        self.fecundity = fecundity
+        self.max_size = max_size
+
+    def pressures(self, population: PopulationArray, environment: Environment) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the food share and the predators faced by every organism.
+
+        In a spatial environment both come from the organism's own neighbourhood; otherwise every organism
+        shares the global food and predators.
+
+        Args:
+            population (PopulationArray): The organisms.
+            environment (Environment): The environment in which the organisms are living.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The share of its food each organism finds, between 0 and 1, and
+            the predators per prey it competes with.
+        """
+        if isinstance(environment, SpatialEnvironment) and population.positions is not None:
+            positions = population.positions
+            share = environment.resource_share().ravel()[positions]
+            predators = environment.predator_field.ravel()[positions]
+            prey = environment.density.ravel()[positions]
+            return share, predators / (1 + self.attack * self.handling * prey)
+        size = len(population)
+        share = min(1.0, environment.resources['food'] / max(self.consumption * size, self.consumption))
+        predators = environment.predators['number'] / (1 + self.attack * self.handling * size)
+        return np.full(size, share), np.full(size, predators)
+
+    def __call__(self, population: PopulationArray, environment: Environment,
+                 rng: np.random.Generator) -> PopulationArray:
+        """
+        Returns the organisms that neither starve nor are eaten today.
+
+        Args:
+            population (PopulationArray): The evaluated organisms.
+            environment (Environment): The environment in which the organisms are living.
+            rng (np.random.Generator): The random generator to draw from.
+
+        Returns:
+            PopulationArray: The survivors, with their fitness.
+        """
+        if not len(population):
+            return population
+        share, predators = self.pressures(population, environment)
+        camouflage = population.calculate_traits()['camouflage']
+        escape = np.exp(-self.attack * predators * (1 - camouflage))
+        return population.take(rng.random(len(population)) < share * escape)
+
+    def offspring(self, survivors: int) -> int:
+        """
+        Returns the size of the next generation bred by a number of survivors.
+
+        Args:
+            survivors (int): The number of organisms left after the cull.
+
+        Returns:
+            int: The number of organisms in the next generation.
+        """
+        size = int(round(survivors * self.fecundity))
+        return size if self.max_size is None else min(size, self.max_size)
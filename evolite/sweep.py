@@ -0,0 +1,185 @@
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from .convergence import ConvergenceMonitor
+from .core import Simulation
+from .environment import Environment
+
+
+class SweepCell(NamedTuple):
+    """
+    Describes one run of a parameter sweep.
+    """
+
+    generations: int
+    population_size: int
+    dna_length: int
+    seed: int
+    temperature: int = 25
+    food: int = 100
+    predators: int = 5
+
+    def key(self) -> str:
+        """
+        Returns the identifier of the cell used to recognise completed runs.
+        """
+        return json.dumps(list(self))
+
+
+def grid(generations: Sequence[int], population_sizes: Sequence[int], dna_lengths: Sequence[int],
+         seeds: Sequence[int], temperatures: Sequence[int] = (25,), foods: Sequence[int] = (100,),
+         predators: Sequence[int] = (5,)) -> List[SweepCell]:
+    """
+    Builds the full cartesian grid of sweep cells.
+
+    Args:
+        generations (Sequence[int]): The numbers of generations to try.
+        population_sizes (Sequence[int]): The population sizes to try.
+        dna_lengths (Sequence[int]): The DNA lengths to try.
+        seeds (Sequence[int]): The seeds to run every combination with.
+        temperatures (Sequence[int], optional): The starting temperatures. Defaults to 25.
+        foods (Sequence[int], optional): The starting amounts of food. Defaults to 100.
+        predators (Sequence[int], optional): The starting numbers of predators. Defaults to 5.
+
+    Returns:
+        List[SweepCell]: One cell per combination.
+    """
+    return [SweepCell(*values) for values in itertools.product(
+        generations, population_sizes, dna_lengths, seeds, temperatures, foods, predators)]
+
+
+def sample(cells: Sequence[SweepCell], count: int, seed: Optional[int] = None) -> List[SweepCell]:
+    """
+    Draws a random subset of sweep cells without replacement.
+
+    Args:
+        cells (Sequence[SweepCell]): The cells to draw from, usually a grid.
+        count (int): The number of cells to keep.
+        seed (int, optional): The seed of the draw. Defaults to an unseeded draw.
+
+    Returns:
+        List[SweepCell]: The sampled cells, in grid order.
+    """
+    chosen = sorted(random.Random(seed).sample(range(len(cells)), min(count, len(cells))))
+    return [cells[index] for index in chosen]
+
+
+def run_cell(cell: SweepCell, stopping: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """
+    Runs the simulation described by one cell and returns its result record.
+
+    Args:
+        cell (SweepCell): The run to perform.
+        stopping (Dict[str, object], optional): The ``ConvergenceMonitor`` arguments that end the run early.
+            Defaults to running every generation of the cell.
+
+    Returns:
+        Dict[str, object]: The cell parameters with the final and best fitness of the run, the generations
+        it ran and the rule that stopped it early, if any.
+    """
+    started = time.perf_counter()
+    environment = Environment({'food': cell.food}, {'number': cell.predators}, cell.temperature)
+    monitor = ConvergenceMonitor(**stopping) if stopping else None
+    simulation = Simulation(cell.population_size, cell.dna_length, cell.seed, environment, monitor=monitor)
+    best_fitness = float('-inf')
+    last = None
+    for last in simulation.run(cell.generations):
+        best_fitness = max(best_fitness, last.best_fitness)
+    record = cell._asdict()
+    record.update(
+        final_best_fitness=last.best_fitness if last else None,
+        final_mean_fitness=last.mean_fitness if last else None,
+        best_fitness=best_fitness if last else None,
+        generations_run=simulation.generation,
+        stop_reason=simulation.stop_reason,
+        elapsed=time.perf_counter() - started,
+    )
+    return record
+
+
+def run_cells(cells: List[SweepCell], stopping: Optional[Dict[str, object]] = None) -> List[Dict[str, object]]:
+    """
+    Runs a chunk of cells in one worker call to amortise the inter-process overhead.
+    """
+    return [run_cell(cell, stopping) for cell in cells]
+
+
+def completed_keys(path: str) -> Set[str]:
+    """
+    Reads the keys of the cells already recorded in a results file.
+
+    A truncated last line, left by an interrupted sweep, is ignored so that cell runs again.
+
+    Args:
+        path (str): The JSON lines results file.
+
+    Returns:
+        Set[str]: The keys of the completed cells.
+    """
+    keys = set()
+    if not os.path.exists(path):
+        return keys
+    with open(path) as results:
+        for line in results:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            keys.add(SweepCell(*(record[field] for field in SweepCell._fields)).key())
+    return keys
+
+
+def _ends_with_newline(path: str) -> bool:
+    """
+    Tells whether a file is empty or ends with a complete line.
+    """
+    with open(path, 'rb') as results:
+        if results.seek(0, os.SEEK_END) == 0:
+            return True
+        results.seek(-1, os.SEEK_END)
+        return results.read(1) == b"\n"
+
+
+def run_sweep(cells: Iterable[SweepCell], path: str, max_workers: Optional[int] = None,
+              chunk_size: Optional[int] = None, stopping: Optional[Dict[str, object]] = None) -> int:
+    """
+    Runs every cell not yet in the results file across a process pool, appending results as they finish.
+
+    Args:
+        cells (Iterable[SweepCell]): The runs of the sweep.
+        path (str): The JSON lines results file, created or resumed.
+        max_workers (int, optional): The number of worker processes. Defaults to every core.
+        chunk_size (int, optional): The number of cells per task. Defaults to about four tasks per worker,
+            capped at 64 cells so results keep streaming.
+        stopping (Dict[str, object], optional): The ``ConvergenceMonitor`` arguments that end every run
+            early. Defaults to running every generation.
+
+    Returns:
+        int: The number of cells run by this call.
+    """
+    done = completed_keys(path)
+    pending = [cell for cell in cells if cell.key() not in done]
+    if not pending:
+        return 0
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(64, len(pending) // (max_workers * 4)))
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+
+    with open(path, 'a') as results, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        if not _ends_with_newline(path):
+            # Start on a fresh line if an interrupted sweep left a partial record behind
+            results.write("\n")
+        running = {executor.submit(run_cells, chunk, stopping) for chunk in chunks}
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for record in future.result():
+                    results.write(json.dumps(record) + "\n")
+                results.flush()
+    return len(pending)
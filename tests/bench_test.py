@@ -0,0 +1,56 @@
+import os
+import tempfile
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+
+from evolite.bench import BENCHMARKS, UNSIZED, compare, load_results, run_benchmarks, save_results
+
+
+def sleeper(seconds):
+    return lambda population_size, dna_length, seed: lambda: time.sleep(seconds)
+
+
+class BenchTest(unittest.TestCase):
+    def test_runs_every_case_on_tiny_sizes(self):
+        results = run_benchmarks(sizes=(10, 20), lengths=(10, 70), repeats=2, min_time=0.001)
+        self.assertEqual(Counter(result.name for result in results),
+                         {name: 1 if name in UNSIZED else 4 for name in BENCHMARKS})
+        self.assertEqual([(result.population_size, result.dna_length) for result in results[:4]],
+                         [(10, 10), (20, 10), (10, 70), (20, 70)])
+        for result in results:
+            self.assertGreater(result.seconds, 0)
+            self.assertLessEqual(result.seconds, result.median)
+            self.assertEqual(result.repeats, 2)
+
+    def test_skips_large_cases(self):
+        results = run_benchmarks(['organism_mutate', 'mutate'], sizes=(10, 20000), lengths=(10,), repeats=1,
+                                 min_time=0.001, max_bytes=100000)
+        self.assertEqual([result.key for result in results], ['organism_mutate[10x10]', 'mutate[10x10]'])
+        with self.assertRaises(ValueError):
+            run_benchmarks(['mutate_faster'])
+
+    def test_compare_flags_an_injected_regression(self):
+        def measure(slow):
+            benchmarks = {'steady': sleeper(0.002), 'slowed': sleeper(0.01 if slow else 0.002)}
+            with mock.patch.dict(BENCHMARKS, benchmarks):
+                return run_benchmarks(list(benchmarks), sizes=(10,), lengths=(10,), repeats=3, min_time=0.005)
+
+        baseline = measure(False)
+        regressions = compare(measure(True), baseline)
+        self.assertEqual([regression.key for regression in regressions], ['slowed[10x10]'])
+        self.assertGreater(regressions[0].ratio, 2)
+        self.assertEqual(compare(baseline, baseline), [])
+        self.assertEqual(compare(baseline, []), [])
+
+    def test_saved_results_load_back(self):
+        results = run_benchmarks(['mutate', 'cycle_day'], sizes=(10,), lengths=(10,), repeats=1, min_time=0.001)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            save_results(results, path)
+            self.assertEqual(load_results(path), results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from evolite.cache import FitnessCache, quantized_environment
+from evolite.environment import Environment
+from evolite.fitness import count_ones
+from evolite.population import PopulationArray
+
+from .support import random_population
+
+
+class CountingFitness:
+    """
+    Counts the organisms a fitness function is asked to evaluate.
+    """
+
+    def __init__(self):
+        self.evaluated = 0
+
+    def __call__(self, population, environment):
+        self.evaluated += len(population)
+        return count_ones(population, environment)
+
+
+def environment(temperature=25, predators=5):
+    return Environment({'food': 100}, {'number': predators}, temperature)
+
+
+class FitnessCacheTest(unittest.TestCase):
+    def test_matches_the_wrapped_function(self):
+        population = random_population(200, 150, 0)
+        cache = FitnessCache(count_ones)
+        for temperature in (25, 31, 25):
+            np.testing.assert_array_equal(cache(population, environment(temperature)),
+                                          count_ones(population, environment(temperature)))
+
+    def test_evaluates_each_distinct_genome_once(self):
+        population = random_population(50, 64, 1)
+        doubled = population.take(np.concatenate([np.arange(50), np.arange(50)]))
+        fitness = CountingFitness()
+        cache = FitnessCache(fitness)
+        cache(doubled, environment())
+        self.assertEqual((fitness.evaluated, cache.duplicates, cache.misses, cache.hits), (50, 50, 50, 0))
+        cache(population, environment())
+        self.assertEqual((fitness.evaluated, cache.hits), (50, 50))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_genomes_differing_only_in_length_are_distinct(self):
+        bits = np.zeros((2, 20), dtype=np.uint8)
+        population = PopulationArray.from_bits(bits, np.array([5, 6]), max_length=20)
+        cache = FitnessCache(count_ones)
+        self.assertEqual(cache(population, environment()).tolist(), [0, 0])
+        self.assertEqual((cache.misses, cache.duplicates), (2, 0))
+
+    def test_keys_on_the_environment(self):
+        population = random_population(20, 150, 2)
+        fitness = CountingFitness()
+        cache = FitnessCache(fitness)
+        cache(population, environment(25))
+        cache(population, environment(26))
+        self.assertEqual(cache.misses, 40)
+        coarse = FitnessCache(fitness, environment_key=quantized_environment(temperature_step=10))
+        coarse(population, environment(21))
+        coarse(population, environment(29))
+        self.assertEqual((coarse.misses, coarse.hits), (20, 20))
+
+    def test_evicts_least_recently_used(self):
+        population = random_population(10, 150, 3)
+        fitness = CountingFitness()
+        cache = FitnessCache(fitness, max_size=6)
+        cache(population.take(np.arange(6)), environment())
+        cache(population.take(np.arange(2)), environment())
+        cache(population.take(np.arange(6, 10)), environment())
+        self.assertEqual(len(cache.entries), 6)
+        # The two genomes used again are kept, the other four were evicted
+        cache(population.take(np.arange(6)), environment())
+        self.assertEqual(fitness.evaluated, 14)
+
+    def test_clear(self):
+        cache = FitnessCache(count_ones)
+        cache(random_population(10, 20, 4), environment())
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0, 'duplicates': 0, 'size': 0, 'hit_rate': 0.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from evolite.cache import FitnessCache
+from evolite.checkpoint import CheckpointWriter, load_checkpoint, read_header, save_checkpoint
+from evolite.convergence import ConvergenceMonitor
+from evolite.core import Simulation
+from evolite.fitness import FitnessEvaluator
+from evolite.lineage import LineageTracker
+from evolite.mutation import MutationEngine
+from evolite.schedule import EnvironmentSchedule
+from evolite.spatial import SpatialEnvironment
+from evolite.speciation import Speciation
+from evolite.survival import Survival
+
+
+class ResumeTest(unittest.TestCase):
+    """
+    Simulations are checkpointed mid-run, and the resumed run must match the one that kept going.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_resumes(self, make, load=None, population_size=60, dna_length=12, before=10, after=15, **settings):
+        simulation = Simulation(population_size, dna_length, seed=9, **settings, **make())
+        list(simulation.run(before))
+        save_checkpoint(simulation, self.path)
+        expected = list(simulation.run(after))
+        for mmap in (True, False):
+            resumed = load_checkpoint(self.path, mmap=mmap, **(load or make)())
+            self.assertEqual(resumed.generation, before)
+            self.assertEqual(list(resumed.run(after)), expected)
+        return simulation, resumed
+
+    def test_plain(self):
+        self.assert_resumes(dict)
+
+    def test_elites(self):
+        self.assert_resumes(lambda: dict(elites=3, mothers='tournament', crossover='two_point'))
+
+    def test_cache(self):
+        self.assert_resumes(lambda: dict(fitness=FitnessCache(FitnessEvaluator('count_ones'))))
+
+    def test_survival(self):
+        self.assert_resumes(lambda: dict(survival=Survival()))
+
+    def test_spatial(self):
+        self.assert_resumes(lambda: dict(environment=SpatialEnvironment.uniform(8, 8), fitness='spatial'),
+                            lambda: dict(fitness='spatial'))
+
+    def test_mutation(self):
+        self.assert_resumes(lambda: dict(mutation=MutationEngine(0.02, duplication=0.02, deletion=0.01,
+                                                                  max_length=100), elites=1))
+
+    def test_one_fifth_mutation(self):
+        simulation, resumed = self.assert_resumes(lambda: dict(mutation=MutationEngine(adaptation='one_fifth')))
+        self.assertEqual(resumed.mutation.rate, simulation.mutation.rate)
+
+    def test_self_adaptive_mutation(self):
+        simulation, resumed = self.assert_resumes(lambda: dict(mutation=MutationEngine(adaptation='self'), elites=2))
+        np.testing.assert_array_equal(resumed.population.rates, simulation.population.rates)
+
+    def test_requires_the_mutation_engine(self):
+        save_checkpoint(Simulation(20, 10, seed=1, mutation=MutationEngine()), self.path)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_monitor(self):
+        self.assert_resumes(lambda: dict(monitor=ConvergenceMonitor(stagnation=3)))
+        self.assert_resumes(lambda: dict(monitor=ConvergenceMonitor(stagnation=30, diversity_floor=0.05, every=3,
+                                                                    time_budget=60)))
+
+    def test_monitor_is_optional(self):
+        # Monitors do not change how the run evolves, so it may go on without one
+        simulation = Simulation(20, 10, seed=1, monitor=ConvergenceMonitor())
+        list(simulation.run(3))
+        save_checkpoint(simulation, self.path)
+        self.assertEqual(list(load_checkpoint(self.path).run(3)), list(Simulation(20, 10, seed=1).run(6))[3:])
+
+    def test_lineage(self):
+        simulation, resumed = self.assert_resumes(lambda: dict(lineage=LineageTracker(prune_every=4),
+                                                               mothers='tournament'))
+        self.assertEqual(resumed.lineage.next_id, simulation.lineage.next_id)
+        np.testing.assert_array_equal(resumed.population.ids, simulation.population.ids)
+        self.assertEqual(resumed.lineage.common_ancestor(resumed.population.ids),
+                         simulation.lineage.common_ancestor(simulation.population.ids))
+
+    def test_lineage_is_optional(self):
+        simulation = Simulation(20, 10, seed=1, lineage=LineageTracker())
+        list(simulation.run(3))
+        save_checkpoint(simulation, self.path)
+        self.assertEqual(list(load_checkpoint(self.path).run(3)), list(Simulation(20, 10, seed=1).run(6))[3:])
+
+    def test_speciation(self):
+        self.assert_resumes(lambda: dict(speciation=Speciation(threshold=0.15), elites=2),
+                            population_size=200, dna_length=20)
+        self.assert_resumes(lambda: dict(speciation=Speciation(interspecies=0.2), mothers='tournament'),
+                            population_size=200, dna_length=20)
+
+    def test_requires_the_speciation(self):
+        save_checkpoint(Simulation(20, 10, seed=1, speciation=Speciation()), self.path)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_schedule(self):
+        schedule = EnvironmentSchedule.generate(40, seed=2, shock_rate=0.2, shock_size=8, season=(6, 12))
+        self.assert_resumes(lambda: dict(environment=schedule.replay()), dict)
+
+
+class CheckpointWriterTest(unittest.TestCase):
+    def test_flush_saves_the_final_generation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.bin')
+            simulation = Simulation(20, 10, seed=1)
+            with CheckpointWriter(path, every=4) as writer:
+                for _ in simulation.run(10):
+                    writer.maybe_submit(simulation)
+                writer.flush(simulation)
+            self.assertEqual(read_header(path)['generation'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from evolite.cli import main
+from evolite.history import HistoryStore
+
+
+def run(*argv):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        main(list(argv))
+    return output.getvalue().splitlines()
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'run.bin')
+        self.schedule = os.path.join(self.directory.name, 'schedule.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_rejected(self, *argv):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+            main(list(argv))
+        self.assertEqual(raised.exception.code, 2)
+
+    def test_final_checkpoint_is_written(self):
+        lines = run('run', '--generations', '7', '--format', 'jsonl', '--seed', '1', '--checkpoint', self.checkpoint,
+                    '--checkpoint-every', '3')
+        self.assertEqual(json.loads(lines[-1])['generation'], 7)
+        resumed = run('run', '--generations', '9', '--format', 'jsonl', '--resume', self.checkpoint)
+        self.assertEqual([json.loads(line)['generation'] for line in resumed], [8, 9])
+
+    def test_rejects_cache_with_spatial_fitness(self):
+        self.assert_rejected('run', '--cache', '--fitness', 'spatial')
+
+    def test_rejects_options_the_checkpoint_holds(self):
+        run('run', '--generations', '3', '--mothers', 'tournament', '--elites', '2', '--checkpoint', self.checkpoint)
+        for option in (('--seed', '1'), ('--mothers', 'fittest'), ('--fathers', 'uniform'), ('--crossover', 'uniform'),
+                       ('--elites', '0'), ('--grid', '4x4')):
+            self.assert_rejected('run', '--generations', '5', '--resume', self.checkpoint, *option)
+        self.assertEqual(len(run('run', '--generations', '5', '--resume', self.checkpoint)), 2)
+
+    def test_rejects_grid_with_schedule(self):
+        run('schedule', self.schedule, '--days', '10')
+        self.assert_rejected('run', '--generations', '5', '--grid', '4x4', '--fitness', 'spatial', '--schedule',
+                             self.schedule)
+
+    def test_rejects_runs_longer_than_the_schedule(self):
+        run('schedule', self.schedule, '--days', '10', '--seed', '1')
+        self.assert_rejected('run', '--generations', '11', '--schedule', self.schedule)
+        run('run', '--generations', '4', '--schedule', self.schedule, '--checkpoint', self.checkpoint)
+        self.assert_rejected('run', '--generations', '11', '--resume', self.checkpoint)
+
+    def test_rejects_zero_length_shocks(self):
+        self.assert_rejected('schedule', self.schedule, '--shock-rate', '0.1', '--shock-length', '0')
+
+    def test_resume_continues_the_schedule(self):
+        fresh = ('--format', 'jsonl', '--seed', '5', '--population-size', '30', '--dna-length', '12')
+        run('schedule', self.schedule, '--days', '30', '--seed', '2', '--shock-rate', '0.2', '--season-amplitude', '6',
+            '--season-period', '12')
+        full = run('run', '--generations', '30', '--schedule', self.schedule, *fresh)
+        run('run', '--generations', '12', '--schedule', self.schedule, '--checkpoint', self.checkpoint, *fresh)
+        self.assertEqual(run('run', '--generations', '30', '--resume', self.checkpoint, '--format', 'jsonl'), full[12:])
+        self.assertEqual(run('run', '--generations', '30', '--resume', self.checkpoint, '--schedule', self.schedule,
+                             '--format', 'jsonl'), full[12:])
+
+    def test_history_only_appends(self):
+        history = os.path.join(self.directory.name, 'history')
+        run('run', '--generations', '3', '--seed', '1', '--history', history, '--checkpoint', self.checkpoint)
+        self.assert_rejected('run', '--generations', '3', '--history', history)
+        run('run', '--generations', '6', '--resume', self.checkpoint, '--history', history)
+        self.assertEqual(HistoryStore(history).column('generation').tolist(), list(range(1, 7)))
+        # The checkpoint is still at generation 3, behind the history
+        self.assert_rejected('run', '--generations', '9', '--resume', self.checkpoint, '--history', history)
+
+
+if __name__ == '__main__':
+    unittest.main()
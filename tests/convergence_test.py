@@ -0,0 +1,73 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from evolite.convergence import ConvergenceMonitor, diversity
+from evolite.core import Simulation
+
+from .support import as_lists, random_population
+
+
+class DiversityTest(unittest.TestCase):
+    def test_matches_pairwise_distances(self):
+        population = random_population(40, 150, 0)
+        padded = [genes + [0] * (150 - len(genes)) for genes in as_lists(population.genomes, population.lengths, 150)]
+        distances = [sum(a != b for a, b in zip(first, second)) for first, second in itertools.combinations(padded, 2)]
+        measured = diversity(population)
+        self.assertAlmostEqual(measured.hamming, np.mean(distances))
+        self.assertAlmostEqual(measured.normalized, np.mean(distances) / population.lengths.mean())
+        self.assertEqual((measured.unique, measured.sampled), (40, 40))
+
+    def test_clones_have_none(self):
+        clones = random_population(1, 64, 1).take(np.zeros(30, dtype=np.int64))
+        self.assertEqual(diversity(clones), (0.0, 0.0, 1, 30))
+
+    def test_samples_evenly(self):
+        self.assertEqual(diversity(random_population(500, 64, 2), sample=50).sampled, 50)
+
+
+class ConvergenceMonitorTest(unittest.TestCase):
+    def test_stagnation(self):
+        monitor = ConvergenceMonitor(stagnation=3, min_improvement=0.5)
+        population = random_population(10, 20, 3)
+        reasons = [monitor.observe(generation, best, population)
+                   for generation, best in enumerate([1.0, 2.0, 2.4, 2.4, 2.4], 1)]
+        self.assertEqual(reasons, [None, None, None, None, 'stagnation'])
+        self.assertEqual(monitor.last_improvement, 2)
+
+    def test_target_fitness_stops_the_run(self):
+        simulation = Simulation(50, 20, seed=4, mothers='tournament', monitor=ConvergenceMonitor(target_fitness=15))
+        summaries = list(simulation.run(1000))
+        self.assertEqual(simulation.stop_reason, 'target_fitness')
+        self.assertGreaterEqual(summaries[-1].best_fitness, 15)
+        self.assertTrue(all(summary.best_fitness < 15 for summary in summaries[:-1]))
+
+    def test_diversity_floors(self):
+        clones = random_population(1, 64, 5).take(np.zeros(30, dtype=np.int64))
+        self.assertEqual(ConvergenceMonitor(diversity_floor=0.01).observe(1, 1.0, clones), 'diversity_floor')
+        self.assertEqual(ConvergenceMonitor(unique_floor=1).observe(1, 1.0, clones), 'unique_floor')
+        monitor = ConvergenceMonitor(unique_floor=1, every=2)
+        self.assertIsNone(monitor.observe(1, 1.0, clones))
+        self.assertEqual(monitor.observe(2, 1.0, clones), 'unique_floor')
+
+    def test_does_not_change_the_run(self):
+        monitored = list(Simulation(60, 12, seed=6, monitor=ConvergenceMonitor(diversity_floor=0.0)).run(20))
+        self.assertEqual(monitored, list(Simulation(60, 12, seed=6).run(20)))
+
+    def test_restores_its_state(self):
+        monitor = ConvergenceMonitor(stagnation=3, time_budget=3600)
+        population = random_population(10, 20, 3)
+        for generation, best in enumerate([1.0, 2.0, 2.0], 1):
+            monitor.observe(generation, best, population)
+        monitor.restore(dict(monitor.state(), elapsed=3600))
+        self.assertEqual((monitor.best_fitness, monitor.last_improvement), (2.0, 2))
+        # The spent seconds count against the budget of the resumed run
+        self.assertEqual(monitor.observe(4, 3.0, population), 'time_budget')
+        resumed = ConvergenceMonitor(stagnation=3)
+        resumed.restore(monitor.state())
+        self.assertEqual(resumed.stop_reason, 'time_budget')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import copy
+import unittest
+
+import numpy as np
+
+from evolite.crossover import CROSSOVERS, get_crossover, length_aware, one_point, two_point, uniform
+
+from .support import as_lists, random_population, words
+
+
+def parents(max_length, seed, size=300):
+    """
+    Returns mother and father populations with their genes as lists.
+    """
+    mothers, fathers = random_population(size, max_length, seed), random_population(size, max_length, seed + 100)
+    return (mothers, fathers, as_lists(mothers.genomes, mothers.lengths, max_length),
+            as_lists(fathers.genomes, fathers.lengths, max_length))
+
+
+def cross(operator, mothers, fathers, rng, max_length):
+    return operator(words(mothers), mothers.lengths, words(fathers), fathers.lengths, rng, max_length)
+
+
+class CrossoverTest(unittest.TestCase):
+    def assert_matches(self, operator, replay_children, max_lengths=(20, 64, 150)):
+        for seed, max_length in enumerate(max_lengths):
+            mothers, fathers, mother_dna, father_dna = parents(max_length, seed)
+            rng = np.random.default_rng(seed)
+            replay = copy.deepcopy(rng)
+            children, lengths = cross(operator, mothers, fathers, rng, max_length)
+            expected = replay_children(mother_dna, father_dna, words(mothers).shape, replay, max_length)
+            self.assertEqual(as_lists(children, lengths, max_length), expected)
+
+    def test_uniform_matches_list_replay(self):
+        def replay(mother_dna, father_dna, shape, rng, max_length):
+            draws = rng.integers(0, np.iinfo(np.uint64).max, size=shape, dtype=np.uint64, endpoint=True)
+            children = []
+            for m, f, row in zip(mother_dna, father_dna, draws):
+                shared = min(len(m), len(f))
+                children.append([f[i] if i < shared and int(row[i >> 6]) >> (i & 63) & 1 else m[i]
+                                 for i in range(len(m))])
+            return children
+
+        self.assert_matches(uniform, replay)
+
+    def test_one_point_matches_list_replay(self):
+        def replay(mother_dna, father_dna, shape, rng, max_length):
+            shared = np.minimum([len(m) for m in mother_dna], [len(f) for f in father_dna])
+            cuts = rng.integers(0, shared + 1)
+            return [m[:cut] + f[cut:end] + m[end:] for m, f, cut, end in zip(mother_dna, father_dna, cuts, shared)]
+
+        self.assert_matches(one_point, replay)
+
+    def test_two_point_matches_list_replay(self):
+        def replay(mother_dna, father_dna, shape, rng, max_length):
+            shared = np.minimum([len(m) for m in mother_dna], [len(f) for f in father_dna])
+            first, second = rng.integers(0, shared + 1), rng.integers(0, shared + 1)
+            return [m[:min(a, b)] + f[min(a, b):max(a, b)] + m[max(a, b):]
+                    for m, f, a, b in zip(mother_dna, father_dna, first, second)]
+
+        self.assert_matches(two_point, replay)
+
+    def test_length_aware_matches_list_replay(self):
+        def replay(mother_dna, father_dna, shape, rng, max_length):
+            heads = rng.integers(1, np.array([len(m) for m in mother_dna]) + 1)
+            tails = rng.integers(0, np.array([len(f) for f in father_dna]))
+            return [(m[:head] + f[tail:])[:max_length]
+                    for m, f, head, tail in zip(mother_dna, father_dna, heads, tails)]
+
+        self.assert_matches(length_aware, replay)
+
+    def test_children_of_identical_parents_are_copies(self):
+        mothers = random_population(100, 150, 7)
+        dna = as_lists(mothers.genomes, mothers.lengths, 150)
+        for name, operator in CROSSOVERS.items():
+            if name == 'length_aware':
+                continue
+            children, lengths = cross(operator, mothers, mothers, np.random.default_rng(0), 150)
+            self.assertEqual(as_lists(children, lengths, 150), dna)
+
+    def test_get_crossover(self):
+        self.assertIs(get_crossover('two_point'), two_point)
+        self.assertIs(get_crossover(uniform), uniform)
+        with self.assertRaises(ValueError):
+            get_crossover('three_point')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from evolite.bits import popcount
+from evolite.core import Simulation
+from evolite.ensemble import Ensemble, EnsembleResult, living_elites
+from evolite.selection import elite
+
+CONFIGURATIONS = (dict(), dict(elites=2), dict(elites=3, mothers='tournament', fathers='tournament'),
+                  dict(elites=5, mothers='roulette', crossover='two_point'))
+
+
+class EnsembleTest(unittest.TestCase):
+    def test_one_replicate_matches_a_plain_run(self):
+        for settings in CONFIGURATIONS:
+            with self.subTest(**settings):
+                ensemble, simulation = Ensemble(1, 30, 10, seed=4, **settings), Simulation(30, 10, seed=4, **settings)
+                for generation in range(60):
+                    if generation in (5, 20):
+                        # Carried-over elites lead the population, so this lets them die at the next step
+                        ensemble.population.lifespans[:4] = simulation.population.lifespans[:4] = 1
+                    record, summary = ensemble.step(), simulation.step()
+                    self.assertEqual((record['best_fitness'][0], record['mean_fitness'][0]),
+                                     (summary.best_fitness, summary.mean_fitness))
+                np.testing.assert_array_equal(ensemble.population.genomes, simulation.population.genomes)
+
+    def test_dead_elites_make_room_for_children(self):
+        ensemble = Ensemble(3, 10, 10, seed=1, elites=4)
+        ensemble.step()
+        ensemble.population.lifespans[10:17] = 1
+        ensemble.step()
+        self.assertEqual(len(ensemble.population), 30)
+        lifespans = ensemble.population.lifespans.reshape(3, 10)
+        # Three of replicate 1's organisms live, so it keeps three elites and breeds seven children
+        self.assertEqual((lifespans[1] == lifespans[1].max()).sum(), 7)
+        self.assertEqual((lifespans[0] == lifespans[0].max()).sum(), 6)
+
+    def test_living_elites(self):
+        fitness = np.array([[3.0, 1.0, 3.0, 2.0], [5.0, 4.0, 4.0, 1.0]])
+        living = np.array([[True, True, False, True], [True] * 4])
+        np.testing.assert_array_equal(living_elites(fitness, living, 2), [0, 3, 4, 5 + elite(fitness[1], 2)[1] - 1])
+        np.testing.assert_array_equal(living_elites(fitness, np.ones_like(living), 2),
+                                      np.concatenate([elite(fitness[0], 2), 4 + elite(fitness[1], 2)]))
+
+    def test_replicates_breed_apart(self):
+        ensemble = Ensemble(2, 20, 10, seed=2, mothers='uniform')
+        ensemble.population.genomes[:20] = 0
+        ensemble.population.genomes[20:] = np.uint8(0xff)
+        ensemble.step()
+        fitness = popcount(ensemble.population.genomes).reshape(2, 20)
+        self.assertLessEqual(fitness[0].max(), 1)
+        self.assertGreaterEqual(fitness[1].min(), 9)
+
+    def test_seeded_and_aggregated(self):
+        result = Ensemble(8, 20, 10, seed=3, mothers='tournament').evolve(12)
+        again = Ensemble(8, 20, 10, seed=3, mothers='tournament').evolve(12)
+        for name in EnsembleResult._fields:
+            np.testing.assert_array_equal(getattr(result, name), getattr(again, name))
+        self.assertEqual(result.best_fitness.shape, (12, 8))
+        np.testing.assert_array_equal(result.generation, np.arange(1, 13))
+        summary = result.aggregate('mean_fitness')
+        np.testing.assert_allclose(summary['mean'], result.mean_fitness.mean(axis=1))
+        self.assertTrue((summary['lower'] <= summary['mean']).all() and (summary['mean'] <= summary['upper']).all())
+
+    def test_save(self):
+        result = Ensemble(2, 10, 10, seed=5).evolve(3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ensemble.npz')
+            result.save(path)
+            with np.load(path) as saved:
+                np.testing.assert_array_equal(saved['best_fitness'], result.best_fitness)
+
+
+if __name__ == '__main__':
+    unittest.main()
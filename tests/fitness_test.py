@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from evolite.environment import Environment
+from evolite.fitness import FITNESS_FUNCTIONS, FitnessEvaluator, PerGenome, get_fitness, register_fitness
+
+from .support import random_population
+
+
+def ones_per_genome(genome, environment):
+    return float(genome.ones() + (environment.temperature > 30))
+
+
+class FitnessEvaluatorTest(unittest.TestCase):
+    def setUp(self):
+        self.population = random_population(101, 150, 0)
+        self.environments = [Environment({'food': 100}, {'number': 3}, temperature) for temperature in (25, 31)]
+
+    def test_backends_agree(self):
+        for name in ('count_ones', 'traits'):
+            for environment in self.environments:
+                expected = get_fitness(name)(self.population, environment)
+                for backend in ('serial', 'vectorized', 'process', 'auto'):
+                    with self.subTest(name=name, backend=backend), \
+                            FitnessEvaluator(name, backend, workers=2, chunk_size=17) as evaluator:
+                        np.testing.assert_array_equal(evaluator(self.population, environment), expected)
+
+    def test_per_genome_functions_match_batches(self):
+        for environment in self.environments:
+            np.testing.assert_array_equal(PerGenome(ones_per_genome)(self.population, environment),
+                                          FITNESS_FUNCTIONS['count_ones'](self.population, environment))
+
+    def test_register_wraps_per_genome_functions(self):
+        register_fitness('ones_per_genome', vectorized=False)(ones_per_genome)
+        try:
+            self.assertIsInstance(get_fitness('ones_per_genome'), PerGenome)
+        finally:
+            del FITNESS_FUNCTIONS['ones_per_genome']
+
+    def test_empty_population(self):
+        empty = self.population.take(np.arange(0))
+        for backend in ('serial', 'vectorized', 'process'):
+            self.assertEqual(len(FitnessEvaluator('count_ones', backend)(empty, self.environments[0])), 0)
+
+    def test_rejects_unknown_names(self):
+        with self.assertRaises(ValueError):
+            FitnessEvaluator('count_zeros')
+        with self.assertRaises(ValueError):
+            FitnessEvaluator('count_ones', backend='threads')
+
+
+if __name__ == '__main__':
+    unittest.main()
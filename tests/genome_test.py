@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from evolite.genome import Genome
+
+
+class GenomeTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.dna = [[rng.randint(0, 1) for _ in range(rng.randint(1, 150))] for _ in range(50)]
+
+    def test_edits_match_lists(self):
+        rng = random.Random(1)
+        for dna in self.dna:
+            genome, index = Genome.from_list(dna), rng.randrange(len(dna))
+            self.assertEqual(genome.to_list(), dna)
+            self.assertEqual(genome.flip(index).to_list(), dna[:index] + [1 - dna[index]] + dna[index + 1:])
+            self.assertEqual(genome.duplicate(index).to_list(), dna[:index + 1] + dna[index:])
+            self.assertEqual(genome.delete(index).to_list(), dna[:index] + dna[index + 1:])
+            self.assertEqual(genome.ones(), sum(dna))
+
+    def test_crossover_takes_masked_genes_from_the_other(self):
+        mother, father = Genome.from_list([0, 0, 1, 1]), Genome.from_list([1, 0, 1, 0])
+        self.assertEqual(mother.crossover(father, 0b1001).to_list(), [1, 0, 1, 0])
+        self.assertEqual(mother.crossover(father, 0).to_list(), mother.to_list())
+
+    def test_bytes_round_trip(self):
+        for dna in self.dna:
+            genome = Genome.from_list(dna)
+            self.assertEqual(Genome.from_bytes(genome.to_bytes(24), len(dna)), genome)
+
+    def test_indexing(self):
+        genome = Genome.from_list([1, 0, 1])
+        self.assertEqual(list(genome), [1, 0, 1])
+        self.assertEqual((len(genome), genome[2]), (3, 1))
+        with self.assertRaises(IndexError):
+            genome[3]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from evolite.bits import popcount
+from evolite.core import Simulation
+from evolite.history import HistoryStore
+from evolite.mutation import MutationEngine
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_columns_match_summaries(self):
+        store = HistoryStore(self.directory.name, chunk_size=4)
+        summaries = list(Simulation(30, 10, seed=1, history=store).run(11))
+        store.close()
+        reopened = HistoryStore(self.directory.name)
+        np.testing.assert_array_equal(reopened.column('generation'), np.arange(1, 12))
+        np.testing.assert_array_equal(reopened.column('best_fitness'), [summary.best_fitness for summary in summaries])
+        np.testing.assert_array_equal(reopened.column('mean_fitness', 3, 6),
+                                      [summary.mean_fitness for summary in summaries[2:5]])
+        self.assertEqual(reopened.last_generation, 11)
+
+    def test_rejects_generations_out_of_order(self):
+        store = HistoryStore()
+        summary = next(Simulation(10, 10, seed=1, history=store).run(1))
+        with self.assertRaises(ValueError):
+            store.record(summary)
+
+    def test_resumes_an_existing_directory(self):
+        store = HistoryStore(self.directory.name, chunk_size=2)
+        simulation = Simulation(20, 10, seed=3, history=store)
+        list(simulation.run(5))
+        store.close()
+        simulation.history = HistoryStore(self.directory.name, chunk_size=2)
+        list(simulation.run(4))
+        simulation.history.close()
+        generations, genomes, _, _ = HistoryStore(self.directory.name).genomes()
+        np.testing.assert_array_equal(generations, np.arange(1, 10))
+        self.assertEqual(len(genomes), 9)
+
+    def test_widened_genomes_are_stored_whole(self):
+        # Duplications past the starting cap widen the packed rows during the run
+        store = HistoryStore(self.directory.name, chunk_size=3, sample_genomes=2)
+        engine = MutationEngine(0.01, duplication=0.2, max_length=256)
+        list(Simulation(40, 10, seed=2, history=store, mutation=engine).run(30))
+        store.close()
+        reopened = HistoryStore(self.directory.name)
+        generations, genomes, lengths, fitness = reopened.genomes()
+        self.assertEqual(genomes.shape, (60, 32))
+        self.assertGreater(lengths.max(), 64)
+        heat = np.repeat(reopened.column('temperature'), 2) > 30
+        np.testing.assert_array_equal(popcount(genomes) + heat, fitness)
+        np.testing.assert_array_equal(generations, np.repeat(np.arange(1, 31), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from evolite.core import Simulation
+from evolite.islands import MigrantBuffer, emigrate, fully_connected, immigrate, ring, run_islands
+from evolite.population import DEFAULT_LIFESPAN, MAX_DNA_LENGTH
+from evolite.rng import RandomStreams
+
+
+class MigrationTest(unittest.TestCase):
+    def test_topologies(self):
+        self.assertEqual([ring(island, 4) for island in range(4)], [[3], [0], [1], [2]])
+        self.assertEqual(fully_connected(1, 3), [0, 2])
+        self.assertEqual(ring(0, 1), [])
+
+    def test_fittest_migrants_replace_the_least_fit(self):
+        buffer = MigrantBuffer(3, 2, MAX_DNA_LENGTH)
+        islands = [Simulation(20, 10, seed) for seed in range(3)]
+        for island, simulation in enumerate(islands):
+            emigrate(simulation, buffer, island)
+        sent = {island: [islands[island].population.dna(index)
+                         for index in np.argsort(islands[island].population.fitness, kind='stable')[::-1][:2]]
+                for island in range(3)}
+
+        target = islands[0].population
+        worst = np.argsort(target.fitness, kind='stable')[:2]
+        target.lifespans[worst] = 1
+        immigrate(islands[0], buffer, [1, 2])
+        arrived = [target.dna(index) for index in worst]
+        self.assertTrue(all(dna in sent[1] + sent[2] for dna in arrived))
+        self.assertEqual(sorted(map(sum, arrived)), sorted(map(sum, sent[1] + sent[2]))[2:])
+        np.testing.assert_array_equal(target.lifespans[worst], DEFAULT_LIFESPAN)
+
+    def test_no_sources_changes_nothing(self):
+        simulation = Simulation(20, 10, 1)
+        before = simulation.population.genomes.copy()
+        immigrate(simulation, MigrantBuffer(1, 2, MAX_DNA_LENGTH), [])
+        np.testing.assert_array_equal(simulation.population.genomes, before)
+
+
+class RunIslandsTest(unittest.TestCase):
+    def test_seeded_runs_repeat(self):
+        first = run_islands(12, 40, 10, islands=3, migrants=2, interval=4, seed=5)
+        self.assertEqual([result.island for result in first], [0, 1, 2])
+        self.assertEqual([result.summaries[0].population_size for result in first], [14, 13, 13])
+        self.assertEqual(run_islands(12, 40, 10, islands=3, migrants=2, interval=4, seed=5), first)
+
+    def test_islands_evolve_apart_until_migration(self):
+        # Without migration every island is a plain run on its own stream
+        isolated = run_islands(10, 40, 10, islands=2, interval=100, seed=3)
+        streams = RandomStreams(3)
+        for result in isolated:
+            plain = list(Simulation(20, 10, streams.child(result.island)).run(10))
+            self.assertEqual(result.summaries, plain)
+        migrated = run_islands(10, 40, 10, islands=2, interval=2, topology='full', seed=3)
+        self.assertEqual([result.summaries[:2] for result in migrated], [result.summaries[:2] for result in isolated])
+        self.assertNotEqual([result.summaries for result in migrated], [result.summaries for result in isolated])
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            run_islands(5, 40, 10, islands=2, topology='star')
+        with self.assertRaises(ValueError):
+            run_islands(5, 3, 10, islands=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
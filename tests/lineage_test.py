@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from evolite.core import Simulation
+from evolite.lineage import LineageTracker
+from evolite.mutation import MutationEngine
+from evolite.survival import Survival
+
+
+class LineageTrackerTest(unittest.TestCase):
+    def assert_consistent(self, simulation, generations):
+        tracker = simulation.lineage
+        list(simulation.run(generations))
+        population = simulation.population
+
+        # Every living organism's stored genome is its real genome
+        stored = tracker.population(population.ids)
+        width = min(stored.genomes.shape[1], population.genomes.shape[1])
+        np.testing.assert_array_equal(stored.genomes[:, :width], population.genomes[:, :width])
+        np.testing.assert_array_equal(stored.lengths, population.lengths)
+
+        # Walking back together agrees with walking every maternal line on its own
+        generation = tracker.births - 3
+        ancestors = tracker.ancestors(population.ids, generation)
+        for index in range(0, len(population), max(1, len(population) // 20)):
+            line = tracker.lineage(int(population.ids[index]))
+            born = tracker.columns['generations'][tracker.rows(line)]
+            self.assertEqual(ancestors[index], line[np.argmax(born <= generation)])
+
+        common = tracker.common_ancestor(population.ids)
+        if common is not None:
+            self.assertTrue(np.all(tracker.ancestors(population.ids, tracker.node(common).generation) == common))
+
+    def test_queries_are_consistent(self):
+        for settings in (dict(), dict(mothers='tournament', elites=3),
+                         dict(mothers='roulette', mutation=MutationEngine(0.02, 0.01, 0.01, max_length=80)),
+                         dict(mothers='tournament', survival=Survival())):
+            with self.subTest(**{name: str(value) for name, value in settings.items()}):
+                simulation = Simulation(300, 20, 1, lineage=LineageTracker(prune_every=7), **settings)
+                self.assert_consistent(simulation, 60)
+
+    def test_pruning_keeps_living_ancestry_only(self):
+        simulation = Simulation(200, 20, 4, mothers='tournament', lineage=LineageTracker(prune_every=0))
+        list(simulation.run(30))
+        tracker = simulation.lineage
+        before = len(tracker)
+        ancestors = tracker.ancestors(simulation.population.ids, 10)
+        self.assertGreater(tracker.prune(simulation.population.ids), 0)
+        self.assertLess(len(tracker), before)
+        np.testing.assert_array_equal(tracker.ancestors(simulation.population.ids, 10), ancestors)
+
+    def test_does_not_change_the_run(self):
+        plain = list(Simulation(100, 10, 5, mothers='tournament').run(30))
+        tracked = list(Simulation(100, 10, 5, mothers='tournament', lineage=LineageTracker()).run(30))
+        self.assertEqual(tracked, plain)
+
+    def test_unknown_nodes(self):
+        simulation = Simulation(20, 10, 6, lineage=LineageTracker())
+        list(simulation.run(2))
+        with self.assertRaises(KeyError):
+            simulation.lineage.node(10 ** 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import copy
+import unittest
+
+import numpy as np
+
+from evolite.mutation import MutationEngine, edit_lengths, flip_genes, widen
+from evolite.population import DUPLICATION
+
+from .support import as_lists, random_population
+
+
+def replay_edits(dna, duplication, deletion, rng, max_length):
+    # Draw the edits as edit_lengths does, then apply them to lists from the highest position down
+    lengths = np.array([len(genes) for genes in dna])
+    counts = [rng.binomial(lengths, duplication), rng.binomial(lengths, deletion)]
+    rows = np.concatenate([np.repeat(np.arange(len(dna)), count) for count in counts])
+    if not len(rows):
+        return dna
+    kinds = np.repeat([DUPLICATION, -1], [count.sum() for count in counts])
+    positions = (rng.random(len(rows)) * lengths[rows]).astype(np.int64)
+    edits = [[] for _ in dna]
+    for row, kind, at in zip(rows, kinds, positions):
+        edits[row].append((kind, at))
+    children = []
+    for genes, genome_edits in zip(dna, edits):
+        genes = list(genes)
+        # A stable sort keeps duplications ahead of deletions at the same position
+        for kind, at in sorted(genome_edits, key=lambda edit: -edit[1]):
+            if kind == DUPLICATION and len(genes) < max_length:
+                genes.insert(at, genes[at])
+            elif kind != DUPLICATION and len(genes) > 1 and at < len(genes):
+                del genes[at]
+        children.append(genes)
+    return children
+
+
+class EditLengthsTest(unittest.TestCase):
+    def test_matches_list_replay(self):
+        for max_length, rates, seed in ((20, (0.05, 0.05), 0), (150, (0.02, 0.01), 1), (150, (0.01, 0.03), 2),
+                                        (64, (0.2, 0.2), 3), (150, (0.0, 0.05), 4)):
+            population = random_population(300, max_length, seed)
+            population.lengths[:5] = max_length
+            population.lengths[5:10] = 1
+            population.genomes[:10] = 0
+            dna = as_lists(population.genomes, population.lengths, max_length)
+
+            rng = np.random.default_rng(seed)
+            replay = copy.deepcopy(rng)
+            applied = edit_lengths(population, *rates, rng)
+            children = as_lists(population.genomes, population.lengths, max_length)
+
+            self.assertEqual(children, replay_edits(dna, *rates, replay, max_length))
+            self.assertGreater(applied, 0)
+
+    def test_per_organism_rates(self):
+        population = random_population(40, 64, 5)
+        dna = as_lists(population.genomes, population.lengths, 64)
+        duplication = np.where(np.arange(40) < 20, 0.0, 0.1)
+        edit_lengths(population, duplication, 0.0, np.random.default_rng(0))
+        self.assertEqual(as_lists(population.genomes, population.lengths, 64)[:20], dna[:20])
+
+
+class FlipGenesTest(unittest.TestCase):
+    def test_certain_rate_flips_every_gene(self):
+        population = random_population(50, 150, 6)
+        dna = as_lists(population.genomes, population.lengths, 150)
+        flipped = flip_genes(population, 1.0, np.random.default_rng(0))
+        self.assertEqual(flipped, int(population.lengths.sum()))
+        self.assertEqual(as_lists(population.genomes, population.lengths, 150),
+                         [[1 - gene for gene in genes] for genes in dna])
+
+    def test_zero_rates_flip_nothing(self):
+        population = random_population(50, 150, 7)
+        dna = as_lists(population.genomes, population.lengths, 150)
+        rates = np.where(np.arange(50) % 2, 0.0, 1.0)
+        flip_genes(population, rates, np.random.default_rng(0))
+        for index, (child, genes) in enumerate(zip(as_lists(population.genomes, population.lengths, 150), dna)):
+            self.assertEqual(child, genes if index % 2 else [1 - gene for gene in genes])
+        self.assertEqual(flip_genes(population, 0.0, np.random.default_rng(0)), 0)
+
+    def test_rate_is_per_gene(self):
+        population = random_population(2000, 150, 8)
+        flipped = flip_genes(population, 0.01, np.random.default_rng(0))
+        expected = 0.01 * population.lengths.sum()
+        self.assertLess(abs(flipped - expected), 5 * np.sqrt(expected))
+
+
+class MutationEngineTest(unittest.TestCase):
+    def test_rejects_unknown_adaptation(self):
+        with self.assertRaises(ValueError):
+            MutationEngine(adaptation='two_fifths')
+
+    def test_widen_pads_genomes(self):
+        population = random_population(10, 20, 9)
+        dna = as_lists(population.genomes, population.lengths, 20)
+        widen(population, 150)
+        self.assertEqual(population.max_length, 150)
+        self.assertEqual(as_lists(population.genomes, population.lengths, 150), dna)
+        widen(population, 20)
+        self.assertEqual(population.max_length, 150)
+
+    def test_one_fifth_rule(self):
+        engine = MutationEngine(rate=0.1, adaptation='one_fifth', factor=2.0)
+        population = random_population(10, 20, 10)
+        engine._parent_fitness = np.zeros(5)
+        population.fitness = np.ones(10)
+        engine.adapt(population)
+        self.assertEqual((engine.rate, engine.success_ratio), (0.2, 1.0))
+        engine._parent_fitness = np.full(5, 2.0)
+        engine.adapt(population)
+        self.assertEqual((engine.rate, engine.success_ratio), (0.1, 0.0))
+        self.assertIsNone(engine._parent_fitness)
+
+
+if __name__ == '__main__':
+    unittest.main()
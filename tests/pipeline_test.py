@@ -0,0 +1,39 @@
+import unittest
+
+from evolite.core import Simulation
+from evolite.pipeline import DEFAULT_STAGES, Pipeline
+
+
+class PipelineTest(unittest.TestCase):
+    def test_filter_runs_after_age(self):
+        self.assertEqual(DEFAULT_STAGES.index('filter'), DEFAULT_STAGES.index('age') + 1)
+
+    def test_filter_removes_dead_elites(self):
+        simulation = Simulation(20, 10, seed=1, elites=2)
+        simulation.population.lifespans[:5] = 1
+        simulation.step()
+        self.assertEqual(len(simulation.population), 20)
+        for _ in simulation.run(250):
+            self.assertTrue((simulation.population.lifespans > 0).all())
+
+    def test_filter_can_empty_the_population(self):
+        simulation = Simulation(20, 10, seed=1, elites=2)
+        simulation.population.lifespans[:] = 1
+        simulation.step()
+        self.assertEqual(len(simulation.population), 0)
+
+    def test_disabled_filter_keeps_the_dead(self):
+        pipeline = Pipeline()
+        pipeline.disable('filter')
+        simulation = Simulation(20, 10, seed=1, elites=2, pipeline=pipeline)
+        simulation.population.lifespans[:] = 1
+        simulation.step()
+        self.assertEqual(len(simulation.population), 20)
+
+    def test_rejects_unknown_stages(self):
+        with self.assertRaises(ValueError):
+            Pipeline(['evaluate', 'breed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
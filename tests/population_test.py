@@ -0,0 +1,97 @@
+import copy
+import unittest
+
+import numpy as np
+
+from evolite.environment import Environment
+from evolite.genome import Genome
+from evolite.population import DELETION, DUPLICATION, POINT, PopulationArray, concatenate, mutate_packed
+
+from .support import as_lists, random_population
+
+
+def replay_mutations(dna, kinds, index, max_length):
+    # One point, duplication or deletion per genome, as Organism.mutate applies them to a list
+    children = []
+    for genes, kind, at in zip(dna, kinds, index):
+        genes = list(genes)
+        if kind == POINT:
+            genes[at] ^= 1
+        elif kind == DUPLICATION and len(genes) < max_length:
+            genes.insert(at, genes[at])
+        elif kind == DELETION and len(genes) > 1:
+            del genes[at]
+        children.append(genes)
+    return children
+
+
+class MutatePackedTest(unittest.TestCase):
+    def test_matches_list_replay(self):
+        for max_length, seed in ((20, 0), (64, 1), (150, 2), (150, 3)):
+            population = random_population(400, max_length, seed)
+            # Full genomes cannot grow and single genes cannot shrink
+            population.lengths[:5] = max_length
+            population.lengths[5:10] = 1
+            population.genomes[:10] = 0
+            dna = as_lists(population.genomes, population.lengths, max_length)
+
+            rng = np.random.default_rng(seed)
+            replay = copy.deepcopy(rng)
+            lengths = mutate_packed(population.genomes, population.lengths, rng, max_length)
+            kinds = replay.integers(0, 3, size=len(dna))
+            index = replay.integers(0, population.lengths)
+
+            self.assertEqual(as_lists(population.genomes, lengths, max_length),
+                             replay_mutations(dna, kinds, index, max_length))
+
+    def test_leaves_lengths_unmodified(self):
+        population = random_population(50, 20, 4)
+        before = population.lengths.copy()
+        mutate_packed(population.genomes, population.lengths, np.random.default_rng(0))
+        np.testing.assert_array_equal(population.lengths, before)
+
+
+class PopulationArrayTest(unittest.TestCase):
+    def test_round_trips_genomes(self):
+        dna = [[1, 0, 1], [0] * 20, [1] * 20, [0, 1]]
+        population = PopulationArray.from_genomes([Genome.from_list(genes) for genes in dna])
+        self.assertEqual([population.dna(index) for index in range(len(dna))], dna)
+        self.assertEqual(population.genome(0), Genome.from_list(dna[0]))
+
+    def test_fitness_counts_ones_with_heat_bonus(self):
+        population = random_population(30, 100, 5)
+        ones = [sum(genes) for genes in as_lists(population.genomes, population.lengths, 100)]
+        np.testing.assert_array_equal(population.calculate_fitness(Environment({}, {}, 25)), ones)
+        np.testing.assert_array_equal(population.calculate_fitness(Environment({}, {}, 31)), np.add(ones, 1))
+
+    def test_alive_drops_expired_organisms(self):
+        population = random_population(6, 20, 6)
+        population.lifespans[:] = [2, 1, 1, 0, 3, 1]
+        population.decrease_lifespan()
+        alive = population.alive()
+        np.testing.assert_array_equal(alive.lifespans, [1, 2])
+        self.assertEqual(alive.dna(0), population.dna(0))
+        self.assertEqual(alive.dna(1), population.dna(4))
+
+    def test_concatenate_keeps_shared_columns_only(self):
+        first, second = random_population(3, 20, 7), random_population(2, 20, 8)
+        first.rates, second.rates = np.full(3, 0.1), np.full(2, 0.2)
+        first.species = np.zeros(3, dtype=np.int64)
+        joined = concatenate([first, second])
+        np.testing.assert_array_equal(joined.rates, [0.1, 0.1, 0.1, 0.2, 0.2])
+        self.assertIsNone(joined.species)
+        self.assertEqual([joined.dna(index) for index in range(5)],
+                         [first.dna(0), first.dna(1), first.dna(2), second.dna(0), second.dna(1)])
+
+    def test_reproduce_inherits_mother_columns(self):
+        population = random_population(4, 20, 9)
+        population.rates = np.array([0.1, 0.2, 0.3, 0.4])
+        population.species = np.array([5, 6, 7, 8])
+        children = population.reproduce(np.array([3, 0]), np.array([1, 2]), np.random.default_rng(0))
+        np.testing.assert_array_equal(children.rates, [0.4, 0.1])
+        np.testing.assert_array_equal(children.species, [8, 5])
+        np.testing.assert_array_equal(children.lengths, population.lengths[[3, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import copy
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from evolite.core import Simulation, default_environment
+from evolite.rng import ENVIRONMENT_STREAM, RandomStreams
+from evolite.schedule import EnvironmentSchedule, bounded_walk, load_schedule, shocks
+
+
+class BoundedWalkTest(unittest.TestCase):
+    def test_matches_clamped_loop(self):
+        steps = np.random.default_rng(0).integers(-10, 11, 5000)
+        for start, low, high, clamp in ((7, 0, None, lambda x: max(0, x)), (3, None, 5, lambda x: min(5, x))):
+            walk = [start]
+            for step in steps:
+                walk.append(clamp(walk[-1] + step))
+            np.testing.assert_array_equal(bounded_walk(start, steps, low, high), walk)
+
+    def test_reflects_between_bounds(self):
+        walk = bounded_walk(20, 2 * np.random.default_rng(1).integers(0, 2, 10000) - 1, 15, 35)
+        self.assertGreaterEqual(walk.min(), 15)
+        self.assertLessEqual(walk.max(), 35)
+        self.assertTrue((np.abs(np.diff(walk)) == 1).all())
+
+
+class ShocksTest(unittest.TestCase):
+    def test_matches_summed_windows(self):
+        for length in (1, 3, 40):
+            rng = np.random.default_rng(length)
+            replay = copy.deepcopy(rng)
+            starts = np.concatenate([[False], replay.random(300) < 0.1])
+            sizes = np.where(starts, np.rint(replay.normal(0.0, 4.0, 301)), 0)
+            expected = [sizes[max(0, day - length + 1):day + 1].sum() for day in range(301)]
+            np.testing.assert_array_equal(shocks(300, 0.1, 4.0, length, rng), expected)
+
+    def test_rejects_shocks_shorter_than_a_day(self):
+        with self.assertRaises(ValueError):
+            shocks(10, 0.5, 4.0, 0, np.random.default_rng(0))
+
+
+class EnvironmentScheduleTest(unittest.TestCase):
+    def test_replays_the_simulation_climate(self):
+        for seed in (0, 3, 11):
+            schedule = EnvironmentSchedule.generate(200, seed=seed)
+            self.assertEqual(list(Simulation(50, 10, seed=seed, environment=schedule.replay()).run(200)),
+                             list(Simulation(50, 10, seed=seed).run(200)))
+            recorded = EnvironmentSchedule.record(default_environment(), 200,
+                                                  RandomStreams(seed).stream(ENVIRONMENT_STREAM))
+            for name, table in schedule.tables().items():
+                np.testing.assert_array_equal(recorded.tables()[name], table)
+
+    def test_save_and_load(self):
+        schedule = EnvironmentSchedule.generate(500, seed=1, temperature_range=(10, 40), season=(8, 100),
+                                                shock_rate=0.02)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'schedule.npz')
+            schedule.save(path)
+            loaded = load_schedule(path)
+        self.assertEqual((loaded.days, loaded.day), (500, 0))
+        for name, table in schedule.tables().items():
+            np.testing.assert_array_equal(loaded.tables()[name], table)
+
+    def test_replay_has_its_own_cursor(self):
+        schedule = EnvironmentSchedule.generate(10, seed=2)
+        replay = schedule.replay(4)
+        replay.cycle_day()
+        self.assertEqual((schedule.day, replay.day), (0, 5))
+        self.assertEqual(replay.temperature, schedule.temperatures[5])
+        self.assertEqual(replay.resources, {'food': schedule.food[5]})
+
+    def test_runs_out(self):
+        with self.assertRaises(IndexError):
+            list(Simulation(10, 10, seed=1, environment=EnvironmentSchedule.generate(5, seed=1)).run(6))
+
+    def test_rejects_uneven_tables(self):
+        with self.assertRaises(ValueError):
+            EnvironmentSchedule([25, 26], [100], [5, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
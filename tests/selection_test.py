@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from evolite.selection import SELECTIONS, elite, get_selection, roulette, tournament
+
+DRAWS = 200000
+
+
+class SelectionTest(unittest.TestCase):
+    def setUp(self):
+        # Distinct fitness, shuffled so no operator can rely on the order of the organisms
+        self.fitness = np.random.default_rng(0).permutation(np.arange(1.0, 11.0))
+        self.ranks = np.argsort(np.argsort(self.fitness)) + 1
+
+    def assert_distribution(self, picks, expected):
+        frequencies = np.bincount(picks, minlength=len(expected)) / len(picks)
+        tolerance = 5 * np.sqrt(np.asarray(expected) * (1 - np.asarray(expected)) / len(picks)) + 1e-12
+        np.testing.assert_array_less(np.abs(frequencies - expected), tolerance)
+
+    def draw(self, name, fitness=None):
+        return get_selection(name)(self.fitness if fitness is None else fitness, DRAWS, np.random.default_rng(1))
+
+    def test_fittest(self):
+        np.testing.assert_array_equal(self.draw('fittest')[:5], [np.argmax(self.fitness)] * 5)
+
+    def test_uniform(self):
+        self.assert_distribution(self.draw('uniform'), np.full(10, 0.1))
+
+    def test_roulette(self):
+        self.assert_distribution(self.draw('roulette'), self.fitness / self.fitness.sum())
+
+    def test_roulette_shifts_negative_fitness(self):
+        shifted = self.fitness - 5
+        self.assert_distribution(self.draw('roulette', shifted), (shifted + 4) / (shifted + 4).sum())
+        self.assert_distribution(self.draw('roulette', np.zeros(10)), np.full(10, 0.1))
+
+    def test_rank(self):
+        self.assert_distribution(self.draw('rank', self.fitness ** 3), self.ranks / self.ranks.sum())
+
+    def test_tournament(self):
+        # The winner of k draws with replacement has rank r when all of them rank at most r and one ranks r
+        for size in (2, 3, 5):
+            picks = tournament(self.fitness, DRAWS, np.random.default_rng(size), size)
+            self.assert_distribution(picks, (self.ranks ** size - (self.ranks - 1) ** size) / 10 ** size)
+
+    def test_truncation(self):
+        self.assert_distribution(self.draw('truncation'), np.where(self.ranks > 5, 0.2, 0.0))
+
+    def test_seeded_draws_repeat(self):
+        for name, operator in SELECTIONS.items():
+            with self.subTest(name=name):
+                first = operator(self.fitness, 100, np.random.default_rng(7))
+                np.testing.assert_array_equal(operator(self.fitness, 100, np.random.default_rng(7)), first)
+                self.assertTrue(((first >= 0) & (first < 10)).all())
+                self.assertEqual(len(operator(self.fitness, 0, np.random.default_rng(7))), 0)
+
+    def test_roulette_of_one(self):
+        np.testing.assert_array_equal(roulette(np.array([3.0]), 4, np.random.default_rng(0)), [0] * 4)
+
+    def test_elite(self):
+        np.testing.assert_array_equal(self.fitness[elite(self.fitness, 3)], [10, 9, 8])
+        self.assertEqual(len(elite(self.fitness, 20)), 10)
+        self.assertEqual(len(elite(self.fitness, 0)), 0)
+
+    def test_get_selection(self):
+        self.assertIs(get_selection(roulette), roulette)
+        with self.assertRaises(ValueError):
+            get_selection('lottery')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import tempfile
+import unittest
+
+from evolite.server import CANCELLED, FINISHED, JobScheduler, JobServer
+
+
+class JobServerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Talks to a job server on localhost with raw HTTP requests.
+    """
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = JobServer(JobScheduler(1, self.directory.name), port=0)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def request(self, method, path, payload=None, headers=None):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        lines = [f"{method} {path} HTTP/1.1", f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 30)
+        writer.close()
+        head, _, data = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), data
+
+    async def call(self, method, path, payload=None):
+        status, data = await self.request(method, path, payload)
+        return status, json.loads(data) if data else None
+
+    async def submit(self, **config):
+        status, job = await self.call('POST', '/jobs', {'owner': 'tester', 'config': config})
+        self.assertEqual(status, 201)
+        return job['id']
+
+    async def wait(self, job_id):
+        for _ in range(600):
+            status, job = await self.call('GET', f'/jobs/{job_id}?since=0')
+            if job['state'] not in ('queued', 'running'):
+                return job
+            await asyncio.sleep(0.05)
+        self.fail(f"Job {job_id} did not end")
+
+    async def test_submit_and_poll(self):
+        job_id = await self.submit(generations=12, population_size=20, seed=3)
+        job = await self.wait(job_id)
+        self.assertEqual(job['state'], FINISHED)
+        self.assertEqual([summary['generation'] for summary in job['summaries']], list(range(1, 13)))
+        self.assertTrue(job['checkpoint'])
+        status, polled = await self.call('GET', f'/jobs/{job_id}?since=5')
+        self.assertEqual([summary['generation'] for summary in polled['summaries']], list(range(6, 13)))
+        status, listed = await self.call('GET', '/jobs')
+        self.assertEqual([job['id'] for job in listed], [job_id])
+
+    async def test_events(self):
+        job_id = await self.submit(generations=8, population_size=20, seed=3)
+        status, data = await self.request('GET', f'/jobs/{job_id}/events')
+        self.assertEqual(status, 200)
+        events = [dict(line.split(': ', 1) for line in block.split('\n'))
+                  for block in data.decode('utf-8').strip().split('\n\n')]
+        self.assertEqual([event['id'] for event in events[:-1]], [str(generation) for generation in range(1, 9)])
+        self.assertEqual(json.loads(events[-1]['data'])['state'], FINISHED)
+        # Reconnecting resumes after the last event received
+        status, data = await self.request('GET', f'/jobs/{job_id}/events', headers={'Last-Event-ID': '6'})
+        self.assertEqual(data.decode('utf-8').count('event: generation'), 2)
+
+    async def test_cancel(self):
+        running = await self.submit(generations=10 ** 7, population_size=20)
+        queued = await self.submit(generations=5)
+        status, job = await self.call('DELETE', f'/jobs/{queued}')
+        self.assertEqual((status, job['state']), (202, CANCELLED))
+        status, job = await self.call('POST', f'/jobs/{running}/cancel')
+        self.assertEqual(status, 202)
+        self.assertEqual((await self.wait(running))['state'], CANCELLED)
+
+    async def test_rejects_bad_requests(self):
+        status, error = await self.call('POST', '/jobs', {'config': {'mothers': 'strongest'}})
+        self.assertEqual(status, 400)
+        self.assertIn('mothers', error['error'])
+        self.assertEqual((await self.call('GET', '/jobs/7'))[0], 404)
+        self.assertEqual((await self.call('PUT', '/jobs'))[0], 405)
+
+
+if __name__ == '__main__':
+    unittest.main()
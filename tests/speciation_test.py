@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from evolite.core import Simulation
+from evolite.population import PopulationArray
+from evolite.speciation import Speciation, distances, largest_remainder
+
+from .support import as_lists, random_population
+
+
+def clusters(size, max_length, seed, flips=3):
+    """
+    Returns organisms near all-zero and all-one genomes, alternating, each with a few genes flipped.
+    """
+    rng = np.random.default_rng(seed)
+    bits = np.zeros((size, max_length), dtype=np.uint8)
+    bits[1::2] = 1
+    for row in bits:
+        row[rng.choice(max_length, flips, replace=False)] ^= 1
+    population = PopulationArray.from_bits(bits, np.full(size, max_length), max_length=max_length)
+    population.fitness = rng.random(size)
+    return population
+
+
+class SpeciationTest(unittest.TestCase):
+    def test_distances_match_lists(self):
+        first, second = random_population(30, 150, 0), random_population(30, 150, 1)
+        expected = [sum(a != b for a, b in zip(x + [0] * 150, y + [0] * 150))
+                    for x, y in zip(as_lists(first.genomes, first.lengths, 150),
+                                    as_lists(second.genomes, second.lengths, 150))]
+        np.testing.assert_array_equal(distances(first.genomes, second.genomes), expected)
+
+    def test_largest_remainder(self):
+        np.testing.assert_array_equal(largest_remainder([1, 1, 2], 8), [2, 2, 4])
+        parts = largest_remainder([1, 1, 1], 10)
+        self.assertEqual((parts.sum(), parts.max() - parts.min()), (10, 1))
+        np.testing.assert_array_equal(largest_remainder([0, 0], 3).sum(), 3)
+
+    def test_separates_clusters(self):
+        speciation = Speciation(threshold=0.2)
+        founders = speciation.assign(clusters(20, 64, 2, flips=0))
+        self.assertEqual((len(speciation), speciation.next_species), (2, 2))
+        # Organisms that inherit no species are found through any band their flipped gene left intact
+        species = speciation.assign(clusters(200, 64, 3, flips=1))
+        np.testing.assert_array_equal(species, np.tile(founders[:2], 100))
+        self.assertEqual((len(speciation), speciation.next_species), (2, 2))
+
+    def test_drifted_organisms_found_new_species(self):
+        speciation = Speciation(threshold=0.1)
+        population = clusters(20, 64, 4, flips=0)
+        speciation.assign(population)
+        # Half of its genes are ones, 32 genes away from either centre
+        population.genomes[0] = np.uint8(0x0f)
+        species = speciation.assign(population)
+        self.assertNotIn(species[0], species[1:])
+        self.assertEqual(len(set(species[1:])), 2)
+
+    def test_shared_fitness(self):
+        population = clusters(6, 64, 5, flips=0).take(np.array([0, 2, 4, 1, 3, 5, 0, 2]))
+        population.fitness = np.ones(8)
+        speciation = Speciation()
+        speciation.assign(population)
+        np.testing.assert_array_equal(speciation.shared_fitness(population), [0.2] * 3 + [1 / 3] * 3 + [0.2] * 2)
+
+    def test_niches_survive(self):
+        simulation = Simulation(200, 20, seed=3, speciation=Speciation(threshold=0.15), mothers='tournament')
+        list(simulation.run(30))
+        self.assertGreater(len(simulation.speciation), 1)
+        self.assertTrue(np.isin(simulation.population.species, simulation.speciation.ids).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
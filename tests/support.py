@@ -0,0 +1,51 @@
+from typing import List
+
+import numpy as np
+
+from evolite.bits import as_words, unpack_bits
+from evolite.population import PopulationArray
+
+
+def random_population(size: int, max_length: int, seed: int) -> PopulationArray:
+    """
+    Returns a population of random genomes with random lengths, spread over several packed words.
+
+    Args:
+        size (int): The number of organisms.
+        max_length (int): The genome length cap.
+        seed (int): The seed of the genomes and lengths.
+
+    Returns:
+        PopulationArray: The population.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, max_length + 1, size=size)
+    bits = rng.integers(0, 2, size=(size, max_length), dtype=np.uint8)
+    bits[np.arange(max_length) >= lengths[:, None]] = 0
+    return PopulationArray.from_bits(bits, lengths, max_length=max_length)
+
+
+def as_lists(genomes: np.ndarray, lengths: np.ndarray, max_length: int) -> List[List[int]]:
+    """
+    Unpacks every genome to a list of its genes, checking that no gene is set past its length.
+
+    Args:
+        genomes (np.ndarray): The packed ``uint8`` genome matrix, or its ``uint64`` word view.
+        lengths (np.ndarray): The number of genes of each genome.
+        max_length (int): The genome length cap.
+
+    Returns:
+        List[List[int]]: The genes of every genome.
+    """
+    bits = unpack_bits(np.ascontiguousarray(genomes).view(np.uint8), max_length)
+    for row, length in zip(bits, lengths):
+        if row[length:].any():
+            raise AssertionError(f"genes set past the length {length}: {row.tolist()}")
+    return [row[:length].tolist() for row, length in zip(bits, lengths)]
+
+
+def words(population: PopulationArray) -> np.ndarray:
+    """
+    Returns a copy of the packed words of a population, as crossover operators take them.
+    """
+    return as_words(population.genomes).copy()
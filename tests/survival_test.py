@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from evolite.core import Simulation
+from evolite.environment import Environment
+from evolite.survival import Survival
+
+from .support import random_population
+
+
+class SurvivalTest(unittest.TestCase):
+    def test_everyone_survives_plenty_without_predators(self):
+        population = random_population(100, 20, 0)
+        survivors = Survival()(population, Environment({'food': 1000}, {'number': 0}), np.random.default_rng(0))
+        self.assertEqual(len(survivors), 100)
+
+    def test_nobody_survives_without_food(self):
+        population = random_population(100, 20, 1)
+        survivors = Survival()(population, Environment({'food': 0}, {'number': 0}), np.random.default_rng(0))
+        self.assertEqual(len(survivors), 0)
+
+    def test_starvation_follows_the_food_share(self):
+        population = random_population(20000, 20, 2)
+        survivors = Survival()(population, Environment({'food': 5000}, {'number': 0}), np.random.default_rng(0))
+        self.assertAlmostEqual(len(survivors) / len(population), 0.25, delta=0.01)
+
+    def test_camouflage_protects_from_predators(self):
+        survival = Survival(attack=0.5, handling=0.0)
+        population = random_population(20000, 20, 3)
+        environment = Environment({'food': 10 ** 6}, {'number': 4})
+        camouflage = population.calculate_traits()['camouflage']
+        escape = np.exp(-survival.attack * 4 * (1 - camouflage))
+        survivors = survival(population, environment, np.random.default_rng(0))
+        self.assertAlmostEqual(len(survivors) / len(population), escape.mean(), delta=0.01)
+        self.assertGreater(survivors.calculate_traits()['camouflage'].mean(), camouflage.mean())
+
+    def test_predators_saturate(self):
+        population = random_population(1000, 20, 4)
+        environment = Environment({'food': 10 ** 6}, {'number': 10})
+        _, crowded = Survival().pressures(population, environment)
+        _, sparse = Survival().pressures(population.take(np.arange(10)), environment)
+        self.assertLess(crowded[0], sparse[0])
+
+    def test_offspring(self):
+        self.assertEqual(Survival(fecundity=1.5).offspring(10), 15)
+        self.assertEqual(Survival(fecundity=2.0, max_size=12).offspring(10), 12)
+
+    def test_population_settles_near_carrying_capacity(self):
+        simulation = Simulation(50, 20, seed=5, survival=Survival(fecundity=1.2),
+                                environment=Environment({'food': 300}, {'number': 0}))
+        # Hold the food steady: about 300 organisms survive, and they breed 1.2 times their number
+        simulation.environment.cycle_day = lambda rng: None
+        sizes = [summary.population_size for summary in simulation.run(60)]
+        self.assertAlmostEqual(np.mean(sizes[-20:]), 360, delta=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
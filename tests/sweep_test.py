@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from evolite.sweep import SweepCell, completed_keys, grid, run_cell, run_sweep, sample
+
+
+def read(path):
+    # Skips a partial last record, as completed_keys does
+    records = []
+    with open(path) as results:
+        for line in results:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def without_timing(record):
+    return {name: value for name, value in record.items() if name != 'elapsed'}
+
+
+class SweepTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.jsonl')
+        self.cells = grid([5, 8], [10, 20], [8], [1, 2])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_grid_and_sample(self):
+        self.assertEqual(len(self.cells), 8)
+        self.assertEqual(self.cells[0], SweepCell(5, 10, 8, 1))
+        chosen = sample(self.cells, 3, seed=4)
+        self.assertEqual(chosen, sample(self.cells, 3, seed=4))
+        self.assertEqual(chosen, sorted(chosen, key=self.cells.index))
+        self.assertEqual(len(sample(self.cells, 20)), 8)
+
+    def test_runs_every_cell(self):
+        self.assertEqual(run_sweep(self.cells, self.path, max_workers=2), 8)
+        records = sorted(map(without_timing, read(self.path)), key=lambda record: json.dumps(record))
+        expected = sorted((without_timing(run_cell(cell)) for cell in self.cells),
+                          key=lambda record: json.dumps(record))
+        self.assertEqual(records, expected)
+
+    def test_resumes_an_interrupted_sweep(self):
+        run_sweep(self.cells[:5], self.path, max_workers=2)
+        # An interrupted write leaves a partial record, whose cell must run again
+        with open(self.path) as results:
+            lines = results.readlines()
+        with open(self.path, 'w') as results:
+            results.writelines(lines[:4])
+            results.write(lines[4][:10])
+        self.assertEqual(len(completed_keys(self.path)), 4)
+        self.assertEqual(run_sweep(self.cells, self.path, max_workers=2), 4)
+        self.assertEqual(run_sweep(self.cells, self.path, max_workers=2), 0)
+        keys = [SweepCell(*(record[field] for field in SweepCell._fields)).key() for record in read(self.path)]
+        self.assertEqual(sorted(keys), sorted(cell.key() for cell in self.cells))
+
+    def test_stopping_rules(self):
+        record = run_cell(SweepCell(200, 20, 8, 1), {'stagnation': 3})
+        self.assertEqual(record['stop_reason'], 'stagnation')
+        self.assertLess(record['generations_run'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()